@@ -108,7 +108,7 @@ class ManagementApi:
             media_file = self._get_media_file_by_sync_id(id, directory)
             if media_file is None:
                 return JSONResponse(status_code=404, content={"error": "ID not found"})
-            original_id = media_file.file_desc.id
+            original_id = media_file.file_desc.get_hex_id()
             thb_dir = self.thb_dir_1 if media_file.parent_set is self.media_set_1 else self.thb_dir_2
             thumbnail_path = thb_dir / f"{original_id}.thb"
             if not thumbnail_path.exists():
@@ -210,9 +210,9 @@ class ManagementApi:
                 name = "/"
                 
             if children:
-                return {"id": media_dir.file_desc.id, "name": name, "children": children}
+                return {"id": media_dir.file_desc.get_hex_id(), "name": name, "children": children}
             else:
-                return {"id": media_dir.file_desc.id, "name": name}
+                return {"id": media_dir.file_desc.get_hex_id(), "name": name}
 
         @self.app.get("/tree")
         async def get_tree(directory: str):
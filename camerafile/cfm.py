@@ -11,6 +11,7 @@ from multiprocessing.spawn import freeze_support
 from textwrap import dedent
 
 from camerafile.core.Configuration import Configuration
+from camerafile.core.Constants import DHASH, SIGNATURE_ALGORITHMS, FILE_SIZE, FILE_SIGNATURE_ALGORITHMS
 from camerafile.fileaccess.FileAccess import CopyMode
 from camerafile.monitor.Watcher import Watcher
 from camerafile.task.CopyFile import CollisionPolicy
@@ -35,6 +36,15 @@ def create_main_args_parser():
                         help="Maximum number of CFM workers that can be run simultaneously. 0 means that only main CFM "
                              "process is used. Default: number of CPU.", metavar="N")
 
+    parser.add_argument('-st', '--scan-threads', type=int,
+                        help="Number of threads used to list directories when scanning a media set. "
+                             "0 or 1 means that directories are listed sequentially. "
+                             "Default: number of CPU + 4 (max. 32).", metavar="N")
+
+    parser.add_argument('-fs', '--full-scan', action='store_true',
+                        help='List again all directories of media sets, even those that have not been modified '
+                             'since last execution.')
+
     parser.add_argument('-c', '--cache-path', type=str,
                         help='Specify a cache directory path. Default is empty. '
                              'If empty, one cache folder called ".cfm" is created in each media set directory',
@@ -50,12 +60,29 @@ def create_main_args_parser():
     parser.add_argument('-n', '--thumbnails', action='store_true',
                         help='Load all thumbnails from exif data, and save them in cache.')
 
-    parser.add_argument('-u', '--use-dump', action='store_true', default=True,
-                        help='Use python dump to store media set information.')
+    parser.add_argument('-sp', '--single-pass', action='store_true',
+                        help='Compute signatures of images (and their thumbnails, with --ui) when their metadata are '
+                             'read, decoding each image only once. Faster when most signatures are needed, for example '
+                             'to compare 2 media sets.')
+
+    parser.add_argument('-sa', '--signature-algorithm', choices=SIGNATURE_ALGORITHMS, default=DHASH,
+                        help='Algorithm used to compute signatures of images: dhash of the full image (default), or '
+                             'dhash of the image decoded at a reduced scale (faster with JPEG images). Signatures '
+                             'already computed by another algorithm are computed again.')
+
+    parser.add_argument('--file-signature-algorithm', choices=FILE_SIGNATURE_ALGORITHMS, default=FILE_SIZE,
+                        help='Algorithm used to compute signatures of videos and other files: their size (default), '
+                             'md5 of their content (sampled for large files), or dhash of a frame of videos, which '
+                             'also matches videos encoded differently. Signatures already computed by another '
+                             'algorithm are computed again.')
 
     parser.add_argument('-s', '--save-db', action='store_true', default=False,
                         help='Save sqlite db on disk, each time cfm is executed. This db is NOT used to load data.')
 
+    parser.add_argument('-cat', '--catalog', action='store_true', default=False,
+                        help='Store media sets in a sqlite catalog (catalog.db) instead of cfm.cache. Only the rows '
+                             'that have changed are written.')
+
     parser.add_argument('-x', '--exit-on-error', action='store_true', default=False,
                         help='Exit current process in case of error (should be used only to debug).')
 
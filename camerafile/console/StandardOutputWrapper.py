@@ -83,13 +83,14 @@ class StdWrapper(object):
         builtins.print = self.default_print
 
     def wrap_log(self):
+        # Some handlers have no stream (NullHandler, SysLogHandler...)
         for handler in logging.root.handlers:
-            if handler.stream == self.stream:
+            if getattr(handler, "stream", None) == self.stream:
                 handler.stream = self
 
     def unwrap_log(self):
         for handler in logging.root.handlers:
-            if handler.stream == self:
+            if getattr(handler, "stream", None) == self:
                 handler.stream = self.stream
 
     def with_blanks(self, char, content=''):
@@ -0,0 +1,16 @@
+import itertools
+
+
+class ChangeCounter:
+    """
+    ChangeCounter gives a new, always increasing, change id each time a media file, its description or its
+    metadata is modified.
+    A media set remembers the last change id when it is loaded or saved: all objects with a greater change id have
+    been modified since. Change ids are used instead of boolean dirty flags because Metadata objects can be shared
+    by media files of several media sets (copies, synchronized signatures), that are not saved at the same time.
+    """
+    __counter = itertools.count(1)
+
+    @staticmethod
+    def next() -> int:
+        return next(ChangeCounter.__counter)
@@ -5,6 +5,8 @@ from argparse import Namespace
 from multiprocessing import cpu_count
 from pathlib import Path
 
+from camerafile.core.Constants import DHASH, SIGNATURE_ALGORITHMS, FILE_SIZE, FILE_SIGNATURE_ALGORITHMS
+
 LOGGER = logging.getLogger(__name__)
 
 
@@ -15,10 +17,15 @@ class Configuration:
         self.args = None
         self.cfm_sync_password = None
         self.nb_sub_process = cpu_count()
+        self.scan_threads = min(32, cpu_count() + 4)
+        self.full_scan = False
         self.thumbnails = False
+        self.single_pass = False
+        self.signature_algorithm = DHASH
+        self.file_signature_algorithm = FILE_SIZE
         self.face_detection_keep_image_size = False
-        self.use_dump_for_cache = False
         self.save_db = False
+        self.catalog = False
         self.exit_on_error = False
         self.org_format = None
         self.debug = False
@@ -97,12 +104,25 @@ class Configuration:
             nb_workers = self.get_int_param("NB_WORKERS", "workers")
             if nb_workers is not None:
                 self.nb_sub_process = nb_workers
+
+            scan_threads = self.get_int_param("SCAN_THREADS", "scan_threads")
+            if scan_threads is not None:
+                self.scan_threads = scan_threads
+            self.full_scan = self.get_bool_param("FULL_SCAN", "full_scan", False)
             
             self.cache_path = self.get_param("CACHE_PATH", "cache_path")
-            self.use_dump_for_cache = args.use_dump
             self.save_db = self.get_bool_param("SAVE_DB", "save_db")
+            self.catalog = self.get_bool_param("CATALOG", "catalog")
             self.exit_on_error = args.exit_on_error
             self.thumbnails = self.get_bool_param("THUMBNAILS", "thumbnails")
+            self.single_pass = self.get_bool_param("SINGLE_PASS", "single_pass", False)
+            self.signature_algorithm = self.get_param("SIGNATURE_ALGORITHM", "signature_algorithm") or DHASH
+            if self.signature_algorithm not in SIGNATURE_ALGORITHMS:
+                raise ValueError("Unknown signature algorithm: " + self.signature_algorithm)
+            self.file_signature_algorithm = self.get_param("FILE_SIGNATURE_ALGORITHM",
+                                                           "file_signature_algorithm") or FILE_SIZE
+            if self.file_signature_algorithm not in FILE_SIGNATURE_ALGORITHMS:
+                raise ValueError("Unknown file signature algorithm: " + self.file_signature_algorithm)
             self.ignore_list = args.ignore
             self.ui = self.get_bool_param("UI", "ui")
             self.whatsapp_date_update = self.get_bool_param("WHATSAPP_DATE_UPDATE", "whatsapp_date_update")
@@ -1,6 +1,7 @@
 IMAGE_TYPE = [".jpg", ".jpeg", ".png", ".thm", ".heic", ".heif"]
 VIDEO_TYPE = [".mp4", ".mov", ".avi"]
 QT_TYPE = [".mp4", ".mov"]
+HEIF_TYPE = [".heic", ".heif"]
 AVI_TYPE = [".avi"]
 AUDIO_TYPE = [".wav", ".mp3"]
 MANAGED_TYPE = IMAGE_TYPE + VIDEO_TYPE + AUDIO_TYPE
@@ -29,4 +30,20 @@ COMP_SIMILAR = "similar"
 # (required to compate signature of all the images)
 COMP_SIMILAR_AND_ANALYSE_UNEXIFED = "..."
 
+# Versioned ids of the algorithms used to compute the signatures of images (see Hash): signatures computed by different
+# algorithms cannot be compared
+# dhash of the fully decoded image
+DHASH = "dhash"
+# dhash of the image decoded at a reduced scale (JPEG draft mode)
+DRAFT_DHASH = "dhash-draft-1"
+SIGNATURE_ALGORITHMS = [DHASH, DRAFT_DHASH]
+# Versioned ids of the algorithms used to compute the signatures of other files (videos, audio)
+# size of the file
+FILE_SIZE = "size"
+# md5 of the content of the file, sampled when it is large (see Hash.content_hash)
+CONTENT_MD5 = "md5-sampled-1"
+# dhash of a frame of videos decoded by OpenCV, CONTENT_MD5 for other files
+KEYFRAME_DHASH = "keyframe-dhash-1"
+FILE_SIGNATURE_ALGORITHMS = [FILE_SIZE, CONTENT_MD5, KEYFRAME_DHASH]
+
 original_sigint_handler = None
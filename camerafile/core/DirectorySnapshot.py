@@ -0,0 +1,136 @@
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from camerafile.core.Configuration import Configuration
+from camerafile.core.Logging import Logger
+from camerafile.core.MediaDirectory import MediaDirectory
+
+LOGGER = Logger(__name__)
+
+
+class DirectorySnapshot:
+    """
+    DirectorySnapshot persists, for each directory of a media set, the state it had when it was last listed:
+    modification time, inode, number of children registered in the media set, and names of its ignored files.
+    A directory whose modification time and inode have not changed still contains the same entries, so it does
+    not need to be listed again: its known children are kept, its ignored files are reported again, and only its
+    known sub-directories are visited.
+    The number of children protects against a cache that would not be consistent with the snapshot.
+    Directories with known files that have no system id are listed again, so that their system id is read.
+    Directories containing archives are never skipped, as an archive can be modified without changing the
+    modification time of its directory.
+    """
+    VERSION = 2
+    # Do not trust directories modified just before the scan: an entry could be added later with the same mtime
+    RACY_DELAY_NS = 2 * 1000 * 1000 * 1000
+    __instance = {}
+
+    def __init__(self, output_directory_path):
+        self.snapshot_file = Path(output_directory_path) / "dir-snapshot.json"
+        self.snapshots: Dict[str, list] = {}
+        self.loaded = False
+        self.use_for_scan = True
+        self.ignore_patterns = None
+        self.scan_start_ns = 0
+        self.known_children: Dict[str, list] = {}
+        self.recorded: Dict[str, Tuple[os.stat_result, List[str]]] = {}
+        self.kept: List[str] = []
+
+    @staticmethod
+    def get(output_directory) -> "DirectorySnapshot":
+        if output_directory not in DirectorySnapshot.__instance:
+            DirectorySnapshot.__instance[output_directory] = DirectorySnapshot(output_directory.path)
+        return DirectorySnapshot.__instance[output_directory]
+
+    def load(self, ignore_patterns):
+        self.loaded = True
+        self.ignore_patterns = ignore_patterns
+        try:
+            if self.snapshot_file.exists():
+                with open(self.snapshot_file, "r") as file:
+                    content = json.load(file)
+                if content.get("version") == self.VERSION and content.get("ignore") == ignore_patterns:
+                    self.snapshots = content["directories"]
+                else:
+                    LOGGER.info("Directory snapshot was found, but is outdated. Ignore it.")
+        except (ValueError, KeyError):
+            LOGGER.info("Directory snapshot was found, but is invalid. Ignore it.")
+
+    def save(self):
+        if self.loaded:
+            tmp_file = self.snapshot_file.with_suffix(".tmp")
+            with open(tmp_file, "w") as file:
+                json.dump({"version": self.VERSION,
+                           "ignore": self.ignore_patterns,
+                           "directories": self.snapshots}, file)
+            os.replace(tmp_file, self.snapshot_file)
+
+    def start_scan(self, filename_map: dict, ignore_patterns):
+        if not self.loaded or ignore_patterns != self.ignore_patterns:
+            self.snapshots = {}
+            self.load(ignore_patterns)
+        self.use_for_scan = not Configuration.get().full_scan
+        self.scan_start_ns = time.time_ns()
+        self.recorded = {}
+        self.kept = []
+        self.known_children = {}
+        if self.use_for_scan and len(self.snapshots) != 0:
+            for relative_path, entry in filename_map.items():
+                if relative_path != ".":
+                    self.known_children.setdefault(os.path.dirname(relative_path), []).append(entry)
+
+    def get_unchanged_sub_dirs(self, relative_path: str, stat: os.stat_result) -> Optional[List[str]]:
+        """
+        Returns the names of the known sub-directories if the directory has not changed since it was last listed,
+        or None if it has to be listed again. Called from scanning threads: nothing is modified here.
+        """
+        if not self.use_for_scan:
+            return None
+        snapshot = self.snapshots.get(relative_path)
+        if snapshot is None:
+            return None
+        mtime_ns, inode, nb_children, _ = snapshot
+        if stat.st_mtime_ns != mtime_ns or stat.st_ino != inode:
+            return None
+        children = self.known_children.get(relative_path, [])
+        if len(children) != nb_children:
+            return None
+        if any(not isinstance(child, MediaDirectory) and child.file_desc.system_id is None for child in children):
+            return None
+        return [os.path.basename(child.file_desc.relative_path) for child in children
+                if isinstance(child, MediaDirectory)]
+
+    def get_known_children(self, relative_path: str) -> list:
+        return self.known_children.get(relative_path, [])
+
+    def get_ignored_names(self, relative_path: str) -> List[str]:
+        return self.snapshots[relative_path][3]
+
+    def record(self, relative_path: str, stat: os.stat_result, ignored_names: List[str]):
+        self.recorded[relative_path] = stat, ignored_names
+
+    def keep(self, relative_path: str):
+        self.kept.append(relative_path)
+
+    def end_scan(self, filename_map: dict):
+        nb_children = {}
+        for relative_path in filename_map:
+            if relative_path != ".":
+                parent_path = os.path.dirname(relative_path)
+                nb_children[parent_path] = nb_children.get(parent_path, 0) + 1
+        snapshots = {}
+        for relative_path, (stat, ignored_names) in self.recorded.items():
+            if stat.st_mtime_ns < self.scan_start_ns - self.RACY_DELAY_NS:
+                snapshots[relative_path] = [stat.st_mtime_ns, stat.st_ino, nb_children.get(relative_path, 0),
+                                            ignored_names]
+        for relative_path in self.kept:
+            snapshots[relative_path] = self.snapshots[relative_path]
+        if len(self.kept) != 0:
+            LOGGER.info_indent(f"{len(self.kept)} directories unchanged since last scan (not listed)", prof=2)
+        self.snapshots = snapshots
+        self.known_children = {}
+        self.recorded = {}
+        self.kept = []
@@ -0,0 +1,145 @@
+import os
+import stat as stat_module
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator, List, Optional
+
+from camerafile.core.Logging import Logger
+
+LOGGER = Logger(__name__)
+
+
+class ScannedEntry:
+    __slots__ = ("name", "path", "relative_path", "stat")
+
+    def __init__(self, name: str, path: str, relative_path: str, stat: Optional[os.stat_result]):
+        self.name = name
+        self.path = path
+        self.relative_path = relative_path
+        self.stat = stat
+
+
+class ScannedDirectory:
+    __slots__ = ("path", "relative_path", "stat", "listed", "dirs", "files", "walkable_dirs")
+
+    def __init__(self, path: str, relative_path: str, stat: Optional[os.stat_result] = None):
+        self.path = path
+        self.relative_path = relative_path
+        self.stat = stat
+        # False if the directory has not been listed, because it is known to be unchanged.
+        # In this case, only its known sub-directories are in dirs.
+        self.listed = True
+        self.dirs: List[ScannedEntry] = []
+        self.files: List[ScannedEntry] = []
+        # Sub-directories to descend into (symbolic links to directories are listed, but not followed)
+        self.walkable_dirs: List[ScannedEntry] = []
+
+    def get_relative_path(self, name: str) -> str:
+        return name if self.relative_path == "" else self.relative_path + "/" + name
+
+
+class DirectoryWalker:
+    """
+    DirectoryWalker lists a directory tree with os.scandir. Sub-directories are listed concurrently by a pool
+    of threads (the listing and stat calls release the GIL), but directories are always yielded in the same
+    top-down, depth-first order as os.walk, so that the caller can process them in a single thread.
+    stat() is only called for the entries accepted by the should_stat function, and it is done by the
+    worker threads.
+    If defined, get_unchanged_sub_dirs is called (from worker threads) with the relative path and the stat of
+    each directory before listing it. If it returns a list of sub-directory names, the directory is not listed
+    and only these sub-directories are visited.
+    """
+
+    def __init__(self, root_path: str, nb_threads: int, should_stat: Callable[[str, bool], bool] = None,
+                 get_unchanged_sub_dirs: Callable[[str, os.stat_result], Optional[List[str]]] = None):
+        self.root_path = root_path
+        self.nb_threads = nb_threads
+        self.should_stat = should_stat
+        self.get_unchanged_sub_dirs = get_unchanged_sub_dirs
+
+    def walk(self) -> Iterator[ScannedDirectory]:
+        root_stat = os.stat(self.root_path) if self.get_unchanged_sub_dirs is not None else None
+        root_dir = ScannedDirectory(self.root_path, "", root_stat)
+        if self.nb_threads <= 1:
+            stack = [root_dir]
+            while stack:
+                scanned_dir = self._scan(stack.pop())
+                stack.extend(reversed([self._new_sub_dir(d) for d in scanned_dir.walkable_dirs]))
+                yield scanned_dir
+        else:
+            with ThreadPoolExecutor(max_workers=self.nb_threads, thread_name_prefix="cfm-scan") as executor:
+                stack = [executor.submit(self._scan, root_dir)]
+                while stack:
+                    scanned_dir = stack.pop().result()
+                    futures = [executor.submit(self._scan, self._new_sub_dir(d))
+                               for d in scanned_dir.walkable_dirs]
+                    stack.extend(reversed(futures))
+                    yield scanned_dir
+
+    @staticmethod
+    def _new_sub_dir(entry: ScannedEntry) -> ScannedDirectory:
+        return ScannedDirectory(entry.path, entry.relative_path, entry.stat)
+
+    def _scan(self, scanned_dir: ScannedDirectory) -> ScannedDirectory:
+        if self.get_unchanged_sub_dirs is not None and scanned_dir.stat is not None:
+            known_sub_dirs = self.get_unchanged_sub_dirs(scanned_dir.relative_path, scanned_dir.stat)
+            if known_sub_dirs is not None:
+                scanned_dir.listed = False
+                for name in known_sub_dirs:
+                    self._add_known_dir(scanned_dir, name)
+                return scanned_dir
+        try:
+            with os.scandir(scanned_dir.path) as it:
+                for dir_entry in it:
+                    self._add_entry(scanned_dir, dir_entry)
+        except OSError as e:
+            # Same behavior as os.walk: unreadable directories are silently skipped
+            LOGGER.debug(f"Cannot list {scanned_dir.path}: {e}")
+        return scanned_dir
+
+    def _add_entry(self, scanned_dir: ScannedDirectory, dir_entry: os.DirEntry) -> None:
+        try:
+            is_dir = dir_entry.is_dir()
+        except OSError:
+            is_dir = False
+        relative_path = scanned_dir.get_relative_path(dir_entry.name)
+        stat = None
+        if self.should_stat is not None and self.should_stat(relative_path, is_dir):
+            try:
+                stat = self._stat(dir_entry)
+            except OSError as e:
+                # The entry has been removed since the directory was listed
+                LOGGER.debug(f"Cannot stat {dir_entry.path}: {e}")
+                return
+        entry = ScannedEntry(dir_entry.name, dir_entry.path, relative_path, stat)
+        if is_dir:
+            scanned_dir.dirs.append(entry)
+            if not dir_entry.is_symlink():
+                scanned_dir.walkable_dirs.append(entry)
+        else:
+            scanned_dir.files.append(entry)
+
+    @staticmethod
+    def _add_known_dir(scanned_dir: ScannedDirectory, name: str) -> None:
+        path = os.path.join(scanned_dir.path, name)
+        try:
+            stat = os.lstat(path)
+            is_link = stat_module.S_ISLNK(stat.st_mode)
+            if is_link:
+                stat = os.stat(path)
+        except OSError as e:
+            LOGGER.debug(f"Cannot stat {path}: {e}")
+            return
+        entry = ScannedEntry(name, path, scanned_dir.get_relative_path(name), stat)
+        scanned_dir.dirs.append(entry)
+        if not is_link:
+            scanned_dir.walkable_dirs.append(entry)
+
+    if os.name == "nt":
+        @staticmethod
+        def _stat(dir_entry: os.DirEntry) -> os.stat_result:
+            # On Windows, DirEntry.stat() always returns st_ino = st_dev = 0
+            return os.stat(dir_entry.path)
+    else:
+        @staticmethod
+        def _stat(dir_entry: os.DirEntry) -> os.stat_result:
+            return dir_entry.stat()
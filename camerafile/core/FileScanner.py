@@ -3,6 +3,8 @@ import os
 import zipfile
 from pathlib import Path
 import os.path
+from camerafile.core.Configuration import Configuration
+from camerafile.core.DirectoryWalker import DirectoryWalker, ScannedDirectory, ScannedEntry
 from camerafile.core.Logging import Logger
 from camerafile.console.FilesSummary import FilesSummary
 from camerafile.core.Constants import MANAGED_TYPE, ARCHIVE_TYPE
@@ -11,48 +13,75 @@ from camerafile.core.OutputDirectory import OutputDirectory
 from camerafile.fileaccess.FileDescription import FileDescription
 from camerafile.fileaccess.StandardFileDescription import StandardFileDescription
 from camerafile.fileaccess.ZipFileDescription import ZipFileDescription
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from camerafile.core.DirectorySnapshot import DirectorySnapshot
 
 LOGGER = Logger(__name__)
 
 """
 FileScanner is responsible for scanning the root directory, processing
 standard files and ZIP archives. It returns a dictionary of new files to load
-and a list of ignored files.
+and a list of ignored files. Directories are listed in parallel by a DirectoryWalker
+(see --scan-threads), but all the results are processed in the calling thread.
 """
 class FileScanner:
 
     @staticmethod
-    def update_from_disk(root_path: str, state, filename_map: dict) -> Tuple[Dict[str, FileDescription], Dict[str, FileDescription]]:
+    def update_from_disk(root_path: str, state, filename_map: dict, nb_threads: Optional[int] = None,
+                         snapshot: Optional["DirectorySnapshot"] = None) -> Tuple[Dict[str, FileDescription], Dict[str, FileDescription]]:
         root = Path(root_path).resolve()
+        if nb_threads is None:
+            nb_threads = Configuration.get().scan_threads
         files_summary = FilesSummary()
         new_files = {}
         new_dirs = {}
         ignored_files = []
 
-        for path, dirs, files in os.walk(root.as_posix(), topdown=True):
+        def should_stat(relative_path: str, is_dir: bool) -> bool:
+            # Called from walker threads: only read filename_map
+            if is_dir:
+                return snapshot is not None or relative_path not in filename_map
+            if os.path.splitext(relative_path)[1].lower() not in MANAGED_TYPE:
+                return False
+            known_entry = filename_map.get(relative_path)
+            return known_entry is None or known_entry.file_desc.system_id is None
+
+        get_unchanged_sub_dirs = snapshot.get_unchanged_sub_dirs if snapshot is not None else None
+        walker = DirectoryWalker(root.as_posix(), nb_threads, should_stat, get_unchanged_sub_dirs)
+        for scanned_dir in walker.walk():
             # Process directories first
-            for dir_name in dirs:
-                dir_path = Path(path) / dir_name
-                relative_path = dir_path.relative_to(root).as_posix()
-                FileScanner._register_new_dir(dir_path, root, new_dirs, filename_map)
+            for dir_entry in scanned_dir.dirs:
+                FileScanner._register_new_dir(dir_entry, new_dirs, filename_map)
+
+            if not scanned_dir.listed:
+                # Unchanged since last scan: all its known files still exist, and its ignored files are the same
+                FileScanner._keep_known_files(scanned_dir, snapshot, files_summary, ignored_files)
+                files_summary.log()
+                continue
 
+            contains_archive = False
+            ignored_names = []
             # Then process files
-            for file_name in files:
-                file_path = Path(path) / file_name
-                extension = os.path.splitext(file_name)[1].lower()
+            for file_entry in scanned_dir.files:
+                extension = os.path.splitext(file_entry.name)[1].lower()
+                file_path = os.path.normpath(file_entry.path)
                 if extension in MANAGED_TYPE and not state.should_be_ignored(file_path):
-                    file_size = FileScanner._register_new_standard_file(file_path, root, filename_map, new_files)
+                    file_size = FileScanner._register_new_standard_file(file_entry, filename_map, new_files)
                     files_summary.increment(all_files=1, managed=1, standard=1, size=file_size)
                 elif extension in ARCHIVE_TYPE:
-                    FileScanner._load_zip_archive(file_path, root, state, filename_map, new_files, new_dirs, ignored_files, files_summary)
+                    contains_archive = True
+                    FileScanner._load_zip_archive(Path(file_entry.path), root, state, filename_map, new_files, new_dirs, ignored_files, files_summary)
                 else:
                     files_summary.increment(all_files=1, standard=1)
-                    ignored_files.append(file_path.as_posix())
+                    ignored_files.append(Path(file_path).as_posix())
+                    ignored_names.append(file_entry.name)
                     # If the file previously existed, remove it from the internal mapping
-                    relative_path = file_path.relative_to(root).as_posix()
-                    if relative_path in filename_map:
-                        del filename_map[relative_path]
+                    if file_entry.relative_path in filename_map:
+                        del filename_map[file_entry.relative_path]
+            if snapshot is not None and not contains_archive:
+                snapshot.record(scanned_dir.relative_path, scanned_dir.stat, ignored_names)
             files_summary.log()
         files_summary.end_logging()
 
@@ -63,12 +92,23 @@ class FileScanner:
         return new_files, new_dirs
 
     @staticmethod
-    def _register_new_dir(dir_path: Path, root: Path, new_dirs: dict, filename_map: dict) -> None:
+    def _keep_known_files(scanned_dir: ScannedDirectory, snapshot: "DirectorySnapshot", files_summary: FilesSummary,
+                          ignored_files: list) -> None:
+        snapshot.keep(scanned_dir.relative_path)
+        for known_entry in snapshot.get_known_children(scanned_dir.relative_path):
+            if isinstance(known_entry, MediaFile):
+                known_entry.exists = True
+                files_summary.increment(all_files=1, managed=1, standard=1, size=known_entry.file_desc.file_size or 0)
+        for name in snapshot.get_ignored_names(scanned_dir.relative_path):
+            files_summary.increment(all_files=1, standard=1)
+            ignored_files.append(Path(os.path.normpath(os.path.join(scanned_dir.path, name))).as_posix())
+
+    @staticmethod
+    def _register_new_dir(dir_entry: ScannedEntry, new_dirs: dict, filename_map: dict) -> None:
         """Register a new directory in the new_dirs dictionary if it doesn't exist in filename_map."""
-        relative_path = dir_path.relative_to(root).as_posix()
+        relative_path = dir_entry.relative_path
         if relative_path not in filename_map:
-            stat = dir_path.stat()
-            system_id = FileScanner._get_system_id(stat)
+            system_id = FileScanner._get_system_id(dir_entry.stat)
             dir_desc = StandardFileDescription(relative_path, 0, system_id)  # Directories have size 0
             new_dirs[dir_desc.relative_path] = dir_desc
         else:
@@ -117,22 +157,21 @@ class FileScanner:
                     filename_map[dir_path].exists = True
 
     @staticmethod
-    def _register_new_standard_file(file_path: Path, root: Path, filename_map: dict, new_files: dict) -> int:
-        relative_path = file_path.relative_to(root).as_posix()
+    def _register_new_standard_file(file_entry: ScannedEntry, filename_map: dict, new_files: dict) -> int:
+        relative_path = file_entry.relative_path
         if relative_path not in filename_map:
-            stat = file_path.stat()
-            file_size = stat.st_size
-            system_id = FileScanner._get_system_id(stat)
+            file_size = file_entry.stat.st_size
+            system_id = FileScanner._get_system_id(file_entry.stat)
             file_desc = StandardFileDescription(relative_path, file_size, system_id)
             new_files[file_desc.relative_path] = file_desc
             return file_size
         else:
-            file_entry: MediaFile = filename_map[relative_path]
-            file_entry.exists = True
-            if file_entry.file_desc.system_id is None:
-                stat = file_path.stat()
-                file_entry.file_desc.system_id = FileScanner._get_system_id(stat)
-            return file_entry.file_desc.file_size
+            file_entry_in_map: MediaFile = filename_map[relative_path]
+            file_entry_in_map.exists = True
+            if file_entry_in_map.file_desc.system_id is None:
+                stat = file_entry.stat if file_entry.stat is not None else os.stat(file_entry.path)
+                file_entry_in_map.file_desc.system_id = FileScanner._get_system_id(stat)
+            return file_entry_in_map.file_desc.file_size
 
     @staticmethod
     def _register_new_zipped_file(file_info, root: Path, filename_map: dict, new_files: dict, file_name: str, zip_file_path: Path) -> int:
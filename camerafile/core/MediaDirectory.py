@@ -1,8 +1,9 @@
 import hashlib
 from pathlib import Path
-from typing import List, TYPE_CHECKING
+from typing import TYPE_CHECKING
 import os
 
+from camerafile.core.OrderedSet import OrderedSet
 from camerafile.fileaccess.StandardFileDescription import StandardFileDescription
 from camerafile.metadata.MetadataList import MetadataList
 
@@ -17,15 +18,21 @@ class MediaDirectory:
         self.parent_dir = parent_dir
         self.parent_set = parent_set
         self.metadata = MetadataList()
-        self.children_files: List["MediaFile"] = []
-        self.children_dirs: List["MediaDirectory"] = []
+        self.children_files: OrderedSet = OrderedSet()
+        self.children_dirs: OrderedSet = OrderedSet()
         self.exists = True
 
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # Media directories dumped by older versions hold their children in lists
+        self.children_files = OrderedSet(self.children_files)
+        self.children_dirs = OrderedSet(self.children_dirs)
+
     def __str__(self):
         return self.file_desc.relative_path
 
     def add_child_file(self, media_file: "MediaFile"):
-        self.children_files.append(media_file)
+        self.children_files.add(media_file)
 
     def add_child_dir(self, child_dir: "MediaDirectory"):
-        self.children_dirs.append(child_dir)
+        self.children_dirs.add(child_dir)
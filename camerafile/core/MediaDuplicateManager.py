@@ -133,16 +133,17 @@ class MediaDuplicateManager:
     def propagate_signature(media_set) -> None:
         """
         Traverses the size index and for each group with multiple files,
-        attempts to propagate the signature. If a value is propagated, the file is re-indexed
-        by adding the signature using the index_manager.
+        attempts to propagate the signature. If a value is propagated, the files of the group are re-indexed
+        together by the indexer once all groups have been traversed.
         """
         indexer = media_set.indexer
+        media_to_reindex = []
         for date, size_map in indexer.date_size_map.items():
             for file_size, media_files in size_map.items():
                 if len(media_files) > 1:
                     if MediaDuplicateManager.propagate_metadata_value(SIGNATURE, media_files):
-                        for media_file in media_files:
-                            indexer.add_media_file(media_file)
+                        media_to_reindex.extend(media_files)
+        indexer.add_media_files(media_to_reindex)
 
     @staticmethod
     def propagate_camera_model(media_set) -> None:
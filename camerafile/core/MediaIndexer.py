@@ -1,15 +1,20 @@
-import dhash
+from camerafile.core.OrderedSet import OrderedSet
+from camerafile.core.SignatureIndex import SignatureIndex
+from camerafile.core.SignatureMatrix import SignatureMatrix
+
 
 class MediaIndexer:
     """
     MediaIndexer centralizes the management of index mappings by date/size and date/signature.
+    Groups of media files are OrderedSet, to add and remove media files in constant time.
     """
     def __init__(self):
-        # Mapping {date: {size: [media_file, ...]}}
+        # Mapping {date: {size: OrderedSet(media_file, ...)}}
         self.date_size_map = {}  
-        # Mapping {date: {signature: [media_file, ...]}}
-        self.date_sig_map = {}   
-        # Mapping {system_id: [media_file, ...]}
+        # Mapping {date: {signature: OrderedSet(media_file, ...)}}, signatures of each date being indexed
+        # (SignatureIndex)
+        self.date_sig_map = {}
+        # Mapping {system_id: OrderedSet(media_file, ...)}
         self.system_id_map = {}
 
     # -------------------------
@@ -19,9 +24,10 @@ class MediaIndexer:
     @staticmethod
     def _add_to_x_y_map(map_to_update: dict, x, y, media_file) -> None:
         sub_map = map_to_update.setdefault(x, {})
-        sub_list = sub_map.setdefault(y, [])
-        if media_file not in sub_list:
-            sub_list.append(media_file)
+        sub_list = sub_map.get(y)
+        if sub_list is None:
+            sub_list = sub_map[y] = OrderedSet()
+        sub_list.add(media_file)
 
     @staticmethod
     def _exist_in_x_y_map(map_to_inspect: dict, x, y) -> bool:
@@ -37,8 +43,7 @@ class MediaIndexer:
         sub_list = sub_map.get(y)
         if sub_list is None:
             return
-        if media_file in sub_list:
-            sub_list.remove(media_file)
+        sub_list.discard(media_file)
         if not sub_list:
             del sub_map[y]
         if not sub_map:
@@ -56,26 +61,64 @@ class MediaIndexer:
         if date and size:
             MediaIndexer._remove_from_x_y_map(self.date_size_map, date, size, media_file)
 
+    def _get_sig_map(self, date) -> SignatureIndex:
+        sig_map = self.date_sig_map.get(date)
+        if sig_map is None:
+            sig_map = self.date_sig_map[date] = SignatureIndex()
+        return sig_map
+
+    @staticmethod
+    def _add_to_sig_map(sig_map: SignatureIndex, group_sig, media_file) -> None:
+        media_list = sig_map.get(group_sig)
+        if media_list is None:
+            sig_map[group_sig] = OrderedSet([media_file])
+        else:
+            media_list.add(media_file)
+
     def _add_media_file_by_signature(self, media_file) -> None:
         date = media_file.get_exif_date()
         sig = media_file.get_signature()
         if date and sig:
-            sig_map = self.date_sig_map.setdefault(date, {})
-            for existing_sig, media_list in sig_map.items():
-                # If the signatures are nearly identical (less than 4 bits difference)
-                if dhash.get_num_bits_different(sig, existing_sig) < 4:
-                    if media_file not in media_list:
-                        media_list.append(media_file)
-                    return
-            # No similar signature found, add a new entry
-            sig_map[sig] = [media_file]
+            sig_map = self._get_sig_map(date)
+            # If the signatures are nearly identical (less than 4 bits difference)
+            existing_sig = sig_map.find_first_similar(sig)
+            if existing_sig is None:
+                # No similar signature found, add a new entry
+                existing_sig = sig
+            MediaIndexer._add_to_sig_map(sig_map, existing_sig, media_file)
+
+    def _add_media_files_by_signature(self, media_files) -> None:
+        files_by_date = {}
+        for media_file in media_files:
+            date = media_file.get_exif_date()
+            if date and media_file.get_signature():
+                files_by_date.setdefault(date, []).append(media_file)
+        for date, date_files in files_by_date.items():
+            sig_map = self._get_sig_map(date)
+            group_sigs = None
+            if len(date_files) >= SignatureMatrix.MIN_BATCH_SIZE:
+                group_sigs = SignatureMatrix.group([media_file.get_signature() for media_file in date_files],
+                                                   sig_map.keys())
+            if group_sigs is None:
+                for media_file in date_files:
+                    self._add_media_file_by_signature(media_file)
+            else:
+                for media_file, group_sig in zip(date_files, group_sigs):
+                    MediaIndexer._add_to_sig_map(sig_map, group_sig, media_file)
 
     def _remove_media_file_by_signature(self, media_file) -> None:
         date = media_file.get_exif_date()
         sig = media_file.get_signature()
         if date and sig:
             dmap = self.date_sig_map.get(date, {})
-            # Iterate over a copy of items to allow safe removal
+            if not dmap:
+                return
+            # The media file is normally in the group of a similar signature,
+            # but its signature may have changed since it was indexed
+            for existing_sig in dmap.find_similar(sig):
+                if media_file in dmap[existing_sig]:
+                    MediaIndexer._remove_from_x_y_map(self.date_sig_map, date, existing_sig, media_file)
+                    return
             for existing_sig, media_list in list(dmap.items()):
                 if media_file in media_list:
                     MediaIndexer._remove_from_x_y_map(self.date_sig_map, date, existing_sig, media_file)
@@ -84,16 +127,16 @@ class MediaIndexer:
     def _add_media_file_by_system_id(self, media_file) -> None:
         system_id = media_file.file_desc.system_id
         if system_id is not None:
-            media_list = self.system_id_map.setdefault(system_id, [])
-            if media_file not in media_list:
-                media_list.append(media_file)
+            media_list = self.system_id_map.get(system_id)
+            if media_list is None:
+                media_list = self.system_id_map[system_id] = OrderedSet()
+            media_list.add(media_file)
 
     def _remove_media_file_by_system_id(self, media_file) -> None:
         system_id = media_file.file_desc.system_id
         if system_id is not None and system_id in self.system_id_map:
             media_list = self.system_id_map[system_id]
-            if media_file in media_list:
-                media_list.remove(media_file)
+            media_list.discard(media_file)
             if not media_list:
                 del self.system_id_map[system_id]
 
@@ -104,11 +147,25 @@ class MediaIndexer:
     def add_media_file(self, media_file) -> None:
         """
         Indexes a media file by date and size, by date and signature, and by system_id.
+        As a media file is (re-)indexed when its metadata are updated, it is also marked as modified.
         """
+        media_file.set_modified()
         self._add_media_file_by_size(media_file)
         self._add_media_file_by_signature(media_file)
         self._add_media_file_by_system_id(media_file)
 
+    def add_media_files(self, media_files) -> None:
+        """
+        Indexes many media files at once, like add_media_file does for each of them: the signatures of each
+        date are grouped together by SignatureMatrix, which is used to (re-)index media files in bulk.
+        """
+        media_files = list(media_files)
+        for media_file in media_files:
+            media_file.set_modified()
+            self._add_media_file_by_size(media_file)
+            self._add_media_file_by_system_id(media_file)
+        self._add_media_files_by_signature(media_files)
+
     def remove_media_file(self, media_file) -> None:
         """
         Removes a media file from all index mappings.
@@ -139,9 +196,8 @@ class MediaIndexer:
         # Case of iPhone photos exported by two different tools.
         sig = media_file.get_signature()
         if sig and date and date in self.date_sig_map:
-            for existing_sig in self.date_sig_map[date]:
-                if dhash.get_num_bits_different(existing_sig, sig) < 4:
-                    return True
+            if self.date_sig_map[date].find_first_similar(sig) is not None:
+                return True
         return False
 
     def get_similar_medias(self, media_file) -> list:
@@ -162,9 +218,9 @@ class MediaIndexer:
         # Par signature
         sig = media_file.get_signature()
         if sig and date and date in self.date_sig_map:
-            for existing_sig, media_list in self.date_sig_map[date].items():
-                if dhash.get_num_bits_different(existing_sig, sig) < 4:
-                    result.update(media_list)
+            sig_map = self.date_sig_map[date]
+            for existing_sig in sig_map.find_similar(sig):
+                result.update(sig_map[existing_sig])
         # Retirer le media_file lui-même si présent
         result.discard(media_file)
         return list(result)
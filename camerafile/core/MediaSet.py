@@ -3,57 +3,111 @@ from typing import List, Iterator, Tuple, Dict, Any, Optional, Union
 from itertools import chain
 import os
 
-from camerafile.core.Constants import CFM_CAMERA_MODEL, INTERNAL, SIGNATURE
+from camerafile.core.ChangeCounter import ChangeCounter
+from camerafile.core.Configuration import Configuration
+from camerafile.core.Constants import INTERNAL, SIGNATURE, IMAGE_TYPE
 from camerafile.core.Logging import Logger
 from camerafile.core.MediaFile import MediaFile
+from camerafile.core.DirectorySnapshot import DirectorySnapshot
 from camerafile.core.MediaDirectory import MediaDirectory
 from camerafile.core.MediaIndexer import MediaIndexer
 from camerafile.core.MediaSetComparator import MediaSetComparator
+from camerafile.core.MediaSetCache import MediaSetCache
+from camerafile.core.MediaSetCatalog import MediaSetCatalog
 from camerafile.core.MediaSetDatabase import MediaSetDatabase
 from camerafile.core.MediaSetDump import MediaSetDump
 from camerafile.core.MediaSetInitializer import MediaSetInitializer
 from camerafile.core.MediaSetState import MediaSetState
+from camerafile.core.OrderedSet import OrderedSet
 from camerafile.core.OutputDirectory import OutputDirectory
 from camerafile.fileaccess.StandardFileDescription import StandardFileDescription
 from camerafile.mdtools.MdConstants import MetadataNames
+from camerafile.metadata.Metadata import Metadata
 
 LOGGER = Logger(__name__)
 
 class MediaSet:
-    def __init__(self, path: str, org_format: Optional[str] = None):
+    def __init__(self, path: str, org_format: Optional[str] = None, initialize: bool = True):
         root_path = Path(path).resolve()
         self.root_path = root_path.as_posix()
         self.name = root_path.name
-        self.media_file_list: List[MediaFile] = []
+        self.media_file_list: OrderedSet = OrderedSet()
         self.media_dir_list = {}
         self.id_map: Dict[str, Union[MediaFile, MediaDirectory]] = {}
         self.filename_map: Dict[str, MediaFile] = {}
         self.state: MediaSetState = MediaSetState(self.root_path)
         self.indexer = MediaIndexer()
+        # Last change id when the media set was loaded or saved, and id of the last added/removed file or directory
+        self.saved_change_id = 0
+        self.structure_change_id = 0
+        if initialize:
+            self.initialize(org_format)
+
+        LOGGER.debug("New MediaSet object created: " + str(id(self)))
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        # Media sets dumped by older versions hold their media files in a list
+        self.media_file_list = OrderedSet(self.media_file_list)
+
+    def initialize(self, org_format: Optional[str] = None) -> None:
         MediaSetInitializer.initialize(self)
         self.state.load_format(org_format)
         self.state.load_metadata_to_read()
+        self.check_signature_algorithm()
 
-        LOGGER.debug("New MediaSet object created: " + str(id(self)))
+    def check_signature_algorithm(self) -> None:
+        """
+        Removes the signatures computed by other algorithms than the configured ones (for images, and for other
+        files), as they cannot be compared to new ones: they are computed again when needed.
+        """
+        saved_algorithms = self.state.get_signature_algorithms()
+        current_algorithms = (Configuration.get().signature_algorithm, Configuration.get().file_signature_algorithm)
+        reset_images, reset_files = (saved != current for saved, current in zip(saved_algorithms, current_algorithms))
+        if not reset_images and not reset_files:
+            return
+        nb_removed = 0
+        for media_file in self.media_file_list:
+            reset = reset_images if media_file.get_extension() in IMAGE_TYPE else reset_files
+            if reset and media_file.get_signature() is not None:
+                self.indexer.remove_media_file(media_file)
+                media_file.metadata[SIGNATURE].value = None
+                self.indexer.add_media_file(media_file)
+                nb_removed += 1
+        if nb_removed != 0:
+            LOGGER.info(f"{nb_removed} signatures computed by {'/'.join(saved_algorithms)} removed "
+                        f"(signature algorithms are now {'/'.join(current_algorithms)})")
 
     @staticmethod
     def load_media_set(path: str, org_format: Optional[str] = None) -> "MediaSet":
         if path is None:
             raise ValueError("Invalid MediaSet path: None")
         LOGGER.write_title_2(str(path), "Opening media directory")
-        loaded = MediaSetDump.get(OutputDirectory.get(path)).load()
+        media_set = MediaSet(path, initialize=False)
+        output_directory = OutputDirectory.get(media_set.root_path)
+        catalog = MediaSetCatalog.get(output_directory)
+        cache = MediaSetCache.get(output_directory)
+        # The inactive one of the catalog and cfm.cache is also loaded, when switching from one to the other
+        storages = [catalog, cache] if catalog.is_active else [cache, catalog]
+        loaded = any(storage.load(media_set) for storage in storages)
         if loaded:
-            if len(loaded.media_file_list) >= 1:
-                loaded = loaded.media_file_list[0].parent_set
-            root_path = Path(path).resolve()
-            loaded.root_path = root_path.as_posix()
-            loaded.state = MediaSetState(loaded.root_path)
-            MediaSetInitializer.initialize(loaded)
-            loaded.state.load_format(org_format)
-            loaded.state.load_metadata_to_read()
-            return loaded
+            media_set.mark_as_saved()
         else:
-            return MediaSet(path, org_format)
+            # Media sets saved by older versions are only available as a pickled dump
+            loaded = MediaSetDump.get(output_directory).load()
+            if loaded:
+                if len(loaded.media_file_list) >= 1:
+                    loaded = loaded.media_file_list[0].parent_set
+                loaded.root_path = media_set.root_path
+                loaded.state = media_set.state
+                loaded.saved_change_id = 0
+                loaded.structure_change_id = ChangeCounter.next()
+                # Index structures may have changed since the dump was written
+                loaded.indexer = MediaIndexer()
+                loaded.indexer.add_media_files(loaded.media_file_list)
+                media_set = loaded
+        media_set.initialize(org_format)
+        return media_set
 
     def __str__(self):
         return str(self.root_path)
@@ -74,12 +128,55 @@ class MediaSet:
         return self.id_map[item_id]
 
     def save_on_disk(self):
-        MediaSetDatabase.get(OutputDirectory.get(self.root_path)).save(self)
-        MediaSetDump.get(OutputDirectory.get(self.root_path)).save(self)
+        output_directory = OutputDirectory.get(self.root_path)
+        MediaSetDatabase.get(output_directory).save(self)
+        # Only one of the catalog and the cache is kept up to date: the other one is deleted, so that it is never
+        # loaded once outdated
+        catalog = MediaSetCatalog.get(output_directory)
+        if catalog.is_active:
+            catalog.save(self)
+            MediaSetCache.get(output_directory).delete()
+        else:
+            MediaSetCache.get(output_directory).save(self)
+            catalog.delete()
+        # The cache replaces the dump written by older versions
+        MediaSetDump.get(output_directory).delete()
+        # Saved after the cache, as directory snapshots are only valid with the media files saved in it
+        DirectorySnapshot.get(output_directory).save()
+        # Saved after the media files, whose signatures have been computed by this algorithm
+        self.state.update_signature_algorithms(Configuration.get().signature_algorithm,
+                                               Configuration.get().file_signature_algorithm)
+        # Results journaled by the batches (see BatchJournal) are now saved
+        output_directory.delete_journals()
+        self.mark_as_saved()
+
+    def mark_as_saved(self) -> None:
+        self.saved_change_id = ChangeCounter.next()
+
+    def iter_dirty(self) -> Iterator[MediaFile]:
+        """
+        Yields the media files that have been added or modified (metadata, path, indexes) since the media set was
+        loaded or saved.
+        """
+        for media_file in self.media_file_list:
+            if media_file.get_change_id() > self.saved_change_id:
+                yield media_file
+
+    def has_changes(self) -> bool:
+        """
+        Returns True if files or directories have been added, removed or modified since the media set was loaded
+        or saved.
+        """
+        if self.structure_change_id > self.saved_change_id:
+            return True
+        if any(media_dir.metadata.get_change_id() > self.saved_change_id for media_dir in self.media_dir_list.values()):
+            return True
+        return next(self.iter_dirty(), None) is not None
 
     def register_file(self, media_file: MediaFile) -> None:
         """Adds a media file to the internal structures and updates the indexes."""
-        self.media_file_list.append(media_file)
+        self.structure_change_id = ChangeCounter.next()
+        self.media_file_list.add(media_file)
         self.id_map[media_file.file_desc.id] = media_file
         self.filename_map[media_file.get_path()] = media_file
         self.indexer.add_media_file(media_file)
@@ -88,6 +185,7 @@ class MediaSet:
 
     def register_directory(self, media_dir: MediaDirectory) -> None:
         """Adds a media directory to the internal structures and updates the indexes."""
+        self.structure_change_id = ChangeCounter.next()
         self.media_dir_list[media_dir.file_desc.relative_path] = media_dir
         self.id_map[media_dir.file_desc.id] = media_dir
         self.filename_map[media_dir.file_desc.relative_path] = media_dir
@@ -96,15 +194,15 @@ class MediaSet:
 
     def unregister_file(self, media_file: MediaFile) -> None:
         """Removes a media file from the internal structures and updates the indexes."""
+        self.structure_change_id = ChangeCounter.next()
         self.indexer.remove_media_file(media_file)
         if media_file.get_path() in self.filename_map:
             del self.filename_map[media_file.get_path()]
         if media_file.file_desc.id in self.id_map:
             del self.id_map[media_file.file_desc.id]
-        if media_file in self.media_file_list:
-            self.media_file_list.remove(media_file)
+        self.media_file_list.discard(media_file)
         if media_file.parent_dir is not None:
-            media_file.parent_dir.children_files.remove(media_file)
+            media_file.parent_dir.children_files.discard(media_file)
 
     def get_media(self, media_id: str) -> Optional[MediaFile]:
         return self.id_map.get(media_id, None)
@@ -121,18 +219,18 @@ class MediaSet:
         return MediaSetComparator.cmp(self, other_media_set)
 
     def get_date_sorted_media_list(self):
-        self.media_file_list.sort(key=MediaFile.get_date)
+        self.media_file_list.sort(key=MediaFile.get_date_timestamp)
         return self.media_file_list
 
     def get_oldest_modified_file(self, media_list: List["MediaFile"]) -> Tuple[Any, Any]:
         oldest_date = None
         oldest_media = None
         for media_file in media_list:
-            media_date = media_file.get_last_modification_date()
+            media_date = media_file.get_last_modification_timestamp()
             if oldest_date is None or media_date < oldest_date:
                 oldest_date = media_date
                 oldest_media = media_file
-        return oldest_media, oldest_date
+        return oldest_media, Metadata.to_datetime(oldest_date)
 
     def get_file_list(self, ext=None, cm=None) -> List["MediaFile"]:
         return [media_file for media_file in self.media_file_list if MediaSet.filter(media_file, ext, cm)]
@@ -141,25 +239,29 @@ class MediaSet:
     def filter(media_file: MediaFile, ext_filter: Optional[List[str]], cm_filter: str) -> bool:
         if ext_filter is not None and media_file.file_desc.extension not in ext_filter:
             return False
-        cfm_camera_model = media_file.metadata[CFM_CAMERA_MODEL]
-        internal_md = media_file.metadata[INTERNAL]
-        model_value = internal_md.get_md_value(MetadataNames.MODEL)
+        cfm_camera_model = media_file.get_camera_model()
+        internal_md = media_file.metadata.get(INTERNAL)
+        model_value = internal_md.get_md_value(MetadataNames.MODEL) if internal_md is not None else None
         if cm_filter == "known":
             if model_value is None:
                 return False
         elif cm_filter == "unknown":
-            if model_value is not None or cfm_camera_model.value is not None:
+            if model_value is not None or cfm_camera_model is not None:
                 return False
         elif cm_filter == "recovered":
-            if model_value is not None or cfm_camera_model.value is None:
+            if model_value is not None or cfm_camera_model is None:
                 return False
         return True
 
     def get_media_in_directory_recursive(self, dir_id: str) -> list:
         """
-        Returns all MediaFiles whose parent is the MediaDirectory with id dir_id,
+        Returns all MediaFiles whose parent is the MediaDirectory with id dir_id (hex form),
         or one of its subdirectories (recursive), sorted by descending date.
         """
+        try:
+            dir_id = int(dir_id, 16)
+        except ValueError:
+            return []
         if dir_id not in self.id_map:
             return []
         target_dir = self.id_map[dir_id]
@@ -171,7 +273,7 @@ class MediaSet:
                 _collect_files_recursive(sub_dir)
 
         _collect_files_recursive(target_dir)
-        result.sort(key=MediaFile.get_date, reverse=True)
+        result.sort(key=MediaFile.get_date_timestamp, reverse=True)
         return result
 
     def get_filtered_media(self, other_media_set: "MediaSet", filter_type: str = "only_here", media_list: list = None) -> list:
@@ -210,7 +312,7 @@ class MediaSet:
             result = in_both
         
         # Flatten nested lists if needed
-        if result and isinstance(result[0], list):
+        if result and isinstance(result[0], (list, OrderedSet)):
             result = list(chain.from_iterable(result))
             
         # Filter media_list to only include files from result
@@ -218,7 +320,7 @@ class MediaSet:
         filtered = [m for m in media_list if m in result_set]
         
         # Sort by date descending
-        filtered.sort(key=MediaFile.get_date, reverse=True)
+        filtered.sort(key=MediaFile.get_date_timestamp, reverse=True)
         return filtered
 
     def _synchronize_metadata_type(self, other_media_set: "MediaSet", metadata_type: str, direction: str = "both") -> None:
@@ -271,7 +373,7 @@ class MediaSet:
             self.register_directory(trash_dir)
         
         trash_dir = self.media_dir_list[".cfm-trash"]
-        parent_id = media_file.parent_dir.file_desc.id if media_file.parent_dir else "root"
+        parent_id = media_file.parent_dir.file_desc.get_hex_id() if media_file.parent_dir else "root"
         new_filename = f"{parent_id}-{media_file.file_desc.name}"
         new_path = os.path.join(trash_dir_path, new_filename)
         try:
@@ -0,0 +1,218 @@
+import os
+import pickle
+import struct
+import time
+import zlib
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, List
+
+from camerafile.core.Logging import Logger
+from camerafile.core.MediaDirectory import MediaDirectory
+from camerafile.core.MediaFile import MediaFile
+from camerafile.fileaccess.StandardFileDescription import StandardFileDescription
+from camerafile.fileaccess.ZipFileDescription import ZipFileDescription
+from camerafile.metadata.MetadataList import MetadataList
+
+if TYPE_CHECKING:
+    from camerafile.core.MediaSet import MediaSet
+
+LOGGER = Logger(__name__)
+
+
+class InvalidCacheError(Exception):
+    pass
+
+
+class MediaSetCache:
+    """
+    MediaSetCache stores the content of a media set in cfm.cache as flat records, only made of primitive types:
+    one record per directory, then one record per media file, grouped in chunks of CHUNK_SIZE records.
+    The file starts with a header frame (containing the schema version), followed by one frame per chunk.
+    Each frame is written as [length, crc32, pickled content], so that a corrupted file is always detected.
+    A new cache is written in a temporary file, which is then renamed: an interrupted save never corrupts the
+    existing cache.
+    On load, MediaDirectory and MediaFile objects are created again and registered in the media set,
+    which also rebuilds its maps and its indexer.
+    """
+    SCHEMA_VERSION = 1
+    CHUNK_SIZE = 10000
+    FRAME_HEADER = struct.Struct("<QI")
+    DIRECTORY_RECORDS = "d"
+    FILE_RECORDS = "f"
+    STANDARD_FILE = 0
+    ZIPPED_FILE = 1
+    __instance = {}
+
+    def __init__(self, output_directory_path):
+        self.cache_file = Path(output_directory_path) / "cfm.cache"
+        self.is_active = True
+        # True if the cache contains the media set, as it was when loaded or saved
+        self.synchronized = False
+
+    @staticmethod
+    def get(output_directory) -> "MediaSetCache":
+        if output_directory not in MediaSetCache.__instance:
+            MediaSetCache.__instance[output_directory] = MediaSetCache(output_directory.path)
+        return MediaSetCache.__instance[output_directory]
+
+    def exists(self):
+        return self.cache_file.exists()
+
+    def delete(self):
+        if self.exists():
+            self.cache_file.unlink()
+        self.synchronized = False
+
+    def load(self, media_set: "MediaSet") -> bool:
+        """
+        Fills an empty media set with the content of the cache. Returns False if there is no valid cache.
+        """
+        if not self.is_active or not self.exists():
+            return False
+        LOGGER.info("Restoring cache...")
+        try:
+            header, dir_records, file_records = self.read_records()
+        except (InvalidCacheError, EOFError, pickle.UnpicklingError, ValueError, TypeError) as e:
+            LOGGER.info(f"Cache file was found, but is invalid ({e}). Ignore it.")
+            return False
+        if header["version"] != self.SCHEMA_VERSION:
+            LOGGER.info(f"Cache file was found, but its version ({header['version']}) is not supported. Ignore it.")
+            return False
+        for record in dir_records:
+            self.load_directory(media_set, record)
+        for record in file_records:
+            self.load_media_file(media_set, record)
+        self.synchronized = True
+        return True
+
+    def read_records(self):
+        dir_records = []
+        file_records = []
+        with open(self.cache_file, "rb") as file:
+            header = self.read_frame(file)
+            if header is None:
+                raise InvalidCacheError("empty file")
+            frame = self.read_frame(file)
+            while frame is not None:
+                record_type, records = frame
+                if record_type == self.DIRECTORY_RECORDS:
+                    dir_records += records
+                elif record_type == self.FILE_RECORDS:
+                    file_records += records
+                frame = self.read_frame(file)
+        if len(dir_records) != header["nb_dirs"] or len(file_records) != header["nb_files"]:
+            raise InvalidCacheError("missing records")
+        return header, dir_records, file_records
+
+    def read_frame(self, file):
+        frame_header = file.read(self.FRAME_HEADER.size)
+        if len(frame_header) == 0:
+            return None
+        if len(frame_header) != self.FRAME_HEADER.size:
+            raise InvalidCacheError("truncated frame")
+        length, crc = self.FRAME_HEADER.unpack(frame_header)
+        content = file.read(length)
+        if len(content) != length or zlib.crc32(content) != crc:
+            raise InvalidCacheError("corrupted frame")
+        return pickle.loads(content)
+
+    def write_frame(self, file, content):
+        data = pickle.dumps(content, protocol=pickle.HIGHEST_PROTOCOL)
+        file.write(self.FRAME_HEADER.pack(len(data), zlib.crc32(data)))
+        file.write(data)
+
+    def save(self, media_set: "MediaSet"):
+        if not self.is_active:
+            return
+        if self.synchronized and self.exists() and not media_set.has_changes():
+            LOGGER.info(f"{self.cache_file} is up to date")
+            return
+        LOGGER.start("Writing " + str(self.cache_file) + "... {result}")
+        LOGGER.update(result="")
+        start_time = time.time()
+        media_dirs = [media_dir for path, media_dir in media_set.media_dir_list.items() if path != ""]
+        header = {"version": self.SCHEMA_VERSION,
+                  "nb_dirs": len(media_dirs),
+                  "nb_files": len(media_set.media_file_list)}
+        tmp_file = self.cache_file.with_name(self.cache_file.name + ".tmp")
+        with open(tmp_file, "wb") as file:
+            self.write_frame(file, header)
+            for chunk in self.chunks([self.directory_record(media_dir) for media_dir in media_dirs]):
+                self.write_frame(file, (self.DIRECTORY_RECORDS, chunk))
+            for chunk in self.chunks(map(self.media_file_record, media_set.media_file_list)):
+                self.write_frame(file, (self.FILE_RECORDS, chunk))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(tmp_file, self.cache_file)
+        self.synchronized = True
+        processing_time = str(int(time.time() - start_time)) + " seconds."
+        LOGGER.end(result=processing_time)
+
+    @classmethod
+    def chunks(cls, records) -> Iterator[List[tuple]]:
+        chunk = []
+        for record in records:
+            chunk.append(record)
+            if len(chunk) == cls.CHUNK_SIZE:
+                yield chunk
+                chunk = []
+        if len(chunk) != 0:
+            yield chunk
+
+    @staticmethod
+    def metadata_record(metadata: MetadataList) -> tuple:
+        return tuple((name, md.value, md.binary_value) for name, md in metadata.metadata_list.items()
+                     if md.value is not None or md.binary_value is not None)
+
+    @staticmethod
+    def load_metadata(metadata: MetadataList, record: tuple):
+        for name, value, binary_value in record:
+            metadata[name].value = value
+            metadata[name].binary_value = binary_value
+
+    @staticmethod
+    def parent_path(media_file_or_dir):
+        return media_file_or_dir.parent_dir.file_desc.relative_path if media_file_or_dir.parent_dir else None
+
+    @classmethod
+    def directory_record(cls, media_dir: MediaDirectory) -> tuple:
+        return (media_dir.file_desc.relative_path,
+                cls.parent_path(media_dir),
+                media_dir.file_desc.system_id,
+                cls.metadata_record(media_dir.metadata))
+
+    @classmethod
+    def media_file_record(cls, media_file: MediaFile) -> tuple:
+        file_desc = media_file.file_desc
+        if isinstance(file_desc, ZipFileDescription):
+            kind, path, zip_file_path = cls.ZIPPED_FILE, file_desc.relative_zip_path, file_desc.file_path
+        else:
+            kind, path, zip_file_path = cls.STANDARD_FILE, file_desc.relative_path, None
+        return (kind, path, zip_file_path,
+                file_desc.file_size,
+                file_desc.system_id,
+                cls.parent_path(media_file),
+                cls.metadata_record(media_file.metadata))
+
+    @classmethod
+    def load_directory(cls, media_set: "MediaSet", record: tuple):
+        relative_path, parent_path, system_id, metadata = record
+        parent_dir = media_set.media_dir_list[parent_path] if parent_path is not None else None
+        media_dir = MediaDirectory(StandardFileDescription(relative_path, 0, system_id), parent_dir, media_set)
+        cls.load_metadata(media_dir.metadata, metadata)
+        media_set.register_directory(media_dir)
+        if parent_dir is None:
+            media_set.media_dir_list[""] = media_dir
+
+    @classmethod
+    def load_media_file(cls, media_set: "MediaSet", record: tuple):
+        kind, path, zip_file_path, file_size, system_id, parent_path, metadata = record
+        if kind == cls.ZIPPED_FILE:
+            file_desc = ZipFileDescription(path, zip_file_path, file_size)
+        else:
+            file_desc = StandardFileDescription(path, file_size)
+        file_desc.system_id = system_id
+        parent_dir = media_set.media_dir_list[parent_path] if parent_path is not None else None
+        media_file = MediaFile(file_desc, parent_dir, media_set)
+        cls.load_metadata(media_file.metadata, metadata)
+        media_set.register_file(media_file)
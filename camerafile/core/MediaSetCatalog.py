@@ -0,0 +1,280 @@
+import pickle
+import sqlite3
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Optional
+
+from camerafile.core.Configuration import Configuration
+from camerafile.core.Constants import INTERNAL, SIGNATURE, ORIGINAL_COPY_PATH, DESTINATION_COPY_PATH, \
+    ORIGINAL_PATH, ORIGINAL_MOVE_PATH, DESTINATION_MOVE_PATH
+from camerafile.core.Logging import Logger
+from camerafile.core.MediaDirectory import MediaDirectory
+from camerafile.core.MediaFile import MediaFile
+from camerafile.core.MediaSetCache import MediaSetCache
+from camerafile.core.MediaSetDatabase import DBConnection
+from camerafile.fileaccess.ZipFileDescription import ZipFileDescription
+from camerafile.mdtools.MdConstants import MetadataNames
+
+if TYPE_CHECKING:
+    from camerafile.core.MediaSet import MediaSet
+
+LOGGER = Logger(__name__)
+
+
+class MediaSetCatalog:
+    """
+    MediaSetCatalog stores the content of a media set in a SQLite database (catalog.db), that can be used
+    instead of cfm.cache. There is one table for directories, files, internal metadata, signatures,
+    copy provenance (original and destination paths of copied/moved files) and other metadata,
+    all keyed by relative path.
+    On save, only the rows of modified media files (see MediaSet.iter_dirty) are built. A hash of each row is kept
+    when the catalog is loaded or saved, so that only the rows that have actually changed are written
+    (with batched upserts). The rows of media files that no longer exist are deleted.
+    """
+    SCHEMA_VERSION = 1
+    COPY_PROVENANCE = [ORIGINAL_COPY_PATH, DESTINATION_COPY_PATH, ORIGINAL_PATH, ORIGINAL_MOVE_PATH,
+                       DESTINATION_MOVE_PATH]
+    # Columns of each table, after the "path" primary key
+    TABLES = {"directories": ("parent_path", "system_id", "metadata"),
+              "files": ("zip_path", "zip_file_path", "size", "system_id", "parent_path"),
+              "internal_metadata": ("date", "model", "value", "binary_value"),
+              "signatures": ("value", "binary_value"),
+              "copy_provenance": ("original_copy_path", "destination_copy_path", "original_path",
+                                  "original_move_path", "destination_move_path"),
+              "other_metadata": ("metadata",)}
+    __instance = {}
+
+    def __init__(self, output_directory_path):
+        self.catalog_file = Path(output_directory_path) / "catalog.db"
+        self.is_active = Configuration.get().catalog
+        # {table: {path: hash of the row}}, as it is currently stored in the catalog
+        self.row_hashes: Dict[str, Dict[str, int]] = {}
+        # True if the catalog contains the media set, as it was when loaded or saved
+        self.synchronized = False
+
+    @staticmethod
+    def get(output_directory) -> "MediaSetCatalog":
+        if output_directory not in MediaSetCatalog.__instance:
+            MediaSetCatalog.__instance[output_directory] = MediaSetCatalog(output_directory.path)
+        return MediaSetCatalog.__instance[output_directory]
+
+    def exists(self):
+        return self.catalog_file.exists()
+
+    def delete(self):
+        for file in [self.catalog_file, Path(str(self.catalog_file) + "-wal"), Path(str(self.catalog_file) + "-shm")]:
+            if file.exists():
+                file.unlink()
+        self.row_hashes = {}
+        self.synchronized = False
+
+    def connect(self) -> DBConnection:
+        connection = DBConnection(self.catalog_file, journal_mode="WAL")
+        connection.execute("PRAGMA synchronous = NORMAL")
+        if connection.new_database:
+            self.create_tables(connection)
+        return connection
+
+    def create_tables(self, connection: DBConnection):
+        connection.execute("CREATE TABLE catalog_info(key TEXT PRIMARY KEY, value TEXT)")
+        connection.execute("INSERT INTO catalog_info VALUES ('version', ?)", (str(self.SCHEMA_VERSION),))
+        for table, columns in self.TABLES.items():
+            connection.execute(f"CREATE TABLE {table}(path TEXT PRIMARY KEY, {', '.join(columns)})")
+        connection.execute("CREATE INDEX idx_internal_date ON internal_metadata(date)")
+        connection.commit()
+
+    @staticmethod
+    def get_version(connection: DBConnection) -> Optional[int]:
+        row = connection.execute("SELECT value FROM catalog_info WHERE key = 'version'").fetchone()
+        return int(row[0]) if row is not None else None
+
+    def load(self, media_set: "MediaSet") -> bool:
+        """
+        Fills an empty media set with the content of the catalog. Returns False if there is no valid catalog.
+        The catalog is loaded even if it is not active, so that the media set can be migrated to cfm.cache.
+        """
+        if not self.exists():
+            return False
+        LOGGER.info("Restoring catalog " + str(self.catalog_file) + "...")
+        connection = None
+        try:
+            connection = self.connect()
+            version = self.get_version(connection)
+            if version != self.SCHEMA_VERSION:
+                LOGGER.info(f"Catalog was found, but its version ({version}) is not supported. Ignore it.")
+                return False
+            rows = {table: {row[0]: row[1:] for row in connection.execute(f"SELECT * FROM {table} ORDER BY rowid")}
+                    for table in self.TABLES}
+        except sqlite3.DatabaseError as e:
+            LOGGER.info(f"Catalog was found, but is invalid ({e}). Ignore it.")
+            return False
+        finally:
+            if connection is not None:
+                connection.close()
+
+        sorted_dirs = sorted(rows["directories"].items(), key=lambda x: (x[1][0] is not None, x[0].count("/")))
+        for path, (parent_path, system_id, metadata) in sorted_dirs:
+            MediaSetCache.load_directory(media_set, (path, parent_path, self.decode_system_id(system_id),
+                                                     pickle.loads(metadata)))
+        for path, (zip_path, zip_file_path, size, system_id, parent_path) in rows["files"].items():
+            kind = MediaSetCache.ZIPPED_FILE if zip_path is not None else MediaSetCache.STANDARD_FILE
+            MediaSetCache.load_media_file(media_set, (kind, zip_path if zip_path is not None else path,
+                                                      zip_file_path, size, self.decode_system_id(system_id),
+                                                      parent_path, self.metadata_record(path, rows)))
+        self.row_hashes = {table: {path: hash(row) for path, row in table_rows.items()}
+                           for table, table_rows in rows.items()}
+        self.synchronized = True
+        return True
+
+    def metadata_record(self, path, rows) -> tuple:
+        record = []
+        internal = rows["internal_metadata"].get(path)
+        if internal is not None:
+            record.append((INTERNAL, self.decode(internal[2]), internal[3]))
+        signature = rows["signatures"].get(path)
+        if signature is not None:
+            record.append((SIGNATURE, self.decode(signature[0]), signature[1]))
+        copy_provenance = rows["copy_provenance"].get(path)
+        if copy_provenance is not None:
+            record += [(name, value, None) for name, value in zip(self.COPY_PROVENANCE, copy_provenance)
+                       if value is not None]
+        other = rows["other_metadata"].get(path)
+        if other is not None:
+            record += pickle.loads(other[0])
+        return tuple(record)
+
+    def save(self, media_set: "MediaSet") -> int:
+        """
+        Writes the rows of the media files modified since the catalog was loaded or saved (see MediaSet.iter_dirty),
+        and deletes the rows of removed media files. Returns the number of written rows.
+        """
+        if not self.is_active:
+            return 0
+        LOGGER.start("Writing " + str(self.catalog_file) + "... {result}")
+        LOGGER.update(result="")
+        start_time = time.time()
+        connection = None
+        try:
+            connection = self.connect()
+            valid = self.get_version(connection) == self.SCHEMA_VERSION
+        except sqlite3.DatabaseError:
+            valid = False
+        if not valid:
+            if connection is not None:
+                connection.close()
+            self.delete()
+            connection = self.connect()
+        if connection.new_database:
+            self.row_hashes = {}
+            self.synchronized = False
+        # If the media set has not been loaded from this catalog, all media files have to be written
+        media_files = list(media_set.iter_dirty()) if self.synchronized else media_set.media_file_list
+        check_removed = not self.synchronized or media_set.structure_change_id > media_set.saved_change_id
+        rows = self.build_rows(media_set, media_files)
+        updated_files = [media_file.get_path() for media_file in media_files]
+        nb_written = 0
+        nb_deleted = 0
+        try:
+            for table, table_rows in rows.items():
+                if table == "directories":
+                    updated_paths, current_paths = rows["directories"].keys(), media_set.media_dir_list
+                else:
+                    updated_paths, current_paths = updated_files, media_set.filename_map
+                written, deleted = self.save_table(connection, table, table_rows, updated_paths,
+                                                   current_paths if check_removed else None)
+                nb_written += written
+                nb_deleted += deleted
+            connection.commit()
+        finally:
+            connection.close()
+        self.synchronized = True
+        processing_time = str(int(time.time() - start_time)) + " seconds."
+        LOGGER.end(result=f"{nb_written} rows written, {nb_deleted} rows deleted, {processing_time}")
+        return nb_written
+
+    def save_table(self, connection: DBConnection, table: str, table_rows: Dict[str, tuple], updated_paths,
+                   current_paths=None):
+        """
+        Upserts the rows that have changed, and deletes the rows of updated paths that have no row anymore.
+        If current_paths is defined, the rows whose path is not in current_paths are also deleted.
+        """
+        saved_hashes = self.row_hashes.setdefault(table, {})
+        changed = []
+        for path, row in table_rows.items():
+            row_hash = hash(row)
+            if saved_hashes.get(path) != row_hash:
+                changed.append((path,) + row)
+                saved_hashes[path] = row_hash
+        deleted = [path for path in updated_paths if path not in table_rows and path in saved_hashes]
+        if current_paths is not None:
+            deleted += [path for path in saved_hashes if path not in current_paths]
+        for path in deleted:
+            del saved_hashes[path]
+        columns = self.TABLES[table]
+        connection.executemany(f"INSERT INTO {table}(path, {', '.join(columns)}) "
+                               f"VALUES (?{', ?' * len(columns)}) "
+                               f"ON CONFLICT(path) DO UPDATE SET "
+                               f"{', '.join(column + ' = excluded.' + column for column in columns)}",
+                               changed)
+        connection.executemany(f"DELETE FROM {table} WHERE path = ?", [(path,) for path in deleted])
+        return len(changed), len(deleted)
+
+    def build_rows(self, media_set: "MediaSet", media_files) -> Dict[str, Dict[str, tuple]]:
+        rows = {table: {} for table in self.TABLES}
+        for path, media_dir in media_set.media_dir_list.items():
+            if path != "":
+                rows["directories"][media_dir.file_desc.relative_path] = self.directory_row(media_dir)
+        for media_file in media_files:
+            self.add_media_file_rows(rows, media_file)
+        return rows
+
+    def directory_row(self, media_dir: MediaDirectory) -> tuple:
+        return (MediaSetCache.parent_path(media_dir),
+                self.encode_system_id(media_dir.file_desc.system_id),
+                pickle.dumps(MediaSetCache.metadata_record(media_dir.metadata), protocol=pickle.HIGHEST_PROTOCOL))
+
+    def add_media_file_rows(self, rows: Dict[str, Dict[str, tuple]], media_file: MediaFile):
+        path = media_file.get_path()
+        file_desc = media_file.file_desc
+        if isinstance(file_desc, ZipFileDescription):
+            zip_path, zip_file_path = file_desc.relative_zip_path, file_desc.file_path
+        else:
+            zip_path, zip_file_path = None, None
+        rows["files"][path] = (zip_path, zip_file_path, file_desc.file_size,
+                               self.encode_system_id(file_desc.system_id), MediaSetCache.parent_path(media_file))
+
+        metadata = media_file.metadata
+        internal = metadata.get(INTERNAL)
+        if internal is not None and (internal.value is not None or internal.binary_value is not None):
+            date = internal.get_md_value(MetadataNames.CREATION_DATE)
+            rows["internal_metadata"][path] = (str(date) if date is not None else None,
+                                               internal.get_md_value(MetadataNames.MODEL),
+                                               self.encode(internal.value),
+                                               internal.binary_value)
+        signature = metadata.get(SIGNATURE)
+        if signature is not None and (signature.value is not None or signature.binary_value is not None):
+            rows["signatures"][path] = (self.encode(signature.value), signature.binary_value)
+        copy_provenance = tuple(metadata.get_value(name) for name in self.COPY_PROVENANCE)
+        if any(value is not None for value in copy_provenance):
+            rows["copy_provenance"][path] = copy_provenance
+        other = tuple(record for record in MediaSetCache.metadata_record(metadata)
+                      if record[0] not in [INTERNAL, SIGNATURE] and record[0] not in self.COPY_PROVENANCE)
+        if len(other) != 0:
+            rows["other_metadata"][path] = (pickle.dumps(other, protocol=pickle.HIGHEST_PROTOCOL),)
+
+    @staticmethod
+    def encode(value):
+        return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL) if value is not None else None
+
+    @staticmethod
+    def decode(value):
+        return pickle.loads(value) if value is not None else None
+
+    @staticmethod
+    def encode_system_id(system_id):
+        # System ids are 96 bits integers, that do not fit in a SQLite INTEGER
+        return str(system_id) if system_id is not None else None
+
+    @staticmethod
+    def decode_system_id(system_id):
+        return int(system_id) if system_id is not None else None
@@ -108,6 +108,7 @@ class MediaSetComparator:
         - all_media is sorted in reverse chronological order.
         """
         from camerafile.core.MediaFile import MediaFile
+        from camerafile.metadata.Metadata import Metadata
         from datetime import datetime
         map_source = {}
         map_dest = {}
@@ -116,10 +117,15 @@ class MediaSetComparator:
         treated = set()
         # Tri chronologique normal (plus ancien d'abord) pour que les nouvelles photos aient de nouveaux IDs
         # et que les anciennes photos gardent leurs IDs (utile pour l'affichage dans la galerie)
-        fallback_date = datetime(1982, 2, 2)
+        fallback_date = Metadata.to_timestamp(datetime(1982, 2, 2))
+
+        def date_key(m):
+            timestamp = m.get_date_timestamp()
+            return fallback_date if timestamp is None else timestamp
+
         all_media = sorted(
             list(media_set1.media_file_list) + list(media_set2.media_file_list),
-            key=lambda m: (m.get_date() or fallback_date),
+            key=date_key,
             reverse=False
         )
         for media in all_media:
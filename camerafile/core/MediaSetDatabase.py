@@ -15,21 +15,27 @@ LOGGER = Logger(__name__)
 
 
 class DBConnection:
-    def __init__(self, db_path, delete_existing_database = False):
+    def __init__(self, db_path, delete_existing_database = False, journal_mode="MEMORY"):
         self.db_path = db_path
         if delete_existing_database and os.path.exists(db_path):
             os.remove(db_path)
         self.new_database = not os.path.exists(db_path)
         self.file_connection = sqlite3.connect(db_path)
         self.cursor = self.file_connection.cursor()
-        self.cursor.execute("PRAGMA journal_mode = MEMORY")
+        self.cursor.execute(f"PRAGMA journal_mode = {journal_mode}")
 
-    def execute(self, cmd):
-        return self.cursor.execute(cmd)
+    def execute(self, cmd, parameters=()):
+        return self.cursor.execute(cmd, parameters)
+
+    def executemany(self, cmd, seq_of_parameters):
+        return self.cursor.executemany(cmd, seq_of_parameters)
 
     def commit(self):
         return self.file_connection.commit()
 
+    def close(self):
+        return self.file_connection.close()
+
 
 class MediaSetDatabase:
     __instance = {}
@@ -30,6 +30,10 @@ class MediaSetDump:
     def exists(self):
         return self.dump_file.exists()
 
+    def delete(self):
+        if self.exists():
+            self.dump_file.unlink()
+
     def load(self) -> "MediaSet":
         try:
             if self.is_active and self.exists():
@@ -1,11 +1,13 @@
 from pathlib import Path
 import os
 
+from camerafile.core.DirectorySnapshot import DirectorySnapshot
 from camerafile.core.FileScanner import FileScanner
 from camerafile.core.Logging import Logger
 from camerafile.core.MediaDirectory import MediaDirectory
 from camerafile.core.MediaFile import MediaFile
-from camerafile.core.MediaSetDump import MediaSetDump
+from camerafile.core.MediaSetCache import MediaSetCache
+from camerafile.core.MediaSetCatalog import MediaSetCatalog
 from camerafile.core.OutputDirectory import OutputDirectory
 from camerafile.fileaccess.StandardFileDescription import StandardFileDescription
 
@@ -19,10 +21,15 @@ class MediaSetInitializer:
         for key in media_set.filename_map:
             media_set.filename_map[key].exists = False
 
-        # 2. Scan the disk to obtain new files and directories
-        new_files, new_dirs = FileScanner.update_from_disk(media_set.root_path, media_set.state, media_set.filename_map)
-        dump_file = MediaSetDump.get(OutputDirectory.get(media_set.root_path)).dump_file
-        LOGGER.info_indent(f"{len(media_set.filename_map)} media files and folders loaded from dump {dump_file}", prof=2)
+        # 2. Scan the disk to obtain new files and directories (directories unchanged since last scan are not listed)
+        snapshot = DirectorySnapshot.get(OutputDirectory.get(media_set.root_path))
+        snapshot.start_scan(media_set.filename_map, media_set.state.state.get("ignore"))
+        new_files, new_dirs = FileScanner.update_from_disk(media_set.root_path, media_set.state, media_set.filename_map,
+                                                           snapshot=snapshot)
+        output_directory = OutputDirectory.get(media_set.root_path)
+        catalog = MediaSetCatalog.get(output_directory)
+        cache_file = catalog.catalog_file if catalog.is_active else MediaSetCache.get(output_directory).cache_file
+        LOGGER.info_indent(f"{len(media_set.filename_map)} media files and folders loaded from {cache_file}", prof=2)
 
         # 3. Initialize the root directory if not exists
         if "." not in media_set.media_dir_list:
@@ -39,6 +46,9 @@ class MediaSetInitializer:
         # 6. Delete files that are still marked as not existing after full scan
         MediaSetInitializer.delete_not_existing_media(media_set)
 
+        # 7. Update directory snapshots, now that the children of each directory are known
+        snapshot.end_scan(media_set.filename_map)
+
     @staticmethod
     def init_new_directories(media_set, found_dirs_map) -> None:
         LOGGER.start("{nb_dir} new directories that are not already in dump", 1000, prof=2)
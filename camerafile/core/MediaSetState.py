@@ -5,6 +5,7 @@ from typing import Union
 import yaml
 from camerafile.core.OutputDirectory import OutputDirectory
 from camerafile.core.Configuration import Configuration
+from camerafile.core.Constants import DHASH, FILE_SIZE
 from camerafile.core.Logging import Logger
 from camerafile.core.OrgFormat import OrgFormat
 from camerafile.mdtools.MdConstants import MetadataNames
@@ -109,6 +110,21 @@ class MediaSetState:
         self.state["loaded_metadata"] = [str(md) for md in self.md_needed]
         self.save()
 
+    def get_signature_algorithms(self):
+        """
+        Returns the algorithms that computed the saved signatures of images, and of other files.
+        """
+        # Media sets saved before signature algorithms were versioned only hold DHASH signatures of images, and
+        # the size of other files
+        return self.state.get("signature_algorithm", DHASH), self.state.get("file_signature_algorithm", FILE_SIZE)
+
+    def update_signature_algorithms(self, signature_algorithm, file_signature_algorithm):
+        if (self.state.get("signature_algorithm"), self.state.get("file_signature_algorithm")) \
+                != (signature_algorithm, file_signature_algorithm):
+            self.state["signature_algorithm"] = signature_algorithm
+            self.state["file_signature_algorithm"] = file_signature_algorithm
+            self.save()
+
     def should_be_ignored(self, file_path):
         if "ignore" in self.state:
             for regexp in self.state["ignore"]:
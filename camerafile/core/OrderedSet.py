@@ -0,0 +1,65 @@
+class OrderedSet:
+    """
+    Set that keeps the insertion order of its items, used instead of lists to hold media files and directories:
+    add, remove and membership tests are O(1) instead of a scan of the whole list.
+    It also provides the list methods used on these containers (append, [0], slices, sort), so it can be used
+    where a list was expected.
+    """
+    __slots__ = ("items",)
+
+    def __init__(self, items=()):
+        # dicts are ordered: values are not used
+        self.items = dict.fromkeys(items)
+
+    def __reduce__(self):
+        return self.__class__, (list(self.items),)
+
+    def __repr__(self):
+        return "OrderedSet(" + repr(list(self.items)) + ")"
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __contains__(self, item):
+        return item in self.items
+
+    def __eq__(self, other):
+        if isinstance(other, (OrderedSet, list)):
+            return list(self.items) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __getitem__(self, index):
+        if index == 0:
+            for item in self.items:
+                return item
+            raise IndexError("OrderedSet index out of range")
+        return list(self.items)[index]
+
+    def add(self, item):
+        self.items[item] = None
+
+    append = add
+
+    def extend(self, items):
+        for item in items:
+            self.items[item] = None
+
+    def remove(self, item):
+        try:
+            del self.items[item]
+        except KeyError:
+            raise ValueError("OrderedSet.remove(x): x not in OrderedSet") from None
+
+    def discard(self, item):
+        self.items.pop(item, None)
+
+    def sort(self, key=None, reverse=False):
+        self.items = dict.fromkeys(sorted(self.items, key=key, reverse=reverse))
+
+    def copy(self):
+        return OrderedSet(self.items)
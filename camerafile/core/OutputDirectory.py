@@ -35,6 +35,13 @@ class OutputDirectory:
             OutputDirectory.__instance[root_directory] = OutputDirectory(root_directory)
         return OutputDirectory.__instance[root_directory]
 
+    def get_journal_path(self, name) -> Path:
+        return self.path / f"{name}.journal"
+
+    def delete_journals(self):
+        for journal_path in self.path.glob("*.journal"):
+            os.remove(journal_path)
+
     def save_list(self, list_of_elements, file_name):
         if len(list_of_elements) != 0:
             file_path = self.path / file_name
@@ -0,0 +1,127 @@
+from typing import List, Optional
+
+import dhash
+
+
+class SignatureIndex(dict):
+    """
+    {signature: [media_file, ...]} map of a date, that also indexes its signatures by bands of bits
+    (multi-index hashing), to find the signatures similar to a given one without comparing it to all the
+    signatures of the date.
+    Two signatures are similar if less than 4 bits are different. 128 bits signatures are split in 4 bands of
+    32 bits: if two signatures have at most 3 different bits, at least one of their bands is identical.
+    So only the signatures that share a band with the searched one have to be compared.
+    Longer signatures are not indexed by band, and are always compared.
+    """
+    MAX_DIFFERENT_BITS = 3
+    NB_BANDS = MAX_DIFFERENT_BITS + 1
+    BAND_BITS = 32
+    BAND_MASK = (1 << BAND_BITS) - 1
+    INDEXED_BITS = NB_BANDS * BAND_BITS
+
+    def __init__(self, *args, **kwargs):
+        super().__init__()
+        # One {band value: {signature: None}} map per band (dicts are used as ordered sets)
+        self.bands = [{} for _ in range(self.NB_BANDS)]
+        self.not_indexed = {}
+        # Insertion rank of each signature, to return similar signatures in insertion order
+        self.ranks = {}
+        self.next_rank = 0
+        self.update(*args, **kwargs)
+
+    def __reduce__(self):
+        return self.__class__, (), None, None, iter(self.items())
+
+    def __setitem__(self, signature, media_list):
+        if signature not in self:
+            self._index(signature)
+        super().__setitem__(signature, media_list)
+
+    def __delitem__(self, signature):
+        super().__delitem__(signature)
+        self._unindex(signature)
+
+    def pop(self, signature, *default):
+        if signature in self:
+            media_list = self[signature]
+            del self[signature]
+            return media_list
+        if default:
+            return default[0]
+        raise KeyError(signature)
+
+    def popitem(self):
+        if len(self) == 0:
+            raise KeyError("popitem(): dictionary is empty")
+        signature = list(self)[-1]
+        return signature, self.pop(signature)
+
+    def setdefault(self, signature, default=None):
+        if signature not in self:
+            self[signature] = default
+        return self[signature]
+
+    def update(self, *args, **kwargs):
+        for signature, media_list in dict(*args, **kwargs).items():
+            self[signature] = media_list
+
+    def clear(self):
+        super().clear()
+        self.bands = [{} for _ in range(self.NB_BANDS)]
+        self.not_indexed = {}
+        self.ranks = {}
+
+    def copy(self):
+        return SignatureIndex(self)
+
+    def _band_values(self, signature):
+        return [(signature >> (band * self.BAND_BITS)) & self.BAND_MASK for band in range(self.NB_BANDS)]
+
+    def _is_indexed(self, signature) -> bool:
+        return 0 <= signature and signature.bit_length() <= self.INDEXED_BITS
+
+    def _index(self, signature):
+        self.ranks[signature] = self.next_rank
+        self.next_rank += 1
+        if self._is_indexed(signature):
+            for band_map, band_value in zip(self.bands, self._band_values(signature)):
+                band_map.setdefault(band_value, {})[signature] = None
+        else:
+            self.not_indexed[signature] = None
+
+    def _unindex(self, signature):
+        del self.ranks[signature]
+        if self._is_indexed(signature):
+            for band_map, band_value in zip(self.bands, self._band_values(signature)):
+                signatures = band_map[band_value]
+                del signatures[signature]
+                if not signatures:
+                    del band_map[band_value]
+        else:
+            del self.not_indexed[signature]
+
+    def _candidates(self, signature):
+        if not self._is_indexed(signature):
+            return set(self)
+        candidates = set(self.not_indexed)
+        for band_map, band_value in zip(self.bands, self._band_values(signature)):
+            signatures = band_map.get(band_value)
+            if signatures is not None:
+                candidates.update(signatures)
+        return candidates
+
+    def find_similar(self, signature) -> List[int]:
+        """
+        Returns the signatures that have less than 4 bits different from the given one, in insertion order.
+        """
+        similar = [candidate for candidate in self._candidates(signature)
+                   if dhash.get_num_bits_different(signature, candidate) <= self.MAX_DIFFERENT_BITS]
+        similar.sort(key=self.ranks.__getitem__)
+        return similar
+
+    def find_first_similar(self, signature) -> Optional[int]:
+        """
+        Returns the first inserted signature that has less than 4 bits different from the given one, or None.
+        """
+        similar = self.find_similar(signature)
+        return similar[0] if similar else None
@@ -0,0 +1,139 @@
+from typing import Iterable, List, Optional
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from camerafile.core.SignatureIndex import SignatureIndex
+
+
+class SignatureMatrix:
+    """
+    Groups many signatures of a date at once, in the same way as signatures added one by one to a
+    SignatureIndex: a signature joins the group of the first inserted key signature that has less than 4
+    different bits, or creates a new group.
+    128 bits signatures are packed in a (n, 2) NumPy uint64 array. Pairs of signatures sharing a band of
+    32 bits (see SignatureIndex) are found by sorting each band, and their distances are computed for all
+    pairs at once (popcount of XOR). Only the final assignment of the groups is done signature by signature.
+    If NumPy is not installed, or if a signature does not fit in 128 bits, signatures are not grouped here.
+    """
+    NB_WORDS = 2
+    WORD_BITS = 64
+    WORD_MASK = (1 << WORD_BITS) - 1
+
+    # Below this number of signatures, adding them one by one to the SignatureIndex is faster
+    MIN_BATCH_SIZE = 32
+
+    @staticmethod
+    def is_available() -> bool:
+        return numpy is not None
+
+    @staticmethod
+    def can_group(signatures: List[int]) -> bool:
+        return SignatureMatrix.is_available() and all(0 <= signature and signature.bit_length()
+                                                      <= SignatureIndex.INDEXED_BITS for signature in signatures)
+
+    @staticmethod
+    def pack(signatures: List[int]):
+        """
+        Returns the signatures as a (n, 2) uint64 array: low 64 bits, then high 64 bits.
+        """
+        packed = numpy.empty((len(signatures), SignatureMatrix.NB_WORDS), dtype=numpy.uint64)
+        packed[:, 0] = [signature & SignatureMatrix.WORD_MASK for signature in signatures]
+        packed[:, 1] = [signature >> SignatureMatrix.WORD_BITS for signature in signatures]
+        return packed
+
+    @staticmethod
+    def popcount(words):
+        """
+        Returns the number of bits set in each uint64 of the given array.
+        """
+        if hasattr(numpy, "bitwise_count"):
+            return numpy.bitwise_count(words)
+        # NumPy < 2.0: count the bits of each byte with a lookup table
+        table = numpy.array([bin(byte).count("1") for byte in range(256)], dtype=numpy.uint8)
+        bytes_view = numpy.ascontiguousarray(words).view(numpy.uint8).reshape(words.shape + (8,))
+        return table[bytes_view].sum(axis=-1, dtype=numpy.uint8)
+
+    @staticmethod
+    def distances(packed1, packed2):
+        """
+        Returns the number of different bits between each row of packed1 and the same row of packed2.
+        """
+        return SignatureMatrix.popcount(packed1 ^ packed2).sum(axis=1, dtype=numpy.uint8)
+
+    @staticmethod
+    def band_values(packed, band: int):
+        word = packed[:, band * SignatureIndex.BAND_BITS // SignatureMatrix.WORD_BITS]
+        shift = numpy.uint64(band * SignatureIndex.BAND_BITS % SignatureMatrix.WORD_BITS)
+        return (word >> shift) & numpy.uint64(SignatureIndex.BAND_MASK)
+
+    @staticmethod
+    def similar_pairs(packed):
+        """
+        Returns the (first, second) indexes, with first < second, of the signatures that have less than 4
+        different bits, sorted by second then first.
+        """
+        nb_signatures = packed.shape[0]
+        first_list = []
+        second_list = []
+        for band in range(SignatureIndex.NB_BANDS):
+            values = SignatureMatrix.band_values(packed, band)
+            order = numpy.argsort(values, kind="stable")
+            sorted_values = values[order]
+            # Signatures with the same band value are contiguous once sorted
+            for offset in range(1, nb_signatures):
+                same = numpy.flatnonzero(sorted_values[offset:] == sorted_values[:-offset])
+                if len(same) == 0:
+                    break
+                first_list.append(order[same])
+                second_list.append(order[same + offset])
+        if not first_list:
+            empty = numpy.empty(0, dtype=numpy.int64)
+            return empty, empty
+        first = numpy.concatenate(first_list)
+        second = numpy.concatenate(second_list)
+        first, second = numpy.minimum(first, second), numpy.maximum(first, second)
+        pairs = numpy.unique(second.astype(numpy.int64) * nb_signatures + first)
+        second, first = numpy.divmod(pairs, nb_signatures)
+        similar = SignatureMatrix.distances(packed[first], packed[second]) <= SignatureIndex.MAX_DIFFERENT_BITS
+        return first[similar], second[similar]
+
+    @staticmethod
+    def group(signatures: List[int], keys: Iterable[int] = ()) -> Optional[List[int]]:
+        """
+        Returns, for each signature, the key signature of its group. keys are the key signatures that already
+        exist, in insertion order: they are the first candidates, then the new keys created by the signatures.
+        Returns None if the signatures cannot be grouped by this class.
+        """
+        keys = list(keys)
+        if not SignatureMatrix.can_group(keys + signatures):
+            return None
+
+        positions = {}
+        for signature in keys + signatures:
+            positions.setdefault(signature, len(positions))
+        all_signatures = list(positions)
+        nb_keys = len(keys)
+
+        first, second = SignatureMatrix.similar_pairs(SignatureMatrix.pack(all_signatures))
+        first = first.tolist()
+        second = second.tolist()
+
+        is_key = bytearray(len(all_signatures))
+        is_key[:nb_keys] = b"\x01" * nb_keys
+        group_positions = []
+        pair = 0
+        for position in range(len(all_signatures)):
+            group_position = None
+            while pair < len(second) and second[pair] == position:
+                if group_position is None and is_key[first[pair]]:
+                    group_position = first[pair]
+                pair += 1
+            if group_position is None:
+                is_key[position] = 1
+                group_position = position
+            group_positions.append(group_position)
+
+        return [all_signatures[group_positions[positions[signature]]] for signature in signatures]
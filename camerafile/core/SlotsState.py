@@ -0,0 +1,16 @@
+class SlotsState:
+    """
+    __setstate__ implementation for classes that use __slots__. It also accepts the __dict__ state of objects
+    pickled before __slots__ were used (legacy cfm.dump), where attributes that are not slots anymore are ignored.
+    """
+
+    @staticmethod
+    def restore(obj, state, **defaults):
+        if isinstance(state, tuple):
+            dict_state, slots_state = state
+            state = {**(dict_state or {}), **(slots_state or {})}
+        for name, value in {**defaults, **state}.items():
+            try:
+                object.__setattr__(obj, name, value)
+            except AttributeError:
+                pass
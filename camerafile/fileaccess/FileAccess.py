@@ -33,6 +33,8 @@ class FileAccess:
     def __init__(self, root_path, file_description: FileDescription):
         self.file_desc = file_description
         self.root_path = root_path
+        # Number of bytes read by the last read_md, when the file was read by JPEGMdReader or QuickTimeMdReader
+        self.bytes_read = None
 
     def get_path(self):
         return self.root_path + os.sep + self.file_desc.relative_path
@@ -87,13 +89,16 @@ class FileAccess:
     def is_video(self):
         return self.get_extension() in Constants.VIDEO_TYPE
 
+    def is_heif_image(self):
+        return self.get_extension() in Constants.HEIF_TYPE
+
     def is_qt_video(self):
         return self.get_extension() in Constants.QT_TYPE
 
     def is_avi_video(self):
         return self.get_extension() in Constants.AVI_TYPE
 
-    def read_md(self, args):
+    def read_md(self, args, file=None):
         pass
 
     def open(self):
@@ -121,6 +126,13 @@ class FileAccess:
     def get_cv2_image(self):
         pass
 
+    def local_path(self):
+        """
+        Context manager giving the path of the file on the local file system, for libraries that only read
+        paths (OpenCV).
+        """
+        pass
+
     def move_to(self, new_path: str) -> bool:
         """
         Move the file to a new location.
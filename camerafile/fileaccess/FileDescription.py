@@ -1,23 +1,42 @@
 import hashlib
 import os
+import sys
 from pathlib import Path
 
 from camerafile.core import Constants
+from camerafile.core.ChangeCounter import ChangeCounter
 from camerafile.core.Logging import Logger
+from camerafile.core.SlotsState import SlotsState
 
 LOGGER = Logger(__name__)
 
 
 class FileDescription:
+    """
+    The name of the file is not stored, but computed from its relative path.
+    Extensions are interned, as there are only a few different ones.
+    The id is the md5 of the relative path, stored as an integer (get_hex_id() returns its usual hex form).
+    """
+    __slots__ = ("relative_path", "id", "extension", "file_size", "system_id", "change_id")
 
     def __init__(self, relative_path):
         relative_path = Path(relative_path)
         self.relative_path = relative_path.as_posix()
-        self.name = relative_path.name
         self.id = self._compute_id()
-        self.extension = os.path.splitext(self.name)[1].lower()
+        self.extension = sys.intern(os.path.splitext(relative_path.name)[1].lower())
         self.file_size = None
         self.system_id = None
+        # Id of the last change of relative path (see ChangeCounter)
+        self.change_id = 0
+
+    def __setstate__(self, state):
+        SlotsState.restore(self, state, change_id=0)
+        if isinstance(self.id, str):
+            self.id = int(self.id, 16)
+
+    @property
+    def name(self) -> str:
+        return "" if self.relative_path == "." else self.relative_path.rpartition("/")[2]
 
     def compare_with(self, file_desc_2: "FileDescription"):
         LOGGER.diff("FileDescription", "relative_path", self.relative_path, file_desc_2.relative_path)
@@ -32,6 +51,9 @@ class FileDescription:
 
     def get_id(self):
         return self.id
+
+    def get_hex_id(self) -> str:
+        return f"{self.id:032x}"
     
     def is_image(self):
         return self.extension in Constants.IMAGE_TYPE
@@ -39,9 +61,10 @@ class FileDescription:
     def is_video(self):
         return self.extension in Constants.VIDEO_TYPE
 
-    def _compute_id(self) -> str:
-        return hashlib.md5(self.relative_path.encode()).hexdigest()
+    def _compute_id(self) -> int:
+        return int.from_bytes(hashlib.md5(self.relative_path.encode()).digest(), "big")
 
     def update_relative_path(self, new_relative_path: str) -> None:
         self.relative_path = new_relative_path
         self.id = self._compute_id()
+        self.change_id = ChangeCounter.next()
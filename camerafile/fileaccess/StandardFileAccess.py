@@ -3,6 +3,7 @@ import mmap
 import os
 import shutil
 import traceback
+from contextlib import nullcontext
 from datetime import datetime
 from pathlib import Path
 
@@ -15,8 +16,10 @@ from camerafile.fileaccess.FileDescription import FileDescription
 from camerafile.fileaccess.StandardFileDescription import StandardFileDescription
 from camerafile.mdtools.AVIMdReader import AVIMdReader
 from camerafile.mdtools.ExifToolReader import ExifTool, ExifToolNotFound
+from camerafile.mdtools.HEIFMdReader import HEIFMdReader
 from camerafile.mdtools.JPEGMdReader import JPEGMdReader
 from camerafile.mdtools.MdException import MdException
+from camerafile.mdtools.QuickTimeMdReader import QuickTimeMdReader
 from camerafile.tools.CFMImage import CFMImage
 from camerafile.tools.Hash import Hash
 
@@ -24,6 +27,8 @@ LOGGER = logging.getLogger(__name__)
 
 
 class StandardFileAccess(FileAccess):
+    # QuickTime files, whose metadata can be read together by read_md_list
+    EXIF_TOOL_LIST_TYPES = (".mp4", ".mov")
 
     def __init__(self, root_path, file_description: StandardFileDescription):
         super().__init__(root_path, file_description)
@@ -72,13 +77,27 @@ class StandardFileAccess(FileAccess):
             LOGGER.info(f"{self.get_path()} : {e}")
             return call_info + " -> Failed", {}
 
-    def read_md(self, args):
+    def read_md(self, args, file=None):
+        # file: the file already opened by the caller (see LoadMediaFile), read by the native readers
+        source = self.get_path() if file is None else file
         if Configuration.get().exif_tool:
             return self.call_exif_tool("ExifTool", args)
         else:
-            if self.is_image():
+            if self.is_heif_image():
                 try:
-                    return "JPEGMdReader", JPEGMdReader(self.get_path()).get_metadata(*args)
+                    reader = HEIFMdReader(source)
+                    result = reader.get_metadata(*args)
+                    self.bytes_read = reader.bytes_read
+                    return "HEIFMdReader", result
+                except Exception:
+                    LOGGER.debug(traceback.format_exc())
+                    return self.call_exif_tool("HEIFMdReader -> ExifTool", args)
+            elif self.is_image():
+                try:
+                    reader = JPEGMdReader(source)
+                    result = reader.get_metadata(*args)
+                    self.bytes_read = reader.bytes_read
+                    return "JPEGMdReader", result
                 except Exception:
                     LOGGER.debug(traceback.format_exc())
                     LOGGER.debug("Failed with JPEGMdReader, try with ExifTool")
@@ -89,17 +108,67 @@ class StandardFileAccess(FileAccess):
                 except Exception:
                     LOGGER.debug(traceback.format_exc())
                     return self.call_exif_tool("AVIMdReader -> ExifTool", args)
+            elif self.is_qt_video():
+                try:
+                    reader = QuickTimeMdReader(source)
+                    self.bytes_read = reader.bytes_read
+                    return "QuickTimeMdReader", reader.get_metadata(*args)
+                except Exception:
+                    LOGGER.debug(traceback.format_exc())
+                    return self.call_exif_tool("QuickTimeMdReader -> ExifTool", args)
             else:
                 return self.call_exif_tool("ExifTool", args)
 
+    def is_exif_tool_list_file(self):
+        return self.get_extension() in self.EXIF_TOOL_LIST_TYPES
+
+    @staticmethod
+    def read_md_list(file_access_list, args):
+        """
+        Reads the metadata of several files (see EXIF_TOOL_LIST_TYPES), like read_md, first with QuickTimeMdReader.
+        The files it fails to read are read with ExifTool commands on multiple files, rather than with one command
+        per file. Returns the (call_info, metadata) of each file, like read_md.
+        """
+        md_list = [None] * len(file_access_list)
+        call_info = "ExifTool"
+        if not Configuration.get().exif_tool:
+            call_info = "QuickTimeMdReader -> ExifTool"
+            for index, file_access in enumerate(file_access_list):
+                try:
+                    reader = QuickTimeMdReader(file_access.get_path())
+                    file_access.bytes_read = reader.bytes_read
+                    md_list[index] = "QuickTimeMdReader", reader.get_metadata(*args)
+                except Exception:
+                    LOGGER.debug(traceback.format_exc())
+        exif_tool_indexes = [index for index, md in enumerate(md_list) if md is None]
+        if not exif_tool_indexes:
+            return md_list
+        try:
+            results = ExifTool.get_metadata_list([file_access_list[index].get_path() for index in exif_tool_indexes],
+                                                 *args)
+        except ExifToolNotFound as e:
+            raise e
+        except MdException as e:
+            results = [e] * len(exif_tool_indexes)
+        for index, result in zip(exif_tool_indexes, results):
+            if isinstance(result, MdException):
+                LOGGER.info(f"{file_access_list[index].get_path()} : {result}")
+                md_list[index] = (call_info + " -> Failed", {})
+            else:
+                md_list[index] = (call_info, result)
+        return md_list
+
     def hash(self):
         if self.is_image():
             with open(self.get_path(), 'rb') as f:
                 with mmap.mmap(f.fileno(), length=0, access=mmap.ACCESS_READ) as mmap_obj:
-                    with CFMImage(mmap_obj, self.file_desc.name) as image:
+                    with CFMImage(mmap_obj, self.file_desc.name, Hash.get_draft_size()) as image:
                         return Hash.image_hash(image)
         else:
-            return self.get_file_size()
+            return Hash.file_hash(self)
+
+    def local_path(self):
+        return nullcontext(self.get_path())
 
     def get_image(self):
         if self.is_image():
@@ -2,6 +2,7 @@ from camerafile.fileaccess.FileDescription import FileDescription
 
 
 class StandardFileDescription(FileDescription):
+    __slots__ = ()
 
     def __init__(self, relative_path, file_size=None, system_id=None):
         super().__init__(relative_path)
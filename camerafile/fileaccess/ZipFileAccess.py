@@ -1,5 +1,9 @@
 import logging
 import os
+import shutil
+import tempfile
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 from typing import Tuple, Union
@@ -13,8 +17,10 @@ from camerafile.fileaccess.FileDescription import FileDescription
 from camerafile.fileaccess.StandardFileDescription import StandardFileDescription
 from camerafile.fileaccess.ZipFileDescription import ZipFileDescription
 from camerafile.mdtools.ExifToolReader import ExifTool, ExifToolNotFound
+from camerafile.mdtools.HEIFMdReader import HEIFMdReader
 from camerafile.mdtools.JPEGMdReader import JPEGMdReader
 from camerafile.mdtools.MdException import MdException
+from camerafile.mdtools.QuickTimeMdReader import QuickTimeMdReader
 from camerafile.tools.CFMImage import CFMImage
 from camerafile.tools.Hash import Hash
 
@@ -22,6 +28,10 @@ LOGGER = logging.getLogger(__name__)
 
 
 class ZipFileAccess(FileAccess):
+    # Number of archives kept open by each worker (see get_zip_file)
+    ARCHIVE_CACHE_SIZE = 8
+    # Archives opened by the current thread: zip path -> (modification time, ZipFile), least recently used first
+    opened_archives = threading.local()
 
     def __init__(self, root_path, zip_file_description: ZipFileDescription):
         super().__init__(root_path, None)
@@ -30,15 +40,50 @@ class ZipFileAccess(FileAccess):
     def get_zip_path(self):
         return self.root_path + os.sep + self.file_desc.relative_zip_path
 
+    def get_zip_file(self) -> zipfile.ZipFile:
+        """
+        Returns the zip archive of the file. The central directory of an archive with many files is long to read:
+        archives are opened once by each worker (process or thread) for all the ZipFileAccess, and the last
+        ARCHIVE_CACHE_SIZE archives used are kept open, as long as they are not modified.
+        """
+        zip_path = self.get_zip_path()
+        modification_time = os.stat(zip_path).st_mtime_ns
+        archives = ZipFileAccess.get_opened_archives()
+        archive = archives.pop(zip_path, None)
+        if archive is not None and archive[0] != modification_time:
+            archive[1].close()
+            archive = None
+        if archive is None:
+            while len(archives) != 0 and len(archives) >= ZipFileAccess.ARCHIVE_CACHE_SIZE:
+                archives.pop(next(iter(archives)))[1].close()
+            archive = modification_time, zipfile.ZipFile(zip_path)
+        archives[zip_path] = archive
+        return archive[1]
+
+    @staticmethod
+    def get_opened_archives() -> dict:
+        archives = getattr(ZipFileAccess.opened_archives, "archives", None)
+        if archives is None:
+            archives = ZipFileAccess.opened_archives.archives = {}
+        return archives
+
+    @staticmethod
+    def close_archives():
+        """
+        Closes the archives opened by the current thread (their members already opened can still be read).
+        """
+        archives = ZipFileAccess.get_opened_archives()
+        for _, zip_file in archives.values():
+            zip_file.close()
+        archives.clear()
+
     def get_file_size(self):
         if self.file_desc.file_size is None:
-            with zipfile.ZipFile(self.get_zip_path()) as zip_file:
-                self.file_desc.file_size = zip_file.getinfo(self.file_desc.file_path).file_size
+            self.file_desc.file_size = self.get_zip_file().getinfo(self.file_desc.file_path).file_size
         return self.file_desc.file_size
 
     def open(self):
-        with zipfile.ZipFile(self.get_zip_path()) as zip_file:
-            return zip_file.open(self.file_desc.file_path)
+        return self.get_zip_file().open(self.file_desc.file_path)
 
     def delete_file(self, trash_file_path) -> Tuple[bool, str, FileAccess, Union[FileAccess, None]]:
         LOGGER.info("Delete not managed inside zip: " + self.get_path())
@@ -48,11 +93,10 @@ class ZipFileAccess(FileAccess):
             Tuple[bool, str, FileDescription, Union[FileDescription, None]]:
         new_file_path = new_root_path / new_relative_file_path
         os.makedirs(Path(new_file_path).parent, exist_ok=True)
-        with zipfile.ZipFile(self.get_zip_path()) as origin:
-            with open(new_file_path, 'wb') as destination:
-                destination.write(origin.read(self.file_desc.file_path))
-            date_time = self.get_last_modification_date().timestamp()
-            os.utime(new_file_path, (date_time, date_time))
+        with open(new_file_path, 'wb') as destination:
+            destination.write(self.get_zip_file().read(self.file_desc.file_path))
+        date_time = self.get_last_modification_date().timestamp()
+        os.utime(new_file_path, (date_time, date_time))
 
         status = "Extracted"
         return True, status, self.file_desc, StandardFileDescription(new_relative_file_path,
@@ -60,10 +104,9 @@ class ZipFileAccess(FileAccess):
 
     def get_last_modification_date(self):
         try:
-            with zipfile.ZipFile(self.get_zip_path()) as zip_file:
-                result = self.even_round(datetime(*zip_file.getinfo(self.file_desc.file_path).date_time))
-                tz_name = os.environ.get("ZIP_TZ", "Europe/Paris")
-                result = result.replace(tzinfo=ZoneInfo(tz_name))
+            result = self.even_round(datetime(*self.get_zip_file().getinfo(self.file_desc.file_path).date_time))
+            tz_name = os.environ.get("ZIP_TZ", "Europe/Paris")
+            result = result.replace(tzinfo=ZoneInfo(tz_name))
         except KeyError as e:
             LOGGER.info(str(e) + "[" + self.get_path() + "]")
             return None
@@ -71,39 +114,70 @@ class ZipFileAccess(FileAccess):
 
     def call_exif_tool(self, call_info, args):
         try:
-            with zipfile.ZipFile(self.get_zip_path()) as zip_file:
-                return call_info, ExifTool.get_metadata(zip_file.read(self.file_desc.file_path), *args)
+            return call_info, ExifTool.get_metadata(self.get_zip_file().read(self.file_desc.file_path), *args)
         except ExifToolNotFound as e:
             raise e
         except MdException:
             return call_info + " -> Failed", {}
 
-    def read_md(self, args):
+    def read_with(self, reader_class, args, file=None):
+        """
+        Reads the metadata with a native reader, from file if the member is already opened by the caller
+        (see LoadMediaFile), or from the zip archive.
+        """
+        if file is not None:
+            reader = reader_class(file)
+            result = reader.get_metadata(*args)
+        else:
+            with self.open() as member_file:
+                reader = reader_class(member_file)
+                result = reader.get_metadata(*args)
+        self.bytes_read = reader.bytes_read
+        return result
+
+    def read_md(self, args, file=None):
         if Configuration.get().exif_tool:
             return self.call_exif_tool("ExifTool", args)
         else:
-            if self.is_image():
+            if self.is_heif_image():
+                try:
+                    return "HEIFMdReader", self.read_with(HEIFMdReader, args, file)
+                except BaseException:
+                    return self.call_exif_tool("HEIFMdReader -> ExifTool", args)
+            elif self.is_image():
                 try:
-                    with zipfile.ZipFile(self.get_zip_path()) as zip_file:
-                        return "JPEGMdReader", JPEGMdReader(zip_file.open(self.file_desc.file_path)).get_metadata(*args)
+                    return "JPEGMdReader", self.read_with(JPEGMdReader, args, file)
                 except BaseException:
                     return self.call_exif_tool("JPEGMdReader -> ExifTool", args)
+            elif self.is_qt_video():
+                try:
+                    return "QuickTimeMdReader", self.read_with(QuickTimeMdReader, args, file)
+                except BaseException:
+                    return self.call_exif_tool("QuickTimeMdReader -> ExifTool", args)
             else:
                 return self.call_exif_tool("ExifTool", args)
 
     def hash(self):
         if self.is_image():
             with self.open() as image_file:
-                with CFMImage(image_file, self.file_desc.name) as image:
+                with CFMImage(image_file, self.file_desc.name, Hash.get_draft_size()) as image:
                     return Hash.image_hash(image)
         else:
-            return self.get_file_size()
+            return Hash.file_hash(self)
+
+    @contextmanager
+    def local_path(self):
+        # The file is extracted to a temporary directory, deleted on exit
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, self.file_desc.name)
+            with self.open() as file, open(path, "wb") as local_file:
+                shutil.copyfileobj(file, local_file)
+            yield path
 
     def get_image(self):
         if self.is_image():
-            with zipfile.ZipFile(self.get_zip_path()) as zip_file:
-                with zip_file.open(self.file_desc.file_path) as zip_file_element:
-                    return CFMImage(zip_file_element, self.file_desc.name)
+            with self.open() as zip_file_element:
+                return CFMImage(zip_file_element, self.file_desc.name)
 
     def move_to(self, new_path: str) -> bool:
         """
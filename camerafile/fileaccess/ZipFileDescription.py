@@ -1,12 +1,16 @@
+import sys
 from pathlib import Path
 
 from camerafile.fileaccess.FileDescription import FileDescription
 
 
 class ZipFileDescription(FileDescription):
+    __slots__ = ("relative_zip_path", "file_path")
 
     def __init__(self, relative_zip_path, file_path, file_size=None):
         super().__init__(Path(relative_zip_path) / file_path)
-        self.relative_zip_path = relative_zip_path
+        # All the files of an archive share the same path string
+        self.relative_zip_path = sys.intern(relative_zip_path) if isinstance(relative_zip_path, str) \
+            else relative_zip_path
         self.file_path = file_path
         self.file_size = file_size
@@ -0,0 +1,90 @@
+import io
+
+
+class BlockReader(io.RawIOBase):
+    """
+    Read-only file object that reads the underlying file by blocks, only when they are needed, and keeps them.
+    Metadata readers (exifread) only need the headers of the files (for example the APP1 segment of a JPEG file), so
+    only the first block is read most of the time, instead of the whole file (mmap, readahead of network filesystems,
+    decompression of a zip member).
+    bytes_read is the number of bytes actually read from the underlying file.
+    """
+    BLOCK_SIZE = 16 * 1024
+
+    def __init__(self, file, block_size=BLOCK_SIZE):
+        super().__init__()
+        self.file = file
+        self.block_size = block_size
+        self.blocks = {}
+        self.position = 0
+        self.size = None
+        self.bytes_read = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self.position
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self.position
+        elif whence == io.SEEK_END:
+            offset += self.get_size()
+        if offset < 0:
+            raise ValueError(f"Negative seek position {offset}")
+        self.position = offset
+        return self.position
+
+    def get_size(self):
+        if self.size is None:
+            self.size = self.file.seek(0, io.SEEK_END)
+        return self.size
+
+    def load_blocks(self, first, last):
+        # Contiguous missing blocks are read together
+        index = first
+        while index <= last:
+            if index in self.blocks:
+                index += 1
+                continue
+            end = index
+            while end + 1 <= last and end + 1 not in self.blocks:
+                end += 1
+            self.file.seek(index * self.block_size)
+            data = self.file.read((end - index + 1) * self.block_size)
+            self.bytes_read += len(data)
+            for block_index in range(index, end + 1):
+                start = (block_index - index) * self.block_size
+                self.blocks[block_index] = data[start:start + self.block_size]
+            if len(data) < (end - index + 1) * self.block_size:
+                self.size = index * self.block_size + len(data)
+                return
+            index = end + 1
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = self.get_size() - self.position
+        first, start = divmod(self.position, self.block_size)
+        if start + size <= self.block_size and first in self.blocks:
+            # Most reads of exifread are a few bytes in a block already read
+            result = self.blocks[first][start:start + size]
+        else:
+            if self.size is not None:
+                size = min(size, self.size - self.position)
+            if size <= 0:
+                return b""
+            last = (self.position + size - 1) // self.block_size
+            self.load_blocks(first, last)
+            data = b"".join(self.blocks.get(index, b"") for index in range(first, last + 1))
+            result = data[start:start + size]
+        self.position += len(result)
+        return result
+
+    def readinto(self, buffer):
+        data = self.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
@@ -0,0 +1,70 @@
+import struct
+
+
+class BoxReader:
+    """
+    Reads the boxes of ISO base media files (QuickTime and MP4 videos, HEIF images).
+    Top level boxes are found by reading only their headers, seeking from one to the next, so that the media data
+    (mdat) are never read.
+    bytes_read is the number of bytes actually read from the file.
+    """
+    TOP_LEVEL_BOXES = (b"ftyp", b"moov", b"mdat", b"meta", b"free", b"skip", b"wide", b"pnot", b"uuid", b"pdin",
+                       b"moof", b"mfra", b"styp", b"sidx")
+
+    def __init__(self, file):
+        self.file = file
+        self.bytes_read = 0
+
+    def read(self, size):
+        data = self.file.read(size)
+        self.bytes_read += len(data)
+        return data
+
+    def read_at(self, offset, size):
+        self.file.seek(offset)
+        return self.read(size)
+
+    def read_top_level_box(self, expected_type, max_size):
+        """
+        Returns the content of the first top level box of type expected_type, and its offset in the file.
+        """
+        offset = 0
+        while True:
+            header = self.read_at(offset, 8)
+            if len(header) < 8:
+                raise ValueError(f"No {expected_type} box found")
+            size, box_type = struct.unpack(">I4s", header)
+            header_size = 8
+            if size == 1:
+                size = struct.unpack(">Q", self.read(8))[0]
+                header_size = 16
+            if box_type not in self.TOP_LEVEL_BOXES:
+                raise ValueError(f"Unexpected box {box_type} at offset {offset}")
+            if box_type == expected_type:
+                if size == 0:
+                    return self.read(max_size), offset + header_size
+                if size - header_size > max_size:
+                    raise ValueError(f"{expected_type} box too large: {size} bytes")
+                return self.read(size - header_size), offset + header_size
+            if size < header_size:
+                raise ValueError(f"Invalid size of box {box_type} at offset {offset}")
+            offset += size
+
+    @staticmethod
+    def boxes(data, start=0, end=None):
+        """
+        Yields the (type, start, end) of the content of each box of data[start:end].
+        """
+        end = len(data) if end is None else end
+        while start + 8 <= end:
+            size, box_type = struct.unpack_from(">I4s", data, start)
+            header_size = 8
+            if size == 1:
+                size = struct.unpack_from(">Q", data, start + 8)[0]
+                header_size = 16
+            elif size == 0:
+                size = end - start
+            if size < header_size or start + size > end:
+                raise ValueError(f"Invalid size of box {box_type}")
+            yield box_type, start + header_size, start + size
+            start += size
@@ -5,6 +5,8 @@ import locale
 import logging
 import os
 import subprocess
+import tempfile
+import threading
 from datetime import datetime
 
 from PIL import Image
@@ -20,9 +22,67 @@ class ExifToolNotFound(Exception):
     pass
 
 
+class ExifToolProcess:
+    """
+    ExifTool process started with -stay_open: it reads the arguments of each command on its stdin, until
+    -execute, and writes the result of the command on its stdout, followed by SENTINEL.
+    """
+    SENTINEL = "{ready}\n"
+
+    def __init__(self, executable):
+        self.executable = executable
+        self.process = None
+
+    def start(self):
+        try:
+            self.process = subprocess.Popen(
+                [self.executable, "-stay_open", "True", "-@", "-"],
+                universal_newlines=True, bufsize=1,
+                stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            os.set_blocking(self.process.stderr.fileno(), False)
+        except Exception as e:
+            LOGGER.info("Exception during ExifTool start: " + str(e))
+            raise ExifToolNotFound(self.executable)
+        LOGGER.debug("%s started", self.executable)
+
+    def stop(self):
+        if self.process is not None:
+            self.process.stdin.write("-stay_open\nFalse\n")
+            self.process.stdin.flush()
+            self.process.wait()
+            self.process = None
+            LOGGER.debug("%s stopped", self.executable)
+
+    def __read_stdout(self):
+        output = ""
+        new_line = self.process.stdout.readline()
+        while new_line != self.SENTINEL:
+            if new_line == "":
+                raise MdException("ExifTool process ended unexpectedly")
+            output += new_line
+            new_line = self.process.stdout.readline()
+        return output
+
+    def __read_stderr(self):
+        err = ""
+        new_line = self.process.stderr.readline()
+        while new_line:
+            err += new_line
+            new_line = self.process.stderr.readline()
+        return err
+
+    def execute(self, args):
+        if self.process is None:
+            self.start()
+        self.process.stdin.write(str.join("\n", args + ("-execute\n",)))
+        self.process.stdin.flush()
+        return self.__read_stdout(), self.__read_stderr()
+
+
 class ExifTool(object):
     CHARSET_OPTION = ("-charset", "filename=" + locale.getpreferredencoding())
     IMAGE_UPDATE = "image files updated"
+    SOURCE_FILE = "SourceFile"
     SOURCE_METADATA = "Source"
     MODEL_METADATA = "Model"
     WIDTH_METADATA = "ImageWidth"
@@ -45,81 +105,87 @@ class ExifTool(object):
                                SUB_SEC_MODIFY_DATE,
                                DATE_TIME_ORIGINAL,
                                CREATE_DATE_METADATA)
-    SENTINEL = "{ready}\n"
+    METADATA_OPTIONS = ("-fast2", "-b", "-j", "-n")
 
+    # Maximum number of files sent to ExifTool in a single command
+    BATCH_SIZE = 32
+
+    # Pool of the ExifTool processes of the current process: they are started when needed, and reused by
+    # the next commands until stop() is called. There are as many processes as concurrent commands.
     executable = None
-    process = None
+    idle_processes = []
+    pool_lock = threading.Lock()
 
     @classmethod
     def init(cls, stdout_file_path=None, stderr_file_path=None):
         pass
 
     @classmethod
-    def start(cls):
-        if cls.process is None:
+    def acquire(cls) -> ExifToolProcess:
+        with cls.pool_lock:
+            if cls.idle_processes:
+                return cls.idle_processes.pop()
             cls.executable = Resource.exiftool_executable
-            try:
-                cls.process = subprocess.Popen(
-                    [cls.executable, "-stay_open", "True", "-@", "-"],
-                    universal_newlines=True, bufsize=1,
-                    stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-                os.set_blocking(cls.process.stderr.fileno(), False)
-            except Exception as e:
-                LOGGER.info("Exception during ExifTool start: " + str(e))
-                raise ExifToolNotFound(cls.executable)
-            LOGGER.debug("%s started", cls.executable)
+        return ExifToolProcess(cls.executable)
+
+    @classmethod
+    def release(cls, exif_tool_process: ExifToolProcess):
+        with cls.pool_lock:
+            cls.idle_processes.append(exif_tool_process)
+
+    @classmethod
+    def start(cls):
+        exif_tool_process = cls.acquire()
+        if exif_tool_process.process is None:
+            exif_tool_process.start()
+        cls.release(exif_tool_process)
 
     @classmethod
     def stop(cls):
-        if cls.process is not None:
-            cls.process.stdin.write("-stay_open\nFalse\n")
-            cls.process.stdin.flush()
-            cls.process.wait()
-            cls.process = None
-            LOGGER.debug("%s stopped", cls.executable)
+        with cls.pool_lock:
+            processes, cls.idle_processes = cls.idle_processes, []
+        for exif_tool_process in processes:
+            exif_tool_process.stop()
 
     @classmethod
     def execute_once(cls, *args):
-        result = cls.execute(args)
+        result = cls.execute(*args)
         cls.stop()
         return result
 
     @classmethod
-    def __read_stdout(cls):
-        output = ""
-        new_line = cls.process.stdout.readline()
-        while new_line != cls.SENTINEL:
-            output += new_line
-            new_line = cls.process.stdout.readline()
-        return output
-
-    @classmethod
-    def __read_stderr(cls):
-        err = ""
-        new_line = cls.process.stderr.readline()
-        while new_line != "":
-            err += new_line
-            new_line = cls.process.stderr.readline()
-        return err
+    def execute_in_pool(cls, *args):
+        """
+        Executes a command with an idle ExifTool process of the pool, and returns its (stdout, stderr).
+        """
+        exif_tool_process = cls.acquire()
+        try:
+            out, err = exif_tool_process.execute(cls.CHARSET_OPTION + args)
+        except BaseException:
+            # The process may still be executing the command: it is not reused
+            if exif_tool_process.process is not None:
+                exif_tool_process.process.kill()
+            raise
+        cls.release(exif_tool_process)
+        return out, err
 
     @classmethod
     def execute(cls, *args):
-        if cls.process is None:
-            cls.start()
-        args = cls.CHARSET_OPTION + args + ("-execute\n",)
-        cls.process.stdin.write(str.join("\n", args))
-        cls.process.stdin.flush()
-        out = cls.__read_stdout()
-        err = cls.__read_stderr()
+        out, err = cls.execute_in_pool(*args)
         if err != "":
             raise MdException(err.strip())
         return out, err
 
     @classmethod
-    def execute_with_bytes(cls, input_bytes, *args):
-        result = subprocess.run([Resource.exiftool_executable, *args], input=input_bytes,
-                                capture_output=True)
-        return result.stdout
+    def read_temporary_file(cls, file_bytes):
+        """
+        Writes in-memory content (a file inside a zip for example) to a temporary file, that can be read
+        by the ExifTool processes of the pool rather than by a new ExifTool process reading the standard input.
+        """
+        temporary_file = tempfile.NamedTemporaryFile(prefix="cfm-exiftool-", delete=False)
+        with temporary_file:
+            temporary_file.write(file_bytes)
+        return temporary_file.name
 
     @classmethod
     def parse_date(cls, exif_tool_result, field, date_format):
@@ -242,20 +308,57 @@ class ExifTool(object):
 
     @classmethod
     def get_metadata(cls, file, *args):
+        """
+        Returns the metadata of a file, given by its path or by its content (bytes).
+        """
+        if isinstance(file, str):
+            return cls.get_metadata_list([file], *args)[0]
+        temporary_path = cls.read_temporary_file(file)
         try:
-            real_args = cls.expand_args(*args)
-            if isinstance(file, str):
-                stdout, stderr = cls.execute("-fast2", "-b", "-j", "-n", *real_args, file)
-            else:
-                stdout = cls.execute_with_bytes(file, "-fast2", "-b", "-j", "-n", *real_args, "-")
+            return cls.get_metadata_list([temporary_path], *args)[0]
+        finally:
+            os.remove(temporary_path)
 
-            result = json.loads(stdout)
-            if len(result) == 0:
-                return {}
-            return {metadata_name: cls.load_from_result(result, metadata_name) for metadata_name in args}
+    @classmethod
+    def get_metadata_list(cls, files, *args):
+        """
+        Returns the metadata of each file of the list, reading BATCH_SIZE files with each ExifTool command.
+        For each file, the result is a dict of metadata, or a MdException if the file could not be read.
+        The MdException is raised if there is only one file.
+        """
+        try:
+            real_args = cls.expand_args(*args)
+            results = []
+            for start in range(0, len(files), cls.BATCH_SIZE):
+                batch_files = files[start:start + cls.BATCH_SIZE]
+                stdout, stderr = cls.execute_in_pool(*cls.METADATA_OPTIONS, *real_args, *batch_files)
+                results += cls.split_result(stdout, stderr, batch_files, args)
         except Exception as e:
             # traceback.print_exc()
             raise MdException(e)
+        if len(files) == 1 and isinstance(results[0], MdException):
+            raise results[0]
+        return results
+
+    @classmethod
+    def split_result(cls, stdout, stderr, files, args):
+        """
+        Demultiplexes the JSON result of a command on several files: ExifTool gives one element, with its
+        SourceFile, for each file it could read.
+        """
+        result_by_file = {}
+        for file_result in json.loads(stdout) if stdout.strip() else []:
+            result_by_file[os.path.normcase(os.path.normpath(file_result.get(cls.SOURCE_FILE, "")))] = file_result
+        results = []
+        for file in files:
+            file_result = result_by_file.get(os.path.normcase(os.path.normpath(file)))
+            if file_result is None:
+                file_errors = [line for line in stderr.splitlines() if file in line]
+                results.append(MdException(" ".join(file_errors or stderr.splitlines()).strip()))
+            else:
+                results.append({metadata_name: cls.load_from_result([file_result], metadata_name)
+                                for metadata_name in args})
+        return results
 
     @classmethod
     def update_model(cls, filename, new_model):
@@ -0,0 +1,150 @@
+import io
+import struct
+
+import exifread
+
+from camerafile.mdtools.BoxReader import BoxReader
+from camerafile.mdtools.JPEGMdReader import JPEGMdReader
+from camerafile.mdtools.MdConstants import MetadataNames
+
+
+class HEIFMdReader(JPEGMdReader):
+    """
+    Reads the metadata of HEIF images (.heic, .heif) without ExifTool.
+    Only the meta box is read (see BoxReader): the Exif item is found in iinf, and its data are located by iloc
+    and read, then parsed like the EXIF data of a JPEG file. The width and height are the ones of the primary item
+    (ispe property), as given by ExifTool.
+    """
+    MAX_META_SIZE = 16 * 1024 * 1024
+
+    def __init__(self, file):
+        super().__init__(file)
+        self.width = None
+        self.height = None
+
+    def process_file(self, file, details):
+        box_reader = BoxReader(file)
+        meta, meta_offset = box_reader.read_top_level_box(b"meta", self.MAX_META_SIZE)
+        # meta is a full box: version and flags before its content
+        items = {}
+        primary_item_id = None
+        exif_item_id = None
+        idat_start = None
+        properties, associations = [], {}
+        for box_type, start, end in BoxReader.boxes(meta, 4):
+            if box_type == b"pitm":
+                primary_item_id = struct.unpack_from(">H" if meta[start] == 0 else ">I", meta, start + 4)[0]
+            elif box_type == b"iinf":
+                exif_item_id = self.find_exif_item(meta, start, end)
+            elif box_type == b"iloc":
+                items = self.parse_iloc(meta, start)
+            elif box_type == b"idat":
+                idat_start = start
+            elif box_type == b"iprp":
+                properties, associations = self.parse_iprp(meta, start, end)
+
+        for property_index in associations.get(primary_item_id, []):
+            if 0 < property_index <= len(properties) and properties[property_index - 1][0] == b"ispe":
+                self.width, self.height = struct.unpack_from(">II", meta, properties[property_index - 1][1] + 4)
+
+        if exif_item_id not in items:
+            raise ValueError("No Exif item found")
+        construction_method, extents = items[exif_item_id]
+        if construction_method == 0:
+            exif = b"".join(box_reader.read_at(offset, length) for offset, length in extents)
+        elif construction_method == 1 and idat_start is not None:
+            exif = b"".join(meta[idat_start + offset:idat_start + offset + length] for offset, length in extents)
+        else:
+            raise ValueError(f"Exif item with unsupported construction method {construction_method}")
+        self.bytes_read = box_reader.bytes_read
+
+        # Exif item: offset of the TIFF header (after "Exif\0\0", most of the time), then the TIFF data
+        tiff_header_offset = struct.unpack_from(">I", exif)[0]
+        tiff = io.BytesIO(exif[4 + tiff_header_offset:])
+        self.metadata = exifread.process_file(tiff, stop_tag=self.STOP_TAG, details=details)
+
+    @staticmethod
+    def find_exif_item(meta, start, end):
+        entry_count_size = 2 if meta[start] == 0 else 4
+        for box_type, infe_start, _ in BoxReader.boxes(meta, start + 4 + entry_count_size, end):
+            # Item types are only given by versions 2 and 3 of infe
+            version = meta[infe_start]
+            if box_type == b"infe" and version >= 2:
+                item_id_format, item_id_size = (">H", 2) if version == 2 else (">I", 4)
+                item_id = struct.unpack_from(item_id_format, meta, infe_start + 4)[0]
+                item_type = meta[infe_start + 4 + item_id_size + 2:infe_start + 4 + item_id_size + 6]
+                if item_type == b"Exif":
+                    return item_id
+        return None
+
+    @staticmethod
+    def read_int(data, position, size):
+        return int.from_bytes(data[position:position + size], "big"), position + size
+
+    @staticmethod
+    def parse_iloc(meta, start):
+        """
+        Returns the construction method and the (offset, length) extents of each item.
+        """
+        version = meta[start]
+        offset_size, length_size = meta[start + 4] >> 4, meta[start + 4] & 0x0F
+        base_offset_size, index_size = meta[start + 5] >> 4, meta[start + 5] & 0x0F
+        if version == 0:
+            index_size = 0
+        read_int = HEIFMdReader.read_int
+        item_count, position = read_int(meta, start + 6, 2 if version < 2 else 4)
+        items = {}
+        for _ in range(item_count):
+            item_id, position = read_int(meta, position, 2 if version < 2 else 4)
+            construction_method = 0
+            if version in (1, 2):
+                construction_method, position = read_int(meta, position, 2)
+                construction_method &= 0x0F
+            # data reference index
+            position += 2
+            base_offset, position = read_int(meta, position, base_offset_size)
+            extent_count, position = read_int(meta, position, 2)
+            extents = []
+            for _ in range(extent_count):
+                position += index_size
+                extent_offset, position = read_int(meta, position, offset_size)
+                extent_length, position = read_int(meta, position, length_size)
+                extents.append((base_offset + extent_offset, extent_length))
+            items[item_id] = (construction_method, extents)
+        return items
+
+    @staticmethod
+    def parse_iprp(meta, start, end):
+        """
+        Returns the (type, start) of the properties of ipco, and the indexes (from 1) of the properties of each item.
+        """
+        properties, associations = [], {}
+        for box_type, box_start, box_end in BoxReader.boxes(meta, start, end):
+            if box_type == b"ipco":
+                properties = [(property_type, property_start)
+                              for property_type, property_start, _ in BoxReader.boxes(meta, box_start, box_end)]
+            elif box_type == b"ipma":
+                version, flags = meta[box_start], meta[box_start + 3]
+                read_int = HEIFMdReader.read_int
+                entry_count, position = read_int(meta, box_start + 4, 4)
+                for _ in range(entry_count):
+                    item_id, position = read_int(meta, position, 2 if version < 1 else 4)
+                    association_count, position = read_int(meta, position, 1)
+                    indexes = []
+                    for _ in range(association_count):
+                        # The high bit of each association is the essential flag
+                        if flags & 1:
+                            index, position = read_int(meta, position, 2)
+                            indexes.append(index & 0x7FFF)
+                        else:
+                            index, position = read_int(meta, position, 1)
+                            indexes.append(index & 0x7F)
+                    associations[item_id] = indexes
+        return properties, associations
+
+    def load_from_result(self, metadata_name):
+        if metadata_name == MetadataNames.WIDTH and self.width is not None:
+            return self.width
+        if metadata_name == MetadataNames.HEIGHT and self.height is not None:
+            return self.height
+        return super().load_from_result(metadata_name)
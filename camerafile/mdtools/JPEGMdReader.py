@@ -1,10 +1,10 @@
 import logging
-import mmap
 from datetime import datetime
 
 import exifread
 from PIL.ExifTags import TAGS
 
+from camerafile.mdtools.BlockReader import BlockReader
 from camerafile.mdtools.MdConstants import MetadataNames
 
 LOGGER = logging.getLogger(__name__)
@@ -35,6 +35,9 @@ class JPEGMdReader(object):
 
     THUMBNAIL = "JPEGThumbnail"
 
+    # Tags of the EXIF IFD are sorted: the ones after the last tag used above are not processed
+    STOP_TAG = "SubSecTimeDigitized"
+
     def __init__(self, file):
         self.file = None
         self.filename = None
@@ -43,18 +46,24 @@ class JPEGMdReader(object):
         else:
             self.file = file
         self.metadata = {}
+        self.bytes_read = None
 
     def open(self, details=False):
         if self.file is None:
             with open(self.filename, 'rb') as f:
-                with mmap.mmap(f.fileno(), length=0, access=mmap.ACCESS_READ) as mmap_obj:
-                    self.metadata = exifread.process_file(mmap_obj, details=details)
+                self.process_file(f, details)
         else:
-            self.metadata = exifread.process_file(self.file, details=details)
+            self.process_file(self.file, details)
 
         if self.metadata == {}:
             raise Exception(f"JPEGMdReader cannot parse {self.filename}")
 
+    def process_file(self, file, details):
+        # Only the blocks of the file needed by exifread are read (the first one, most of the time)
+        block_reader = BlockReader(file)
+        self.metadata = exifread.process_file(block_reader, stop_tag=self.STOP_TAG, details=details)
+        self.bytes_read = block_reader.bytes_read
+
     def get_first_of(self, field_list, default=None):
         for field in field_list:
             if field in self.metadata:
@@ -0,0 +1,168 @@
+import math
+import struct
+from datetime import datetime, timedelta
+
+from camerafile.mdtools.BoxReader import BoxReader
+from camerafile.mdtools.MdConstants import MetadataNames
+
+
+class QuickTimeMdReader:
+    """
+    Reads the metadata of QuickTime and MP4 videos (.mov, .mp4) without ExifTool.
+    Only the moov box is read (see BoxReader), and its content is parsed: mvhd (creation date), tkhd of each track
+    (width, height and rotation matrix), udta and meta (model and make).
+    The values are the ones ExifTool gives for the tags used by ExifTool.get_metadata.
+    """
+    CREATE_DATE = "CreateDate"
+    WIDTH = "ImageWidth"
+    HEIGHT = "ImageHeight"
+    ROTATION = "Rotation"
+    MODEL = "Model"
+    MAKE = "Make"
+
+    # Dates are stored in seconds since 1904/01/01
+    EPOCH = datetime(1904, 1, 1)
+    MAX_MOOV_SIZE = 64 * 1024 * 1024
+
+    # Tags of udta boxes and ilst items, and keys of the meta boxes of Apple devices
+    TAG_NAMES = {b"\xa9mod": MODEL,
+                 b"\xa9mak": MAKE,
+                 b"com.apple.quicktime.model": MODEL,
+                 b"com.apple.quicktime.make": MAKE}
+
+    def __init__(self, file):
+        self.file = file
+        self.metadata = {}
+        self.tracks = []
+        self.bytes_read = 0
+        self.read_metadata()
+
+    def read_metadata(self):
+        if isinstance(self.file, str):
+            with open(self.file, "rb") as f:
+                moov = self.read_moov(f)
+        else:
+            moov = self.read_moov(self.file)
+        self.parse_moov(moov)
+
+    def read_moov(self, f):
+        box_reader = BoxReader(f)
+        moov, _ = box_reader.read_top_level_box(b"moov", self.MAX_MOOV_SIZE)
+        self.bytes_read = box_reader.bytes_read
+        return moov
+
+    def parse_moov(self, moov):
+        for box_type, start, end in BoxReader.boxes(moov):
+            if box_type == b"mvhd":
+                self.parse_mvhd(moov, start)
+            elif box_type == b"trak":
+                self.parse_trak(moov, start, end)
+            elif box_type == b"udta":
+                self.parse_udta(moov, start, end)
+            elif box_type == b"meta":
+                self.parse_meta(moov, start, end)
+        if self.CREATE_DATE not in self.metadata:
+            raise ValueError("No mvhd box found")
+        self.select_track()
+
+    def parse_mvhd(self, data, start):
+        if data[start] == 1:
+            creation_time = struct.unpack_from(">Q", data, start + 4)[0]
+        else:
+            creation_time = struct.unpack_from(">I", data, start + 4)[0]
+        # ExifTool gives no date (0000:00:00 00:00:00) when it is not set
+        self.metadata[self.CREATE_DATE] = self.EPOCH + timedelta(seconds=creation_time) if creation_time else None
+
+    def parse_trak(self, data, start, end):
+        track = {}
+        for box_type, box_start, box_end in BoxReader.boxes(data, start, end):
+            if box_type == b"tkhd":
+                track.update(self.parse_tkhd(data, box_start))
+            elif box_type == b"mdia":
+                for mdia_type, mdia_start, _ in BoxReader.boxes(data, box_start, box_end):
+                    if mdia_type == b"hdlr":
+                        track["handler"] = data[mdia_start + 8:mdia_start + 12]
+        self.tracks.append(track)
+
+    def parse_tkhd(self, data, start):
+        matrix_start = start + (52 if data[start] == 1 else 40)
+        a, b = struct.unpack_from(">ii", data, matrix_start)
+        width, height = struct.unpack_from(">II", data, matrix_start + 36)
+        return {self.WIDTH: width >> 16,
+                self.HEIGHT: height >> 16,
+                self.ROTATION: round(math.degrees(math.atan2(b, a))) % 360}
+
+    def select_track(self):
+        # The first video track gives the dimensions and the rotation, as for ExifTool
+        tracks = [track for track in self.tracks if track.get(self.WIDTH) and track.get(self.HEIGHT)]
+        video_tracks = [track for track in tracks if track.get("handler") == b"vide"]
+        for track in video_tracks + tracks:
+            for name in (self.WIDTH, self.HEIGHT, self.ROTATION):
+                self.metadata[name] = track[name]
+            break
+
+    def parse_udta(self, data, start, end):
+        for box_type, box_start, box_end in BoxReader.boxes(data, start, end):
+            if box_type == b"meta":
+                self.parse_meta(data, box_start, box_end)
+            elif box_type in self.TAG_NAMES:
+                if data[box_start + 4:box_start + 8] == b"data":
+                    self.parse_ilst_item(data, box_type, box_start, box_end)
+                else:
+                    length = struct.unpack_from(">H", data, box_start)[0]
+                    self.set_tag(box_type, data[box_start + 4:box_start + 4 + length])
+
+    def parse_meta(self, data, start, end):
+        # In MP4 files, meta is a full box (version and flags before its content), but not in QuickTime files
+        if data[start + 4:start + 8] != b"hdlr":
+            start += 4
+        keys = []
+        for box_type, box_start, box_end in BoxReader.boxes(data, start, end):
+            if box_type == b"keys":
+                keys = [data[key_start + 8:key_end] for key_start, key_end in self.key_entries(data, box_start)]
+            elif box_type == b"ilst":
+                for item_type, item_start, item_end in BoxReader.boxes(data, box_start, box_end):
+                    key_index = struct.unpack(">I", item_type)[0]
+                    tag = keys[key_index - 1] if 0 < key_index <= len(keys) else item_type
+                    self.parse_ilst_item(data, tag, item_start, item_end)
+
+    @staticmethod
+    def key_entries(data, start):
+        entry_count = struct.unpack_from(">I", data, start + 4)[0]
+        key_start = start + 8
+        for _ in range(entry_count):
+            key_size = struct.unpack_from(">I", data, key_start)[0]
+            if key_size < 8:
+                raise ValueError("Invalid key size")
+            yield key_start, key_start + key_size
+            key_start += key_size
+
+    def parse_ilst_item(self, data, tag, start, end):
+        if tag not in self.TAG_NAMES:
+            return
+        for box_type, box_start, box_end in BoxReader.boxes(data, start, end):
+            if box_type == b"data":
+                # type indicator and locale, before the value
+                self.set_tag(tag, data[box_start + 8:box_end])
+                return
+
+    def set_tag(self, tag, value: bytes):
+        value = value.decode("utf-8", errors="replace").strip("\u0000").strip(" ")
+        if value:
+            self.metadata.setdefault(self.TAG_NAMES[tag], value)
+
+    def load_from_result(self, metadata_name):
+        if metadata_name == MetadataNames.CREATION_DATE:
+            return self.metadata.get(self.CREATE_DATE)
+        if metadata_name == MetadataNames.WIDTH:
+            return self.metadata.get(self.WIDTH)
+        if metadata_name == MetadataNames.HEIGHT:
+            return self.metadata.get(self.HEIGHT)
+        if metadata_name == MetadataNames.ORIENTATION:
+            return {0: 1, 90: 6, 180: 3, 270: 8}.get(self.metadata.get(self.ROTATION))
+        if metadata_name == MetadataNames.MODEL:
+            return self.metadata.get(self.MODEL)
+        return None
+
+    def get_metadata(self, *args):
+        return {metadata_name: self.load_from_result(metadata_name) for metadata_name in args}
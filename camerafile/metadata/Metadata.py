@@ -1,15 +1,39 @@
 import logging
+from datetime import datetime, timedelta
+
+from camerafile.core.ChangeCounter import ChangeCounter
+from camerafile.core.SlotsState import SlotsState
 from camerafile.mdtools.MdConstants import MetadataNames
 
 LOGGER = logging.getLogger(__name__)
 
+DATE_FORMAT = "%Y/%m/%d %H:%M:%S.%f"
+EPOCH = datetime(1970, 1, 1)
+
 
 class Metadata:
+    __slots__ = ("value", "binary_value", "thumbnail", "call_info", "change_id", "timestamps")
 
     def __init__(self):
         self.value = None
         self.binary_value = None
         self.thumbnail = None
+        self.call_info = None
+        # Id of the last change of value or binary_value (see ChangeCounter)
+        self.change_id = 0
+        # Creation and modification dates of the value, parsed (see get_timestamps)
+        self.timestamps = None
+
+    def __setattr__(self, name, value):
+        if name == "value" or name == "binary_value":
+            object.__setattr__(self, "change_id", ChangeCounter.next())
+            if name == "value":
+                object.__setattr__(self, "timestamps", None)
+        object.__setattr__(self, name, value)
+
+    def __setstate__(self, state):
+        SlotsState.restore(self, state, value=None, binary_value=None, thumbnail=None, call_info=None, change_id=0,
+                           timestamps=None)
 
     def __str__(self):
         return self.get()
@@ -40,6 +64,35 @@ class Metadata:
 
     def get_last_modification_date(self):
         return self.get_md_value(MetadataNames.MODIFICATION_DATE)
+
+    def get_timestamps(self):
+        """
+        Returns the creation and modification dates as microseconds since the epoch (or None).
+        They are parsed once, and parsed again only if the value changes.
+        """
+        timestamps = self.timestamps
+        if timestamps is None:
+            timestamps = (Metadata.parse_timestamp(self.get_date()),
+                          Metadata.parse_timestamp(self.get_last_modification_date()))
+            self.timestamps = timestamps
+        return timestamps
+
+    @staticmethod
+    def parse_timestamp(date):
+        if date is None:
+            return None
+        return Metadata.to_timestamp(datetime.strptime(date, DATE_FORMAT))
+
+    @staticmethod
+    def to_timestamp(date: datetime):
+        delta = date - EPOCH
+        return (delta.days * 86400 + delta.seconds) * 1000000 + delta.microseconds
+
+    @staticmethod
+    def to_datetime(timestamp):
+        if timestamp is None:
+            return None
+        return EPOCH + timedelta(microseconds=timestamp)
     
     def get_orientation(self):
         return self.get_md_value(MetadataNames.ORIENTATION)
@@ -1,39 +1,59 @@
-from typing import Dict
+from typing import Dict, Optional
 
 from camerafile.core.Constants import INTERNAL, SIGNATURE, FACES, ORIGINAL_COPY_PATH, DESTINATION_COPY_PATH, \
     ORIGINAL_MOVE_PATH, DESTINATION_MOVE_PATH, CFM_CAMERA_MODEL, THUMBNAIL, ORIGINAL_PATH
+from camerafile.core.ChangeCounter import ChangeCounter
 from camerafile.core.Logging import Logger
+from camerafile.core.SlotsState import SlotsState
 from camerafile.metadata.Metadata import Metadata
 
 LOGGER = Logger(__name__)
 
 
 class MetadataList:
+    """
+    Metadata objects are only created when they are accessed for the first time: most of them stay empty.
+    """
+    __slots__ = ("metadata_list", "change_id")
+    NAMES = (CFM_CAMERA_MODEL, INTERNAL, THUMBNAIL, ORIGINAL_COPY_PATH, DESTINATION_COPY_PATH, ORIGINAL_PATH,
+             ORIGINAL_MOVE_PATH, DESTINATION_MOVE_PATH, SIGNATURE, FACES)
     metadata_list: Dict[str, Metadata]
 
     def __init__(self):
-        self.metadata_list = {CFM_CAMERA_MODEL: Metadata(),
-                              INTERNAL: Metadata(),
-                              THUMBNAIL: Metadata(),
-                              ORIGINAL_COPY_PATH: Metadata(),
-                              DESTINATION_COPY_PATH: Metadata(),
-                              ORIGINAL_PATH: Metadata(),
-                              ORIGINAL_MOVE_PATH: Metadata(),
-                              DESTINATION_MOVE_PATH: Metadata(),
-                              SIGNATURE: Metadata(),
-                              FACES: Metadata()}
+        self.metadata_list = {}
+        # Id of the last replacement of a Metadata object (see ChangeCounter)
+        self.change_id = 0
+
+    def __setstate__(self, state):
+        SlotsState.restore(self, state, change_id=0)
 
     def __getitem__(self, key) -> Metadata:
-        return self.metadata_list[key]
+        metadata = self.metadata_list.get(key)
+        if metadata is None:
+            if key not in self.NAMES:
+                raise KeyError(key)
+            metadata = self.metadata_list[key] = Metadata()
+        return metadata
 
     def __setitem__(self, key, value):
         self.metadata_list[key] = value
+        self.change_id = ChangeCounter.next()
+
+    def get(self, key) -> Optional[Metadata]:
+        """
+        Returns the metadata if it has already been created, or None (without creating it).
+        """
+        return self.metadata_list.get(key)
+
+    def get_change_id(self) -> int:
+        return max(self.change_id, max((metadata.change_id for metadata in self.metadata_list.values()), default=0))
 
     def set_value(self, name, value):
         self[name].value = value
 
     def get_value(self, name):
-        return self[name].get()
+        metadata = self.metadata_list.get(name)
+        return metadata.get() if metadata is not None else None
 
     def save_to_dict(self):
         result = {}
@@ -50,17 +70,18 @@ class MetadataList:
         return result
 
     def load_binary_from_dict(self, media_file_dict):
-        for md_name, md in self.metadata_list.items():
+        for md_name in self.NAMES:
             if md_name in media_file_dict:
-                md.set_binary_value(media_file_dict[md_name])
+                self[md_name].set_binary_value(media_file_dict[md_name])
 
     def load_from_dict(self, media_file_dict):
-        for md_name, md in self.metadata_list.items():
+        for md_name in self.NAMES:
             if md_name in media_file_dict:
-                md.set_value(media_file_dict[md_name])
+                self[md_name].set_value(media_file_dict[md_name])
 
     def compare_with(self, media_parent, metadata_list_2: "MetadataList"):
-        for metadata_name, metadata in self.metadata_list.items():
+        for metadata_name in self.NAMES:
+            metadata = self[metadata_name]
             if metadata_name not in [DESTINATION_COPY_PATH, ORIGINAL_COPY_PATH, CFM_CAMERA_MODEL]:
                 LOGGER.diff(f"MetadataList[{media_parent}]", metadata_name, metadata.value,
                             metadata_list_2[metadata_name].value)
@@ -1,5 +1,8 @@
 from camerafile.core.MediaDuplicateManager import MediaDuplicateManager
 from camerafile.core.MediaFile import MediaFile
+from camerafile.core.Configuration import Configuration
+from camerafile.processor.BatchJournal import BatchJournal
+from camerafile.processor.BatchScheduler import BatchScheduler
 from camerafile.processor.BatchTool import BatchElement
 from camerafile.core.Constants import SIGNATURE
 from camerafile.core.Logging import Logger
@@ -7,6 +10,7 @@ from camerafile.core.MediaSet import MediaSet
 from camerafile.core.OutputDirectory import OutputDirectory
 from camerafile.processor.CFMBatch import CFMBatch
 from camerafile.task.ComputeSignature import ComputeSignature
+from camerafile.task.TaskCost import TaskCost
 
 LOGGER = Logger(__name__)
 
@@ -16,6 +20,8 @@ class BatchComputeNecessarySignaturesMultiProcess(CFMBatch):
     def __init__(self, media_set: MediaSet, media_set2: MediaSet = None):
         self.media_set = media_set
         self.media_set2 = media_set2
+        # Media files to reindex once all signatures have been computed: {media_set: [media_file, ...]}
+        self.media_to_reindex = {}
         if media_set2 is None:
             CFMBatch.__init__(self, batch_title="Compute necessary signatures in order to detect duplicates",
                               stderr_file=OutputDirectory.get(self.media_set.root_path).batch_stderr,
@@ -28,6 +34,10 @@ class BatchComputeNecessarySignaturesMultiProcess(CFMBatch):
 
     def initialize(self):
         LOGGER.write_title(self.media_set, self.update_title())
+        self.media_to_reindex = {}
+        self.journal = BatchJournal(OutputDirectory.get(self.media_set.root_path).get_journal_path("signatures"),
+                                    (Configuration.get().signature_algorithm,
+                                     Configuration.get().file_signature_algorithm))
 
     def task_getter(self):
         return ComputeSignature.execute
@@ -56,22 +66,28 @@ class BatchComputeNecessarySignaturesMultiProcess(CFMBatch):
                     processed_system_ids.add(system_id)
                 args_list.append(BatchElement(
                     (media.parent_set.root_path, media.file_desc, media.metadata[SIGNATURE]), 
-                    media.get_path()
+                    media.get_path(),
+                    TaskCost.signature(media.file_desc),
+                    BatchScheduler.get_group(media.file_desc)
                 ))
         return args_list
 
     def post_task(self, result, progress_bar, replace=False):
-        media_id, result_signature_metadata = result
+        media_id, signature = result
         for media_set in [self.media_set, self.media_set2]:
-            if media_set is not None:
+            if media_set is not None and signature is not None:
                 original_media = media_set.get_media(media_id)
                 if original_media is not None:
-                    original_media.metadata[SIGNATURE] = result_signature_metadata
-                    # reindex the file, now a signature has been computed
-                    original_media.parent_set.indexer.add_media_file(original_media)
+                    original_media.metadata[SIGNATURE].value = signature
+                    # the file will be reindexed, now a signature has been computed
+                    self.media_to_reindex.setdefault(media_set, []).append(original_media)
         progress_bar.increment()
 
     def finalize(self):
+        # Signatures of all the files are grouped together, rather than one by one after each result
+        for media_set, media_files in self.media_to_reindex.items():
+            media_set.indexer.add_media_files(media_files)
+        self.media_to_reindex = {}
         self.propagate_and_synchronize()
 
     def propagate_and_synchronize(self):
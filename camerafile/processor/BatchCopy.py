@@ -6,7 +6,7 @@ from camerafile.console.ConsoleTable import ConsoleTable
 from camerafile.core.Configuration import Configuration
 from camerafile.core.MediaDuplicateManager import MediaDuplicateManager
 from camerafile.processor.BatchCopyElement import BatchCopyElement
-from camerafile.processor.BatchTool import BatchElement
+from camerafile.processor.BatchTool import BatchElement, Executor
 from camerafile.core.Logging import Logger
 from camerafile.core.MediaFile import MediaFile
 from camerafile.core.MediaSet import MediaSet
@@ -34,6 +34,9 @@ class BatchCopy(CFMBatch):
         CFMBatch.__init__(self, batch_title=self.BATCH_TITLE,
                           stderr_file=OutputDirectory.get(self.old_media_set.root_path).batch_stderr,
                           stdout_file=OutputDirectory.get(self.old_media_set.root_path).batch_stdout)
+        if copy_mode in (CopyMode.HARD_LINK, CopyMode.SOFT_LINK):
+            # Links are created by threads: creating them costs less than sending files to other processes
+            self.executor = Executor.THREAD
 
         self.result_stats = {}
         self.not_copied_files = []
@@ -1,5 +1,6 @@
 from typing import List
 import os
+from camerafile.processor.BatchScheduler import BatchScheduler
 from camerafile.processor.BatchTool import BatchElement
 from camerafile.core.Logging import Logger
 from camerafile.core.MediaFile import MediaFile
@@ -7,6 +8,7 @@ from camerafile.core.MediaSet import MediaSet
 from camerafile.core.OutputDirectory import OutputDirectory
 from camerafile.processor.CFMBatch import CFMBatch
 from camerafile.task.GenerateThumbnail import GenerateThumbnail
+from camerafile.task.TaskCost import TaskCost
 
 LOGGER = Logger(__name__)
 
@@ -32,9 +34,11 @@ class BatchGenerateThumbnails(CFMBatch):
         args_list = []
         media_file: MediaFile
         for media_file in self.media_set:
-            thb_path = self.thb_dir / f"{media_file.file_desc.id}.thb"
+            thb_path = self.thb_dir / f"{media_file.file_desc.get_hex_id()}.thb"
             if not thb_path.exists():
-                args_list.append(BatchElement((self.media_set.root_path, media_file.file_desc, thb_path), media_file.get_path()))
+                args_list.append(BatchElement((self.media_set.root_path, media_file.file_desc, thb_path), media_file.get_path(),
+                                              TaskCost.thumbnail(media_file.file_desc),
+                                              BatchScheduler.get_group(media_file.file_desc)))
         return args_list
 
     def post_task(self, result, progress_bar, replace=False):
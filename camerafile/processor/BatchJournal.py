@@ -0,0 +1,75 @@
+import os
+import pickle
+import time
+from pathlib import Path
+
+from camerafile.core.Logging import Logger
+
+LOGGER = Logger(__name__)
+
+
+class BatchJournal:
+    """
+    Journal of the results of a batch, so that the results of an interrupted execution are not computed again:
+    results are appended to the journal by checkpoints, every CHECKPOINT_RESULTS results or CHECKPOINT_INTERVAL
+    seconds, and replayed by the next execution of the batch (see TaskWithProgression.replay_journal).
+    The journal starts with the key of the batch (what its results depend on: metadata needed, algorithms...), and is
+    not replayed with another key. Journals are deleted once the media set is saved (see MediaSet.save_on_disk).
+    """
+    CHECKPOINT_RESULTS = 1000
+    CHECKPOINT_INTERVAL = 30.0
+    # path -> key of the journals already replayed or written by this process (watch mode executes batches again)
+    __opened = {}
+
+    def __init__(self, path: Path, key):
+        self.path = path
+        self.key = key
+        self.pending = []
+        self.last_checkpoint = time.monotonic()
+
+    def replay(self) -> list:
+        """
+        Returns the results of the journal written by a previous execution.
+        """
+        opened_key = BatchJournal.__opened.get(self.path)
+        BatchJournal.__opened[self.path] = self.key
+        if opened_key == self.key or not self.path.exists():
+            return []
+        if opened_key is not None:
+            os.remove(self.path)
+            return []
+        results = []
+        valid_end = 0
+        with open(self.path, "r+b") as file:
+            try:
+                if pickle.load(file) != self.key:
+                    LOGGER.info(f"{self.path} ignored: written with other parameters")
+                    file.truncate(0)
+                    return []
+                while True:
+                    valid_end = file.tell()
+                    results.extend(pickle.load(file))
+            except EOFError:
+                pass
+            except Exception:
+                # Checkpoint interrupted while it was written: removed, as next checkpoints are appended
+                LOGGER.info(f"{self.path}: last checkpoint incomplete, {len(results)} results replayed")
+                file.truncate(valid_end)
+        return results
+
+    def add(self, result):
+        self.pending.append(result)
+        if len(self.pending) >= self.CHECKPOINT_RESULTS \
+                or time.monotonic() - self.last_checkpoint >= self.CHECKPOINT_INTERVAL:
+            self.checkpoint()
+
+    def checkpoint(self):
+        if len(self.pending) != 0:
+            with open(self.path, "ab") as file:
+                if file.tell() == 0:
+                    pickle.dump(self.key, file)
+                pickle.dump(self.pending, file, protocol=pickle.HIGHEST_PROTOCOL)
+                file.flush()
+                os.fsync(file.fileno())
+            self.pending = []
+        self.last_checkpoint = time.monotonic()
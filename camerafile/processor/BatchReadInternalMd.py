@@ -1,35 +1,56 @@
+import os
+
+from humanize import naturalsize
+
 from camerafile.console.ConsoleTable import ConsoleTable
 from camerafile.core.MediaFile import MediaFile
-from camerafile.processor.BatchTool import BatchElement, TaskWithProgression
+from camerafile.processor.BatchJournal import BatchJournal
+from camerafile.processor.BatchScheduler import BatchScheduler
+from camerafile.processor.BatchTool import BatchElement
 from camerafile.core.Configuration import Configuration
-from camerafile.core.Constants import INTERNAL, THUMBNAIL
+from camerafile.core.Constants import INTERNAL, SIGNATURE, THUMBNAIL
 from camerafile.core.Logging import Logger
 from camerafile.core.MediaSet import MediaSet
 from camerafile.core.OutputDirectory import OutputDirectory
+from camerafile.fileaccess.StandardFileAccess import StandardFileAccess
+from camerafile.fileaccess.StandardFileDescription import StandardFileDescription
+from camerafile.mdtools.ExifToolReader import ExifTool
 from camerafile.metadata.Metadata import Metadata
 from camerafile.processor.CFMBatch import CFMBatch
 from camerafile.task.LoadInternalMetadata import LoadInternalMetadata
+from camerafile.task.LoadMediaFile import LoadMediaFile
+from camerafile.task.TaskCost import TaskCost
 
 LOGGER = Logger(__name__)
 
 
-class BatchReadInternalMd(TaskWithProgression):
+class BatchReadInternalMd(CFMBatch):
 
     def __init__(self, media_set: MediaSet, other_needed_md):
         self.media_set = media_set
         self.stats = {}
         self.call_info = {}
+        # call info -> (number of files, total number of bytes read), for the files read by JPEG/QuickTimeMdReader
+        self.bytes_read = {}
+        # Ids of the media files whose metadata have been loaded, including by a previous interrupted execution
+        self.loaded_ids = set()
         self.other_needed_md = other_needed_md
-        TaskWithProgression.__init__(self, "Read media exif metadata",
-                                     Configuration.get().nb_sub_process,
-                                     on_worker_start=BatchReadInternalMd.on_sub_cfm_start,
-                                     on_worker_end=CFMBatch.on_sub_cfm_end,
-                                     stderr_file=OutputDirectory.get(media_set.root_path).batch_stderr,
-                                     stdout_file=OutputDirectory.get(media_set.root_path).batch_stdout)
+        # Signatures and thumbnails are computed in the same pass as the metadata (see LoadMediaFile)
+        self.single_pass = Configuration.get().single_pass
+        self.thb_dir = None
+        if self.single_pass and Configuration.get().ui:
+            # Thumbnails are needed by the management UI
+            self.thb_dir = OutputDirectory.get(media_set.root_path).path / "thb"
+            os.makedirs(self.thb_dir, exist_ok=True)
+        CFMBatch.__init__(self, "Read media exif metadata",
+                          stderr_file=OutputDirectory.get(media_set.root_path).batch_stderr,
+                          stdout_file=OutputDirectory.get(media_set.root_path).batch_stdout)
+        self.task_initializer = BatchReadInternalMd.set_md_needed
+        # Thumbnails are sent back by workers through a result spool
+        self.use_result_spool = True
 
     @staticmethod
-    def on_sub_cfm_start(md_needed):
-        CFMBatch.on_sub_cfm_start()
+    def set_md_needed(md_needed):
         LoadInternalMetadata.md_needed = md_needed
 
     def initialize(self):
@@ -41,9 +62,15 @@ class BatchReadInternalMd(TaskWithProgression):
         if not Configuration.get().watch:
             print("Metadata that need to be loaded: " + str(needed_md))
         LoadInternalMetadata.md_needed = needed_md
-        self.custo_ows_args = (needed_md,)
+        self.task_initializer_args = (needed_md,)
+        self.journal = BatchJournal(OutputDirectory.get(self.media_set.root_path).get_journal_path("read-internal-md"),
+                                    (needed_md, self.single_pass, self.thb_dir is not None,
+                                     Configuration.get().signature_algorithm,
+                                     Configuration.get().file_signature_algorithm))
 
     def task_getter(self):
+        if self.single_pass:
+            return LoadMediaFile.execute
         return LoadInternalMetadata.execute
 
     def update_stats(self, metadata_internal: Metadata, metadata_thumbnail: Metadata):
@@ -53,38 +80,103 @@ class BatchReadInternalMd(TaskWithProgression):
                     self.stats[name] = 0
                 if value is not None:
                     self.stats[name] += 1
-        if metadata_thumbnail.binary_value:
+        if metadata_thumbnail is not None and metadata_thumbnail.binary_value:
             if "thumbnail" not in self.stats:
                 self.stats["thumbnail"] = 0
             self.stats["thumbnail"] += 1
 
-    def update_call_info(self, call_info):
+    def update_call_info(self, call_info, bytes_read):
         if call_info not in self.call_info:
             self.call_info[call_info] = 0
         self.call_info[call_info] += 1
+        if bytes_read is not None:
+            nb_files, total = self.bytes_read.get(call_info, (0, 0))
+            self.bytes_read[call_info] = (nb_files + 1, total + bytes_read)
+
+    def get_bytes_read_per_file(self, call_info):
+        if call_info not in self.bytes_read:
+            return ""
+        nb_files, total = self.bytes_read[call_info]
+        return naturalsize(total / nb_files)
 
     def arguments(self):
         args_list = []
+        exif_tool_list_files = []
         for media_file in self.media_set:
+            if media_file.file_desc.get_id() in self.loaded_ids:
+                continue
             if media_file.metadata[INTERNAL].value is None or self.media_set.state.read_md_needed:
-                args_list.append(
-                    BatchElement((self.media_set.root_path, media_file.file_desc, media_file.metadata[INTERNAL]),
-                                 media_file.get_path()))
+                args = (self.media_set.root_path, media_file.file_desc, media_file.metadata[INTERNAL])
+                if isinstance(media_file.file_desc, StandardFileDescription) \
+                        and media_file.get_extension() in StandardFileAccess.EXIF_TOOL_LIST_TYPES:
+                    # Only the metadata of these files are loaded, even in single pass
+                    exif_tool_list_files.append((args, media_file.get_path()))
+                else:
+                    cost = TaskCost.read_md(media_file.file_desc)
+                    if self.single_pass:
+                        thb_path = self.get_thumbnail_path(media_file)
+                        args += (media_file.metadata[SIGNATURE], thb_path)
+                        if media_file.metadata[SIGNATURE].value is None:
+                            cost += TaskCost.signature(media_file.file_desc)
+                        if thb_path is not None:
+                            cost += TaskCost.thumbnail(media_file.file_desc)
+                    args_list.append(BatchElement(args, media_file.get_path(), cost,
+                                                  BatchScheduler.get_group(media_file.file_desc)))
             else:
-                self.update_stats(media_file.metadata[INTERNAL], media_file.metadata[THUMBNAIL])
+                self.update_stats(media_file.metadata[INTERNAL], media_file.metadata.get(THUMBNAIL))
+        return args_list + self.group_exif_tool_list_files(exif_tool_list_files)
+
+    def get_thumbnail_path(self, media_file):
+        if self.thb_dir is not None:
+            thb_path = self.thb_dir / f"{media_file.file_desc.get_hex_id()}.thb"
+            if not thb_path.exists():
+                return thb_path
+        return None
+
+    def group_exif_tool_list_files(self, exif_tool_list_files):
+        """
+        Files read by ExifTool are grouped, to read their metadata with a single ExifTool command
+        (see LoadInternalMetadata.execute_list), in groups small enough to be shared by all sub-processes.
+        """
+        # At least one group per sub-process, and at most ExifTool.BATCH_SIZE files per group
+        nb_process = max(self.nb_sub_process, 1)
+        group_size = max(1, min(ExifTool.BATCH_SIZE, -(-len(exif_tool_list_files) // nb_process)))
+        args_list = []
+        for start in range(0, len(exif_tool_list_files), group_size):
+            group = exif_tool_list_files[start:start + group_size]
+            info = group[0][1] + (f" (+{len(group) - 1} files)" if len(group) > 1 else "")
+            cost = sum(TaskCost.read_md(file_desc) for (_, file_desc, _), _ in group)
+            args_list.append(BatchElement([args for args, _ in group], info, cost))
         return args_list
 
     def post_task(self, result, progress_bar, replace=False):
-        media_id, thumbnail, modified_metadata = result
-        self.update_call_info(modified_metadata.call_info)
+        # A list of results is returned for a group of files (see group_exif_tool_list_files)
+        for file_result in result if isinstance(result, list) else [result]:
+            self.update_media(file_result, replace)
+        progress_bar.increment()
+
+    def journal_result(self, result):
+        # Thumbnails are journaled, not their place in the result spool
+        if isinstance(result, list):
+            return [self.journal_result(file_result) for file_result in result]
+        media_id, thumbnail, modified_metadata, bytes_read, signature_metadata = result
+        return media_id, self.get_payload(thumbnail), modified_metadata, bytes_read, signature_metadata
+
+    def update_media(self, result, replace):
+        media_id, thumbnail, modified_metadata, bytes_read, signature_metadata = result
+        thumbnail = self.get_payload(thumbnail)
+        self.update_call_info(modified_metadata.call_info, bytes_read)
         original_media: MediaFile = self.media_set.get_media(media_id)
+        self.loaded_ids.add(media_id)
         if replace:
             original_media.metadata[INTERNAL] = modified_metadata
-        original_media.metadata[THUMBNAIL].binary_value = thumbnail
+        if signature_metadata is not None and signature_metadata.value is not None:
+            original_media.metadata[SIGNATURE] = signature_metadata
+        if thumbnail is not None or original_media.metadata.get(THUMBNAIL) is not None:
+            original_media.metadata[THUMBNAIL].binary_value = thumbnail
         # reindex the file, because date can now be available
         original_media.parent_set.indexer.add_media_file(original_media)
-        self.update_stats(modified_metadata, original_media.metadata[THUMBNAIL])
-        progress_bar.increment()
+        self.update_stats(modified_metadata, original_media.metadata.get(THUMBNAIL))
 
     def finalize(self):
         if len(self.call_info.items()) != 0:
@@ -99,9 +191,9 @@ class BatchReadInternalMd(TaskWithProgression):
 
             print("")
             tab = ConsoleTable()
-            tab.print_header("Call", "Number of files")
+            tab.print_header("Call", "Number of files", "Bytes read per file")
             for key, value in self.call_info.items():
-                tab.print_line(key, str(value))
+                tab.print_line(key, str(value), self.get_bytes_read_per_file(key))
             print("")
 
         self.media_set.state.update_loaded_metadata()
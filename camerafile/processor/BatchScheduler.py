@@ -0,0 +1,46 @@
+import heapq
+from typing import List
+
+from camerafile.fileaccess.FileDescription import FileDescription
+from camerafile.fileaccess.ZipFileDescription import ZipFileDescription
+
+
+class BatchScheduler:
+    """
+    Orders the batch elements whose cost has been estimated (BatchElement.cost, see TaskCost), before they are sent
+    to the workers:
+    - the elements of a same group (BatchElement.group: files of a same zip archive) are kept together, so that they
+      are executed one after the other, in the same chunks
+    - groups and elements are sorted by decreasing cost (longest processing time first), so that the longest tasks
+      (large videos...) do not end the batch alone, while the other workers wait for them
+    """
+
+    @staticmethod
+    def get_group(file_desc: FileDescription):
+        if isinstance(file_desc, ZipFileDescription):
+            return file_desc.relative_zip_path
+        return None
+
+    @staticmethod
+    def schedule(args_list: List) -> List:
+        units = {}
+        for index, batch_element in enumerate(args_list):
+            key = (0, index) if batch_element.group is None else (1, batch_element.group)
+            units.setdefault(key, []).append(batch_element)
+        ordered_units = sorted(units.values(), key=BatchScheduler.get_total_cost, reverse=True)
+        return [batch_element for unit in ordered_units for batch_element in unit]
+
+    @staticmethod
+    def get_total_cost(args_list: List):
+        return sum(batch_element.cost or 0.0 for batch_element in args_list)
+
+    @staticmethod
+    def predict_makespan(args_list: List, nb_workers):
+        """
+        Returns the duration of the batch predicted from the costs of its elements, executed in this order by
+        nb_workers workers that each take the next element once their previous one is done.
+        """
+        loads = [0.0] * nb_workers
+        for batch_element in args_list:
+            heapq.heapreplace(loads, loads[0] + (batch_element.cost or 0.0))
+        return max(loads)
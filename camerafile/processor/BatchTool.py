@@ -1,15 +1,25 @@
+import queue
 import threading
+import time
 import traceback
-from multiprocessing import Pool, cpu_count
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from enum import Enum
+from functools import partial
+from multiprocessing import cpu_count
 from multiprocessing import Queue
 from multiprocessing import current_process
 from queue import Empty
-from typing import List
+from typing import List, Optional
 
 from camerafile.console.ConsoleProgressBar import ConsoleProgressBar
 from camerafile.console.StandardOutputWrapper import StdoutRecorder
 from camerafile.core.Logging import Logger
 from camerafile.mdtools.ExifToolReader import ExifTool
+from camerafile.processor.BatchJournal import BatchJournal
+from camerafile.processor.BatchScheduler import BatchScheduler
+from camerafile.processor.ResultSpool import ResultSpool
+from camerafile.processor.WorkerPool import WorkerPool
 
 DEFAULT_NB_SUB_PROCESS = cpu_count()
 
@@ -18,18 +28,76 @@ LOGGER = Logger(__name__)
 
 class BatchElement:
 
-    def __init__(self, args, info):
+    def __init__(self, args, info, cost=None, group=None):
         self.args = args
         self.info = info
         self.error = None
         self.result = None
+        # Estimated duration of the task (see TaskCost), and group of elements to execute together (see BatchScheduler)
+        self.cost = cost
+        self.group = group
+
+
+class Executor(Enum):
+    """
+    How the tasks of a batch are executed:
+    - PROCESS: by worker processes, for CPU-bound tasks (decoding, hashing, parsing metadata)
+    - THREAD: by threads of the main process, for I/O-bound tasks (links, file dates...), as arguments and results
+      are neither pickled nor sent to other processes. Tasks must be thread-safe (no ExifTool).
+    - INLINE: one after the other by the main process
+    """
+    PROCESS = "process"
+    THREAD = "thread"
+    INLINE = "inline"
+
+
+class ChunkSizer:
+    """
+    Sizes the chunks of batch elements sent to the workers, from the measured duration of the tasks: a chunk should
+    last about TARGET_DURATION, so that the cost of inter-process communication (pickling, pipes) stays small
+    compared to the one of the tasks, even for cheap tasks. Chunks remain small enough for the remaining elements
+    to be shared between all the workers.
+    """
+    TARGET_DURATION = 0.1
+    MAX_SIZE = 1000
+    # Minimum number of chunks per worker for the remaining elements
+    MIN_CHUNKS_PER_WORKER = 4
+
+    def __init__(self, nb_elements, nb_process, fixed_size=None):
+        self.remaining = nb_elements
+        self.nb_process = nb_process
+        self.fixed_size = fixed_size
+        self.nb_measured = 0
+        self.measured_duration = 0.0
+
+    def add_measure(self, nb_tasks, duration):
+        self.nb_measured += nb_tasks
+        self.measured_duration += duration
+
+    def next_size(self):
+        if self.fixed_size is not None:
+            size = self.fixed_size
+        elif self.nb_measured == 0:
+            # Until a first chunk has been executed, the duration of the tasks is unknown
+            size = 1
+        else:
+            task_duration = self.measured_duration / self.nb_measured
+            size = int(self.TARGET_DURATION / task_duration) if task_duration > 0 else self.MAX_SIZE
+            size = min(size, self.MAX_SIZE, self.remaining // (self.MIN_CHUNKS_PER_WORKER * self.nb_process))
+        size = max(1, min(size, self.remaining))
+        self.remaining -= size
+        return size
 
 
 class TaskWithProgression:
     current_multiprocess_task = None
+    current_task_initialization = None
     details_queue = None
     custom_owe = None
     stopped_update_details_thread = True
+    # Details of the elements processed by a worker are sent to the progress bar at most every DETAILS_INTERVAL
+    DETAILS_INTERVAL = 0.1
+    last_details_time = 0.0
 
     def __init__(self, batch_title="", nb_sub_process=None, on_worker_start=None, on_worker_start_args=(),
                  on_worker_end=None, stderr_file=None, stdout_file=None):
@@ -42,12 +110,29 @@ class TaskWithProgression:
         self.stdout_file = stdout_file
         self.nb_errors = 0
         self.stdout_nb_lines = 0
+        # Preferred executor of the tasks of this batch (nb_sub_process = 0 means INLINE)
+        self.executor = Executor.PROCESS
+        # Number of batch elements sent at once to a worker (None: adaptive, see ChunkSizer)
+        self.chunk_size = None
+        # Tasks are executed by the shared worker pool, kept alive between batches (see WorkerPool), or by a pool
+        # started for this batch only
+        self.shared_worker_pool = False
+        # Called with task_initializer_args in each worker, before it executes the first task of this batch
+        self.task_initializer = None
+        self.task_initializer_args = ()
+        # Binary payloads of the results (see ResultSpool.put) are sent back by workers through a result spool
+        self.use_result_spool = False
+        self.result_spool = None
+        # Results are journaled, to be replayed if the batch is interrupted (see BatchJournal)
+        self.journal: Optional[BatchJournal] = None
         if self.nb_sub_process is None:
             self.nb_sub_process = DEFAULT_NB_SUB_PROCESS
 
     def update_title(self, ):
-        if self.nb_sub_process != 0:
+        if self.nb_sub_process != 0 and self.executor == Executor.PROCESS:
             self.batch_title += " (max. {nb_sub_process} sub-processes)".format(nb_sub_process=self.nb_sub_process)
+        elif self.nb_sub_process != 0 and self.executor == Executor.THREAD:
+            self.batch_title += " (max. {nb_sub_process} threads)".format(nb_sub_process=self.nb_sub_process)
         return self.batch_title
 
     def initialize(self):
@@ -72,16 +157,67 @@ class TaskWithProgression:
         print("{nb_elements} elements processed in {duration}"
               .format(nb_elements=progress_bar.position, duration=progress_bar.processing_time))
 
+    def journal_result(self, result):
+        """
+        Returns the result to journal (see BatchJournal), once processed by post_task.
+        """
+        return result
+
+    def post_task_and_journal(self, result, progress_bar, replace=False):
+        self.post_task(result, progress_bar, replace)
+        self.journal.add(self.journal_result(result))
+
+    def replay_journal(self):
+        """
+        Processes the results journaled by an interrupted execution of this batch, before its arguments are computed.
+        """
+        if self.journal is None:
+            return
+        results = self.journal.replay()
+        if len(results) != 0:
+            LOGGER.info(f"{len(results)} results of an interrupted execution replayed from {self.journal.path}")
+            pb = ConsoleProgressBar(len(results))
+            try:
+                for result in results:
+                    try:
+                        self.post_task(result, pb, replace=True)
+                    except Exception:
+                        # Files removed since
+                        LOGGER.debug(f"Journaled result not replayed: {traceback.format_exc()}")
+            finally:
+                pb.stop()
+
+    def get_nb_workers(self):
+        if self.nb_sub_process == 0 or self.executor == Executor.INLINE:
+            return 1
+        return self.nb_sub_process
+
     def execute(self):
         self.initialize()
+        self.replay_journal()
         task = self.task_getter()
         args = self.arguments()
+        post_task = self.post_task if self.journal is None else self.post_task_and_journal
         if len(args) != 0:
+            # Elements are scheduled if their cost has been estimated
+            scheduled = any(batch_element.cost is not None for batch_element in args)
+            if scheduled:
+                unscheduled_makespan = BatchScheduler.predict_makespan(args, self.get_nb_workers())
+                args = BatchScheduler.schedule(args)
+                predicted_makespan = BatchScheduler.predict_makespan(args, self.get_nb_workers())
+            start_time = time.perf_counter()
             pb = ConsoleProgressBar(len(args))
-            if self.nb_sub_process != 0:
-                self.execute_multiprocess_batch(self.nb_sub_process, task, args, self.post_task, pb)
+            if self.nb_sub_process == 0 or self.executor == Executor.INLINE:
+                self.execute_uni_process_batch(task, args, post_task, pb)
+            elif self.executor == Executor.THREAD:
+                self.execute_thread_batch(self.nb_sub_process, task, args, post_task, pb)
             else:
-                self.execute_uni_process_batch(task, args, self.post_task, pb)
+                self.execute_multiprocess_batch(self.nb_sub_process, task, args, post_task, pb)
+            if scheduled:
+                LOGGER.info(f"Makespan: {time.perf_counter() - start_time:.1f}s (predicted: {predicted_makespan:.1f}s, "
+                            f"{unscheduled_makespan:.1f}s without scheduling)")
+            if self.journal is not None:
+                self.journal.checkpoint()
             self.finalize()
             self.display_final_status(pb)
         else:
@@ -101,12 +237,73 @@ class TaskWithProgression:
             progress_bar.stop()
             ExifTool.stop()
 
+    def execute_thread_batch(self, nb_threads, task, args_list: List[BatchElement], post_task,
+                             progress_bar: ConsoleProgressBar):
+        self.nb_errors = 0
+        self.stdout_nb_lines = 0
+        self.update_status(progress_bar)
+        executor = ThreadPoolExecutor(max_workers=nb_threads)
+        try:
+            # Tasks update the batch elements of the main process, like execute_uni_process_batch
+            for batch_element in executor.map(partial(self.execute_thread_task, task, progress_bar), args_list):
+                if batch_element.error:
+                    self.process_error(batch_element, progress_bar)
+                try:
+                    post_task(batch_element.result, progress_bar, replace=False)
+                except BaseException:
+                    batch_element.error = traceback.format_exc()
+                    self.process_error(batch_element, progress_bar)
+        finally:
+            # All the tasks are queued by map: do not execute the remaining ones if the batch is interrupted
+            executor.shutdown(wait=True, cancel_futures=True)
+            progress_bar.stop()
+
+    @staticmethod
+    def execute_thread_task(task, progress_bar: ConsoleProgressBar, batch_element: BatchElement):
+        progress_bar.set_detail(threading.current_thread().name, batch_element.info)
+        try:
+            return task(batch_element)
+        except BaseException:
+            batch_element.error = traceback.format_exc()
+            return batch_element
+
+    def get_payload(self, value):
+        """
+        Returns a binary payload of a task result (see ResultSpool.put), to be called by post_task.
+        """
+        if self.result_spool is None:
+            return value
+        return self.result_spool.get(value)
+
+    @staticmethod
+    def execute_tasks(task, task_initialization, spool_directory, batch_elements: List[BatchElement]):
+        """
+        Executes a chunk of batch elements in a worker. Their results are returned together, with the time spent
+        executing them.
+        As workers may execute the tasks of several batches (see WorkerPool), the task and its initialization
+        (task_initializer of the batch, called once per worker) are given with each chunk, as well as the directory
+        of the result spool of the batch (or None).
+        """
+        if task_initialization != TaskWithProgression.current_task_initialization:
+            task_initializer, task_initializer_args = task_initialization
+            if task_initializer is not None:
+                task_initializer(*task_initializer_args)
+            TaskWithProgression.current_task_initialization = task_initialization
+        TaskWithProgression.current_multiprocess_task = task
+        start_time = time.perf_counter()
+        with ResultSpool.write_chunk(spool_directory):
+            results = [TaskWithProgression.execute_task(batch_element) for batch_element in batch_elements]
+        return results, time.perf_counter() - start_time
+
     @staticmethod
     def execute_task(batch_element: BatchElement):
         try:
-            queue: Queue = TaskWithProgression.details_queue
-            if queue is not None:
-                queue.put([current_process().pid, batch_element.info])
+            details_queue: Queue = TaskWithProgression.details_queue
+            if details_queue is not None:
+                now = time.monotonic()
+                if now - TaskWithProgression.last_details_time >= TaskWithProgression.DETAILS_INTERVAL:
+                    TaskWithProgression.last_details_time = now
+                    details_queue.put([current_process().pid, batch_element.info])
             stdout_recorder = StdoutRecorder().start()
             if TaskWithProgression.current_multiprocess_task is None:
                 print("Multi-processing: no task defined in sub-process.")
@@ -117,10 +314,8 @@ class TaskWithProgression:
             return batch_element, traceback.format_exc()
 
     @staticmethod
-    def on_worker_start(task, details_queue, custom_ows=None, custom_ows_args=(),
-                        custom_owe=None):
+    def on_worker_start(details_queue, custom_ows=None, custom_ows_args=(), custom_owe=None):
         stdout_recorder = StdoutRecorder().start()
-        TaskWithProgression.current_multiprocess_task = task
         TaskWithProgression.details_queue = details_queue
         TaskWithProgression.custom_owe = custom_owe
         if custom_ows:
@@ -138,20 +333,25 @@ class TaskWithProgression:
             TaskWithProgression.details_queue.put(stdout_recorder.stop())
 
     @staticmethod
-    def update_details(queue: Queue, progress_bar: ConsoleProgressBar, max_iter):
+    def update_details(details_queue: Queue, progress_bar: ConsoleProgressBar):
+        """
+        Displays the details and the stdout sent by the workers, until None is received.
+        """
         TaskWithProgression.stopped_update_details_thread = False
-        if queue is None:
+        if details_queue is None:
             return
         iter_nb = 0
-        while iter_nb < max_iter and not TaskWithProgression.stopped_update_details_thread:
+        while not TaskWithProgression.stopped_update_details_thread:
             try:
-                val = queue.get(block=True, timeout=10)
+                val = details_queue.get(block=True, timeout=10)
             except Empty:
                 continue
             except (OSError, ValueError):
                 LOGGER.info(f"details_thread interrupted at iteration {iter_nb}")
                 return
             iter_nb += 1
+            if val is None:
+                return
             if isinstance(val, str):
                 worker_stdout = val
                 if worker_stdout != "":
@@ -193,23 +393,24 @@ class TaskWithProgression:
         else:
             print(stdout.strip())
 
+    def get_worker_pool(self, nb_process, nb_elements) -> WorkerPool:
+        on_worker_start_args = (self.custom_ows, self.custo_ows_args, self.custom_owe)
+        if self.shared_worker_pool:
+            return WorkerPool.get_shared(nb_process, self.on_worker_start, on_worker_start_args, self.on_worker_end)
+        return WorkerPool(min(nb_process, nb_elements), self.on_worker_start, on_worker_start_args, self.on_worker_end)
+
     def execute_multiprocess_batch(self, nb_process, task, args_list: List[BatchElement], post_task, progress_bar):
-        details_queue = Queue()
-        nb_elements = len(args_list)
-        nb_process = min(nb_process, nb_elements)
-        pool = Pool(processes=nb_process,
-                    initializer=self.on_worker_start,
-                    initargs=(task, details_queue, self.custom_ows, self.custo_ows_args, self.custom_owe))
-        details_thread = threading.Thread(target=self.update_details,
-                                          args=(details_queue, progress_bar, 2 * nb_process + nb_elements))
+        worker_pool = self.get_worker_pool(nb_process, len(args_list))
+        details_thread = threading.Thread(target=self.update_details, args=(worker_pool.details_queue, progress_bar))
         details_thread.start()
         self.nb_errors = 0
         self.stdout_nb_lines = 0
         self.update_status(progress_bar)
+        if self.use_result_spool:
+            self.result_spool = ResultSpool()
+        completed = False
         try:
-            res_list = pool.imap_unordered(self.execute_task, args_list)
-            for res in res_list:
-                batch_element, stdout = res
+            for batch_element, stdout in self.execute_chunks(worker_pool, task, args_list):
                 self.process_stdout(batch_element, stdout, progress_bar)
                 if batch_element.error:
                     self.process_error(batch_element, progress_bar)
@@ -219,20 +420,51 @@ class TaskWithProgression:
                     # print("Unexpected exception")
                     batch_element.error = traceback.format_exc()
                     self.process_error(batch_element, progress_bar)
+            completed = True
         except BaseException:
             print("Unexpected exception")
             traceback.print_exc()
         finally:
-            self.__send_ending_tasks(pool, nb_process)
+            worker_pool.details_queue.put(None)
             self.__stop_details_thread(details_thread)
             progress_bar.stop()
-            LOGGER.debug("Try to close, terminate, and join the pool")
-            pool.close()
-            LOGGER.debug("Pool closed")
-            pool.terminate()
-            LOGGER.debug("Pool terminated")
-            pool.join()
-            LOGGER.debug("Pool joined")
+            if not self.shared_worker_pool:
+                worker_pool.stop()
+            elif not completed:
+                # Workers may still be executing tasks of this batch
+                WorkerPool.stop_shared()
+            if self.result_spool is not None:
+                self.result_spool.close()
+                self.result_spool = None
+
+    def execute_chunks(self, worker_pool: WorkerPool, task, args_list: List[BatchElement]):
+        """
+        Sends the batch elements to the workers by chunks (see ChunkSizer), and yields the (batch_element, stdout)
+        results of each chunk as soon as it is executed. Only 2 chunks per worker are pending at a time, so that
+        the size of the next chunks benefits from the durations measured meanwhile.
+        """
+        nb_process = worker_pool.nb_process
+        chunk_sizer = ChunkSizer(len(args_list), nb_process, self.chunk_size)
+        task_initialization = (self.task_initializer, self.task_initializer_args)
+        spool_directory = self.result_spool.directory if self.result_spool is not None else None
+        remaining = deque(args_list)
+        results = queue.SimpleQueue()
+        nb_pending = 0
+        while remaining or nb_pending != 0:
+            while remaining and nb_pending < 2 * nb_process:
+                chunk = [remaining.popleft() for _ in range(chunk_sizer.next_size())]
+                worker_pool.pool.apply_async(self.execute_tasks, (task, task_initialization, spool_directory, chunk),
+                                             callback=results.put, error_callback=results.put)
+                nb_pending += 1
+            result = results.get()
+            nb_pending -= 1
+            if isinstance(result, BaseException):
+                raise result
+            chunk_results, duration = result
+            chunk_sizer.add_measure(len(chunk_results), duration)
+            yield from chunk_results
+            if self.result_spool is not None:
+                self.result_spool.release()
 
     @staticmethod
     def __stop_details_thread(details_thread):
@@ -247,8 +479,3 @@ class TaskWithProgression:
                 LOGGER.info("Warning: details_thread could not be stopped")
             else:
                 LOGGER.info("details_thread stopped correctly")
-
-    def __send_ending_tasks(self, pool: Pool, nb_process):
-        LOGGER.debug("Send ending tasks to workers")
-        result = pool.map_async(self.on_worker_end, range(nb_process))
-        result.wait()
@@ -6,7 +6,7 @@ from camerafile.core.Logging import Logger
 from camerafile.core.MediaFile import MediaFile
 from camerafile.core.MediaSet import MediaSet
 from camerafile.core.OutputDirectory import OutputDirectory
-from camerafile.processor.BatchTool import BatchElement
+from camerafile.processor.BatchTool import BatchElement, Executor
 from camerafile.processor.CFMBatch import CFMBatch
 from camerafile.task.UpdateWhatsAppDate import UpdateWhatsAppDate
 
@@ -41,6 +41,8 @@ class BatchUpdateWhatsAppDates(CFMBatch):
             stderr_file=OutputDirectory.get(self.media_set.root_path).batch_stderr,
             stdout_file=OutputDirectory.get(self.media_set.root_path).batch_stdout
         )
+        # Only dates of files are updated: no need for other processes
+        self.executor = Executor.THREAD
         self.result_stats = {}
 
     def initialize(self):
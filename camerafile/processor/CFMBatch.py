@@ -3,6 +3,7 @@ import os
 
 from camerafile.core.Configuration import Configuration
 from camerafile.core.Resource import Resource
+from camerafile.fileaccess.ZipFileAccess import ZipFileAccess
 from camerafile.mdtools.ExifToolReader import ExifTool
 from camerafile.processor.BatchTool import TaskWithProgression
 
@@ -19,6 +20,15 @@ class CFMBatch(TaskWithProgression):
                                      on_worker_end=CFMBatch.on_sub_cfm_end,
                                      stderr_file=stderr_file,
                                      stdout_file=stdout_file)
+        # cfm sub-processes are only started once, for all the batches (see WorkerPool)
+        self.shared_worker_pool = True
+
+    def execute(self):
+        try:
+            return TaskWithProgression.execute(self)
+        finally:
+            # Archives read by the main process (uni-process, threads) are not kept open between batches
+            ZipFileAccess.close_archives()
 
     @staticmethod
     def init_sub_cfm():
@@ -38,3 +48,4 @@ class CFMBatch(TaskWithProgression):
     def on_sub_cfm_end():
         LOGGER.debug("Stop sub-process : " + str(os.getpid()))
         ExifTool.stop()
+        ZipFileAccess.close_archives()
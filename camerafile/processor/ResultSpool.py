@@ -0,0 +1,91 @@
+import itertools
+import mmap
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+from typing import NamedTuple
+
+
+class SpoolRef(NamedTuple):
+    file_name: str
+    offset: int
+    length: int
+
+
+class ResultSpool:
+    """
+    Channel for the binary payloads of task results (thumbnails...), so that they are neither pickled nor sent through
+    the result pipe of the worker pool: a worker writes the payloads of the results of a chunk of tasks in a spool
+    file, and only sends back small descriptors (SpoolRef). The main process maps the spool file of a chunk to read
+    its payloads, and deletes it once the results of the chunk have been processed.
+    Tasks executed by the main process (uni-process, threads) keep their payloads as they are.
+    """
+    # Set in a worker while it executes a chunk of tasks of a batch that uses a result spool
+    chunk_directory = None
+    chunk_file = None
+    chunk_ids = itertools.count()
+
+    def __init__(self):
+        self.directory = tempfile.mkdtemp(prefix="cfm-spool-")
+        # (file name, mmap) of the spool file being read
+        self.mapped = None
+
+    @staticmethod
+    @contextmanager
+    def write_chunk(directory):
+        """
+        Context in which a worker executes a chunk of tasks: their payloads are written in a new spool file of
+        directory, closed before the results are sent back. directory is None if the batch does not use a spool.
+        """
+        ResultSpool.chunk_directory = directory
+        try:
+            yield
+        finally:
+            ResultSpool.chunk_directory = None
+            if ResultSpool.chunk_file is not None:
+                ResultSpool.chunk_file.close()
+                ResultSpool.chunk_file = None
+
+    @staticmethod
+    def put(payload):
+        """
+        Returns what a task should return for this binary payload: a SpoolRef if it is executed by a worker for a
+        batch that uses a result spool, the payload otherwise.
+        """
+        if not payload or ResultSpool.chunk_directory is None:
+            return payload
+        if ResultSpool.chunk_file is None:
+            file_name = f"{os.getpid()}-{next(ResultSpool.chunk_ids)}.spool"
+            ResultSpool.chunk_file = open(os.path.join(ResultSpool.chunk_directory, file_name), "wb")
+        file = ResultSpool.chunk_file
+        offset = file.tell()
+        file.write(payload)
+        return SpoolRef(os.path.basename(file.name), offset, len(payload))
+
+    def get(self, value):
+        """
+        Returns the payload of a value returned by ResultSpool.put.
+        """
+        if not isinstance(value, SpoolRef):
+            return value
+        if self.mapped is None or self.mapped[0] != value.file_name:
+            self.release()
+            with open(os.path.join(self.directory, value.file_name), "rb") as file:
+                self.mapped = value.file_name, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self.mapped[1][value.offset:value.offset + value.length]
+
+    def release(self):
+        """
+        Unmaps and deletes the spool file being read, once the results of its chunk have been processed.
+        """
+        if self.mapped is not None:
+            file_name, mapped = self.mapped
+            self.mapped = None
+            mapped.close()
+            os.remove(os.path.join(self.directory, file_name))
+
+    def close(self):
+        self.release()
+        # Spool files of chunks whose payloads were not read, or of tasks interrupted
+        shutil.rmtree(self.directory, ignore_errors=True)
@@ -0,0 +1,64 @@
+import atexit
+from multiprocessing import Pool
+from multiprocessing import Queue
+
+from camerafile.core.Logging import Logger
+
+LOGGER = Logger(__name__)
+
+
+class WorkerPool:
+    """
+    Pool of worker processes, with the queue used by the workers to send the details of their tasks and their stdout.
+    The shared worker pool (see get_shared) is kept alive between batches, so that workers are started and
+    initialized (configuration, imports, ExifTool) only once per cfm execution, including in watch mode: what a batch
+    needs in the workers is sent with its tasks (see TaskWithProgression.execute_tasks), not when workers start.
+    """
+    __shared = None
+
+    def __init__(self, nb_process, on_worker_start, on_worker_start_args=(), on_worker_end=None):
+        self.nb_process = nb_process
+        self.on_worker_end = on_worker_end
+        # Workers are started with the same parameters by equal keys (see get_shared)
+        self.key = (nb_process, on_worker_start, on_worker_start_args, on_worker_end)
+        self.details_queue = Queue()
+        self.pool = Pool(processes=nb_process,
+                         initializer=on_worker_start,
+                         initargs=(self.details_queue,) + tuple(on_worker_start_args))
+
+    @staticmethod
+    def get_shared(nb_process, on_worker_start, on_worker_start_args=(), on_worker_end=None) -> "WorkerPool":
+        """
+        Returns the shared worker pool, started again if it was started with other parameters.
+        """
+        shared = WorkerPool.__shared
+        if shared is not None and shared.key != (nb_process, on_worker_start, on_worker_start_args, on_worker_end):
+            WorkerPool.stop_shared()
+        if WorkerPool.__shared is None:
+            LOGGER.debug(f"Start shared worker pool ({nb_process} sub-processes)")
+            WorkerPool.__shared = WorkerPool(nb_process, on_worker_start, on_worker_start_args, on_worker_end)
+        return WorkerPool.__shared
+
+    @staticmethod
+    def stop_shared():
+        if WorkerPool.__shared is not None:
+            shared, WorkerPool.__shared = WorkerPool.__shared, None
+            shared.stop()
+
+    def stop(self):
+        try:
+            if self.on_worker_end is not None:
+                LOGGER.debug("Send ending tasks to workers")
+                self.pool.map_async(self.on_worker_end, range(self.nb_process)).wait()
+        finally:
+            LOGGER.debug("Try to close, terminate, and join the pool")
+            self.pool.close()
+            LOGGER.debug("Pool closed")
+            self.pool.terminate()
+            LOGGER.debug("Pool terminated")
+            self.pool.join()
+            LOGGER.debug("Pool joined")
+
+
+# Workers end their tasks (ExifTool...) before multiprocessing terminates them at exit
+atexit.register(WorkerPool.stop_shared)
@@ -16,7 +16,8 @@ class ComputeSignature:
             else:
                 batch_element.error = "ComputeSignature: [{info}] - ".format(info=batch_element.info) + str(e)
         batch_element.args = None
-        batch_element.result = file_desc.get_id(), signature_metadata
+        # Only the value is sent back, rather than the metadata object
+        batch_element.result = file_desc.get_id(), signature_metadata.value
         return batch_element
 
     @staticmethod
@@ -104,7 +104,6 @@ class CopyFile:
     def move(media_file: MediaFile, new_file_desc: FileDescription):
         new_media_file = MediaFile(new_file_desc, None, media_file.parent_set)
         new_media_file.metadata = media_file.metadata
-        new_media_file.loaded_from_database = True
         new_media_file.metadata.set_value(ORIGINAL_PATH, str(media_file))
         media_file.parent_set.register_file(new_media_file)
         media_file.parent_set.unregister_file(media_file)
@@ -13,6 +13,7 @@ class GenerateThumbnail:
     from pillow_heif import register_heif_opener
     register_heif_opener()
     IMAGE_EXTENSIONS = {f"{ext.lower()}" for ext in Image.registered_extensions()}
+    THUMBNAIL_SIZE = (512, 512)
 
     @staticmethod
     def execute(batch_element: BatchElement):
@@ -37,27 +38,7 @@ class GenerateThumbnail:
             if file_description.extension in GenerateThumbnail.IMAGE_EXTENSIONS:
                 with file_access.open() as file:
                     with Image.open(file) as image:
-                        image.thumbnail((512, 512))
-                        if image.mode in ("RGBA", "P"):
-                            image = image.convert("RGB")
-                        
-                        # Appliquer l'orientation sur la miniature (plus rapide)
-                        if orientation == 2:
-                            image = image.transpose(Image.FLIP_LEFT_RIGHT)
-                        elif orientation == 3:
-                            image = image.rotate(180, expand=True)
-                        elif orientation == 4:
-                            image = image.transpose(Image.FLIP_TOP_BOTTOM)
-                        elif orientation == 5:
-                            image = image.transpose(Image.FLIP_LEFT_RIGHT).rotate(270, expand=True)
-                        elif orientation == 6:
-                            image = image.rotate(270, expand=True)
-                        elif orientation == 7:
-                            image = image.transpose(Image.FLIP_LEFT_RIGHT).rotate(90, expand=True)
-                        elif orientation == 8:
-                            image = image.rotate(90, expand=True)
-                            
-                        image.save(thb_path, format='JPEG')
+                        GenerateThumbnail.save_image_thumbnail(image, thb_path, orientation)
             else:
                 videoCapture = cv2.VideoCapture(file_access.get_path())
                 result, image = videoCapture.read()
@@ -83,6 +64,30 @@ class GenerateThumbnail:
         except Exception as e:
             print(f"Error generating thumbnail: {e}")
 
+    @staticmethod
+    def save_image_thumbnail(image, thb_path, orientation=None):
+        image.thumbnail(GenerateThumbnail.THUMBNAIL_SIZE)
+        if image.mode in ("RGBA", "P"):
+            image = image.convert("RGB")
+
+        # Appliquer l'orientation sur la miniature (plus rapide)
+        if orientation == 2:
+            image = image.transpose(Image.FLIP_LEFT_RIGHT)
+        elif orientation == 3:
+            image = image.rotate(180, expand=True)
+        elif orientation == 4:
+            image = image.transpose(Image.FLIP_TOP_BOTTOM)
+        elif orientation == 5:
+            image = image.transpose(Image.FLIP_LEFT_RIGHT).rotate(270, expand=True)
+        elif orientation == 6:
+            image = image.rotate(270, expand=True)
+        elif orientation == 7:
+            image = image.transpose(Image.FLIP_LEFT_RIGHT).rotate(90, expand=True)
+        elif orientation == 8:
+            image = image.rotate(90, expand=True)
+
+        image.save(thb_path, format='JPEG')
+
     @staticmethod
     def save_as_jpg(thb_path, image, qualite=90):
         tmp_filename = os.path.splitext(thb_path)[0] + ".jpg"
@@ -1,9 +1,11 @@
 from camerafile.core.Configuration import Configuration
+from camerafile.fileaccess.FileAccess import FileAccess
 from camerafile.fileaccess.FileAccessFactory import FileAccessFactory
-from camerafile.fileaccess.FileDescription import FileDescription
+from camerafile.fileaccess.StandardFileAccess import StandardFileAccess
 from camerafile.mdtools.MdConstants import MetadataNames
 from camerafile.metadata.Metadata import Metadata
 from camerafile.processor.BatchTool import BatchElement
+from camerafile.processor.ResultSpool import ResultSpool
 
 
 class LoadInternalMetadata:
@@ -11,24 +13,65 @@ class LoadInternalMetadata:
 
     @staticmethod
     def execute(batch_element: BatchElement):
+        if isinstance(batch_element.args, list):
+            return LoadInternalMetadata.execute_list(batch_element)
         root_dir, file_description, metadata = batch_element.args
         thumbnail = None
+        file_access = FileAccessFactory.get(root_dir, file_description)
         try:
-            thumbnail = LoadInternalMetadata.load_internal_metadata(root_dir, file_description, metadata)
+            thumbnail = LoadInternalMetadata.load_internal_metadata(file_access, metadata)
         except BaseException as e:
             if Configuration.get().exit_on_error:
                 raise
             else:
                 batch_element.error = "LoadInternalMetadata: [{info}] - ".format(info=batch_element.info) + str(e)
         batch_element.args = None
-        batch_element.result = (file_description.get_id(), thumbnail, metadata)
+        # No signature computed here (see LoadMediaFile)
+        batch_element.result = (file_description.get_id(), ResultSpool.put(thumbnail), metadata, file_access.bytes_read,
+                                None)
         return batch_element
 
     @staticmethod
-    def load_internal_metadata(root_dir: str, file_description: FileDescription, metadata: Metadata):
-        file_access = FileAccessFactory.get(root_dir, file_description)
+    def execute_list(batch_element: BatchElement):
+        """
+        Loads the internal metadata of a list of files (see BatchReadInternalMd.arguments): their metadata are
+        read together by StandardFileAccess.read_md_list. The result is the list of the result of each file.
+        """
+        args_list = batch_element.args
+        errors = []
+        file_access_list = [FileAccessFactory.get(root_dir, file_description)
+                            for root_dir, file_description, _ in args_list]
+        try:
+            md_list = StandardFileAccess.read_md_list(file_access_list, LoadInternalMetadata.md_needed)
+        except BaseException:
+            if Configuration.get().exit_on_error:
+                raise
+            # Metadata will be read file by file
+            md_list = [None] * len(args_list)
+        results = []
+        for (_, file_description, metadata), file_access, md in zip(args_list, file_access_list, md_list):
+            thumbnail = None
+            try:
+                thumbnail = LoadInternalMetadata.load_internal_metadata(file_access, metadata, md)
+            except BaseException as e:
+                if Configuration.get().exit_on_error:
+                    raise
+                else:
+                    errors.append("LoadInternalMetadata: [{info}] - ".format(info=file_description.relative_path)
+                                  + str(e))
+            results.append((file_description.get_id(), ResultSpool.put(thumbnail), metadata, file_access.bytes_read,
+                            None))
+        if errors:
+            batch_element.error = "\n".join(errors)
+        batch_element.args = None
+        batch_element.result = results
+        return batch_element
+
+    @staticmethod
+    def load_internal_metadata(file_access: FileAccess, metadata: Metadata, md=None):
         args = LoadInternalMetadata.md_needed
-        metadata.call_info, result = file_access.read_md(args)
+        # md: (call_info, result) already read for this file, if it was read with other files
+        metadata.call_info, result = md if md is not None else file_access.read_md(args)
 
         orientation = result[MetadataNames.ORIENTATION] if MetadataNames.ORIENTATION in result else None
         width = result[MetadataNames.WIDTH] if MetadataNames.WIDTH in result else None
@@ -0,0 +1,71 @@
+from camerafile.core.Configuration import Configuration
+from camerafile.fileaccess.FileAccess import FileAccess
+from camerafile.fileaccess.FileAccessFactory import FileAccessFactory
+from camerafile.metadata.Metadata import Metadata
+from camerafile.processor.BatchTool import BatchElement
+from camerafile.processor.ResultSpool import ResultSpool
+from camerafile.task.GenerateThumbnail import GenerateThumbnail
+from camerafile.task.LoadInternalMetadata import LoadInternalMetadata
+from camerafile.tools.CFMImage import CFMImage
+from camerafile.tools.Hash import Hash
+
+
+class LoadMediaFile:
+    """
+    Single pass over a media file (see Configuration.single_pass), instead of one pass by LoadInternalMetadata,
+    ComputeSignature and GenerateThumbnail each: an image is opened once, its internal metadata are read, and it is
+    decoded once to compute its signature and generate its thumbnail, when they are needed.
+    """
+
+    @staticmethod
+    def execute(batch_element: BatchElement):
+        if isinstance(batch_element.args, list):
+            # Files whose metadata are read together by ExifTool: only their metadata are loaded
+            return LoadInternalMetadata.execute_list(batch_element)
+        root_dir, file_description, metadata, signature_metadata, thb_path = batch_element.args
+        thumbnail = None
+        file_access = FileAccessFactory.get(root_dir, file_description)
+        try:
+            thumbnail = LoadMediaFile.load_media_file(file_access, metadata, signature_metadata, thb_path)
+        except BaseException as e:
+            if Configuration.get().exit_on_error:
+                raise
+            else:
+                batch_element.error = "LoadMediaFile: [{info}] - ".format(info=batch_element.info) + str(e)
+        batch_element.args = None
+        batch_element.result = (file_description.get_id(), ResultSpool.put(thumbnail), metadata, file_access.bytes_read,
+                                signature_metadata)
+        return batch_element
+
+    @staticmethod
+    def load_media_file(file_access: FileAccess, metadata: Metadata, signature_metadata: Metadata, thb_path):
+        compute_signature = signature_metadata is not None and signature_metadata.value is None
+        if not file_access.is_image():
+            thumbnail = LoadInternalMetadata.load_internal_metadata(file_access, metadata)
+            if compute_signature:
+                signature_metadata.value = file_access.hash()
+            if thb_path is not None:
+                GenerateThumbnail.generate_thumbnail(file_access.root_path, file_access.file_desc, thb_path,
+                                                     metadata.get_orientation())
+            return thumbnail
+
+        with file_access.open() as file:
+            md = file_access.read_md(LoadInternalMetadata.md_needed, file)
+            thumbnail = LoadInternalMetadata.load_internal_metadata(file_access, metadata, md)
+            # Signatures are computed from the image decoded as ComputeSignature does (see Hash.get_draft_size),
+            # the thumbnail is then generated from the same image, unless it has been decoded at a reduced scale
+            # smaller than the thumbnail
+            shared_image = compute_signature and thb_path is not None and Hash.get_draft_size() is None
+            if compute_signature:
+                file.seek(0)
+                with CFMImage(file, file_access.file_desc.name, Hash.get_draft_size()) as image:
+                    signature_metadata.value = Hash.image_hash(image)
+                    if shared_image and image.image_data is not None:
+                        # image is already rotated according to its orientation
+                        GenerateThumbnail.save_image_thumbnail(image.image_data, thb_path)
+            if thb_path is not None and not shared_image:
+                file.seek(0)
+                with CFMImage(file, file_access.file_desc.name, GenerateThumbnail.THUMBNAIL_SIZE) as image:
+                    if image.image_data is not None:
+                        GenerateThumbnail.save_image_thumbnail(image.image_data, thb_path)
+        return thumbnail
@@ -0,0 +1,76 @@
+from camerafile.core.Configuration import Configuration
+from camerafile.core.Constants import IMAGE_TYPE, QT_TYPE, AVI_TYPE, VIDEO_TYPE, KEYFRAME_DHASH, FILE_SIZE
+from camerafile.fileaccess.FileDescription import FileDescription
+from camerafile.fileaccess.ZipFileDescription import ZipFileDescription
+from camerafile.tools.Hash import Hash
+
+MB = 1024 * 1024
+
+
+class TaskCost:
+    """
+    Rough estimation of the duration of the tasks on a media file, in seconds, used to schedule the batch elements
+    (see BatchScheduler). Durations were measured on one core with a local SSD: they give the order of the tasks,
+    and an order of magnitude of the duration of a batch.
+    """
+    # Metadata read by the native readers (a few KB at the beginning of the file), or by an ExifTool command
+    NATIVE_READER = 0.001
+    EXIF_TOOL = 0.03
+    NATIVE_READER_TYPES = IMAGE_TYPE + QT_TYPE + AVI_TYPE
+    # Images decoded at 1/8 scale (JPEG draft mode), or fully decoded
+    DRAFT_DECODE_PER_MB = 0.02
+    DECODE_PER_MB = 0.1
+    # Content read and hashed, or decompressed from a zip archive
+    READ_PER_MB = 0.003
+    INFLATE_PER_MB = 0.005
+    # Frame of a video decoded for its keyframe signature
+    KEYFRAME = 0.08
+    # Size of files whose size is unknown
+    DEFAULT_SIZE = 2 * MB
+
+    @staticmethod
+    def get_size(file_desc: FileDescription):
+        return file_desc.file_size if file_desc.file_size is not None else TaskCost.DEFAULT_SIZE
+
+    @staticmethod
+    def read_md(file_desc: FileDescription):
+        """
+        Internal metadata (see LoadInternalMetadata).
+        """
+        if Configuration.get().exif_tool or file_desc.extension not in TaskCost.NATIVE_READER_TYPES:
+            return TaskCost.EXIF_TOOL
+        return TaskCost.NATIVE_READER
+
+    @staticmethod
+    def signature(file_desc: FileDescription):
+        """
+        Signature of the file (see Hash).
+        """
+        size_mb = TaskCost.get_size(file_desc) / MB
+        if file_desc.is_image():
+            per_mb = TaskCost.DRAFT_DECODE_PER_MB if Hash.get_draft_size() is not None else TaskCost.DECODE_PER_MB
+            return size_mb * per_mb + TaskCost.inflate(file_desc, size_mb)
+        if Configuration.get().file_signature_algorithm == FILE_SIZE:
+            return 0.0
+        if Configuration.get().file_signature_algorithm == KEYFRAME_DHASH and file_desc.extension in VIDEO_TYPE:
+            # Videos of zip archives are extracted to be decoded
+            return TaskCost.KEYFRAME + TaskCost.inflate(file_desc, size_mb)
+        # Large files are hashed by samples
+        read_mb = min(size_mb, 3 * Hash.SAMPLE_SIZE / MB)
+        return read_mb * TaskCost.READ_PER_MB + TaskCost.inflate(file_desc, read_mb)
+
+    @staticmethod
+    def thumbnail(file_desc: FileDescription):
+        """
+        Thumbnail generated from the image (see GenerateThumbnail).
+        """
+        size_mb = TaskCost.get_size(file_desc) / MB
+        if file_desc.is_image():
+            return size_mb * TaskCost.DRAFT_DECODE_PER_MB + TaskCost.inflate(file_desc, size_mb)
+        return TaskCost.KEYFRAME + TaskCost.inflate(file_desc, size_mb)
+
+    @staticmethod
+    def inflate(file_desc: FileDescription, size_mb):
+        if isinstance(file_desc, ZipFileDescription):
+            return size_mb * TaskCost.INFLATE_PER_MB
+        return 0.0
@@ -1,3 +1,4 @@
+from contextlib import nullcontext
 from datetime import datetime
 from pathlib import Path
 
@@ -6,9 +7,11 @@ from PIL import Image, ImageDraw, ImageOps
 
 class CFMImage:
 
-    def __init__(self, file, filename):
+    def __init__(self, file, filename, draft_size=None):
         self.filename = filename
         self.file = file
+        # JPEG images are decoded at a reduced scale, to the smallest size larger than draft_size
+        self.draft_size = draft_size
         self.image_data: Image.Image = None
         self.model = None
         self.date = None
@@ -24,17 +27,20 @@ class CFMImage:
         if self.image_data is not None:
             self.image_data.close()
 
-    def get_bytes(self):
-        if isinstance(self.file, (bytes, str, Path)):
-            with open(self.filename) as file:
-                return file.read()
-        else:
-            self.file.seek(0, 0)
-            return self.file.read()
+    def open(self):
+        """
+        Returns the image file opened in binary mode, at its beginning. File objects are not closed on exit.
+        """
+        if isinstance(self.file, (str, Path)):
+            return open(self.file, "rb")
+        self.file.seek(0, 0)
+        return nullcontext(self.file)
 
     def read_image(self):
         try:
             self.image_data: Image = Image.open(self.file)
+            if self.draft_size is not None:
+                self.image_data.draft("RGB", self.draft_size)
             self.get_metadata_with_pil()
             self.rotate_if_necessary()
             self.width, self.height = self.image_data.size
@@ -2,7 +2,10 @@ import hashlib
 import logging
 
 import dhash
+from PIL import Image
 
+from camerafile.core.Configuration import Configuration
+from camerafile.core.Constants import DRAFT_DHASH, KEYFRAME_DHASH, FILE_SIZE
 from camerafile.tools.CFMImage import CFMImage
 
 LOGGER = logging.getLogger(__name__)
@@ -11,6 +14,19 @@ LOGGER = logging.getLogger(__name__)
 class Hash:
     image_hash_lib = None
 
+    # Size requested to CFMImage by DRAFT_DHASH: JPEG images are decoded at the smallest DCT scale (1/2, 1/4, 1/8)
+    # that is not smaller, i.e. at 1/8 as soon as they are 512 pixels large, which is still much more than the 9x8
+    # pixels used by dhash.
+    DRAFT_SIZE = (64, 64)
+
+    # Files are hashed by chunks, so that they are never loaded in memory as a whole
+    CHUNK_SIZE = 1024 * 1024
+    # Size of the head, middle and tail of large files that are hashed by CONTENT_MD5
+    SAMPLE_SIZE = 1024 * 1024
+    # Position of the frame of videos hashed by KEYFRAME_DHASH, relative to their number of frames (the first
+    # frames are often black or blurred)
+    KEYFRAME_POSITION = 0.1
+
     # Before, imagehash.phash was used but:
     # - imagehash depends on numpy/scipy that are big libraries (in size in the final package)
     # - As we only use this hash to compare images that have a same date, it is not necessary to have a very
@@ -24,5 +40,78 @@ class Hash:
             return dhash.dhash_int(cfm_image.image_data)
         except BaseException as e:
             LOGGER.debug("image_hash: %s / %s", str(e), cfm_image.filename)
-            md5_hash = hashlib.md5(cfm_image.get_bytes()).hexdigest()
-            return int(md5_hash, 16)
+            with cfm_image.open() as file:
+                return Hash.content_hash(file)
+
+    @staticmethod
+    def content_hash(file, size=None, sample_size=None) -> int:
+        """
+        Returns the md5 of the content of a binary file object, read by chunks, as an integer.
+        If sample_size is given and the file is larger than 3 samples, only its head, its middle and its tail are
+        read (sample_size bytes each), and hashed with its size.
+        """
+        md5 = hashlib.md5()
+        if sample_size is not None and size is not None and size > 3 * sample_size:
+            md5.update(size.to_bytes(8, "little"))
+            for offset in (0, (size - sample_size) // 2, size - sample_size):
+                file.seek(offset)
+                Hash.update_hash(md5, file, sample_size)
+        else:
+            Hash.update_hash(md5, file)
+        return int(md5.hexdigest(), 16)
+
+    @staticmethod
+    def update_hash(md5, file, length=None):
+        while length is None or length > 0:
+            chunk = file.read(Hash.CHUNK_SIZE if length is None else min(Hash.CHUNK_SIZE, length))
+            if not chunk:
+                break
+            md5.update(chunk)
+            if length is not None:
+                length -= len(chunk)
+
+    @staticmethod
+    def file_hash(file_access):
+        """
+        Signature of files that are not images, according to the file signature algorithm: their size (FILE_SIZE),
+        dhash of a frame of videos (KEYFRAME_DHASH), or sampled md5 of their content (CONTENT_MD5, and videos without
+        decodable frame).
+        """
+        if Configuration.get().file_signature_algorithm == FILE_SIZE:
+            return file_access.get_file_size()
+        if Configuration.get().file_signature_algorithm == KEYFRAME_DHASH and file_access.is_video():
+            keyframe_hash = Hash.keyframe_hash(file_access)
+            if keyframe_hash is not None:
+                return keyframe_hash
+        with file_access.open() as file:
+            return Hash.content_hash(file, file_access.get_file_size(), Hash.SAMPLE_SIZE)
+
+    @staticmethod
+    def keyframe_hash(file_access):
+        """
+        Returns the dhash of the frame of a video at KEYFRAME_POSITION, or None if it cannot be decoded.
+        """
+        # OpenCV is only needed by KEYFRAME_DHASH
+        import cv2
+        with file_access.local_path() as path:
+            video_capture = cv2.VideoCapture(path)
+            try:
+                frame_count = int(video_capture.get(cv2.CAP_PROP_FRAME_COUNT))
+                if frame_count > 0:
+                    video_capture.set(cv2.CAP_PROP_POS_FRAMES, int(frame_count * Hash.KEYFRAME_POSITION))
+                result, frame = video_capture.read()
+            finally:
+                video_capture.release()
+        if not result:
+            LOGGER.debug("keyframe_hash: no frame decoded / %s", file_access.file_desc.name)
+            return None
+        return dhash.dhash_int(Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)))
+
+    @staticmethod
+    def get_draft_size():
+        """
+        Returns the draft size to pass to CFMImage, according to the signature algorithm (None: full decoding).
+        """
+        if Configuration.get().signature_algorithm == DRAFT_DHASH:
+            return Hash.DRAFT_SIZE
+        return None
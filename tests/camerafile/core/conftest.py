@@ -0,0 +1,19 @@
+import pytest
+
+
+@pytest.fixture
+def make_media_tree(tmp_path):
+    def make(nb_files=3):
+        root = tmp_path / "media_set"
+        for dir_name in ["2020", "2021", "2021/summer"]:
+            (root / dir_name).mkdir(parents=True)
+            for i in range(nb_files):
+                (root / dir_name / f"photo{i}.jpg").write_bytes(b"\xff\xd8\xff\xe0" + dir_name.encode() + bytes([i]))
+        return root
+
+    return make
+
+
+@pytest.fixture
+def media_tree(make_media_tree):
+    return make_media_tree()
@@ -0,0 +1,42 @@
+import hashlib
+import pickle
+
+from camerafile.core.Constants import INTERNAL, SIGNATURE, FACES
+from camerafile.core.MediaFile import MediaFile
+from camerafile.fileaccess.StandardFileDescription import StandardFileDescription
+from camerafile.fileaccess.ZipFileDescription import ZipFileDescription
+
+
+def test_file_description_is_computed_from_relative_path():
+    file_desc = StandardFileDescription("2021/summer/IMG_0001.JPG", 10)
+
+    assert file_desc.name == "IMG_0001.JPG"
+    assert file_desc.extension == ".jpg"
+    assert file_desc.get_hex_id() == hashlib.md5(b"2021/summer/IMG_0001.JPG").hexdigest()
+    assert StandardFileDescription("").name == ""
+    zip_file_desc = ZipFileDescription("archive.zip", "dir/photo.jpg")
+    assert zip_file_desc.relative_path == "archive.zip/dir/photo.jpg"
+    assert zip_file_desc.name == "photo.jpg"
+
+
+def test_metadata_are_created_on_first_access():
+    media_file = MediaFile(StandardFileDescription("photo.jpg"), None, None)
+
+    assert media_file.get_exif_date() is None
+    assert media_file.get_signature() is None
+    assert media_file.metadata.metadata_list == {}
+    media_file.metadata[SIGNATURE].value = 12
+    assert list(media_file.metadata.metadata_list) == [SIGNATURE]
+    assert media_file.metadata[FACES].value is None
+
+
+def test_media_file_can_be_pickled():
+    media_file = MediaFile(StandardFileDescription("dir/photo.jpg", 10, 20), None, None)
+    media_file.metadata[INTERNAL].value = {"date": "2021/01/01 00:00:00"}
+
+    loaded = pickle.loads(pickle.dumps(media_file))
+
+    assert loaded.file_desc.id == media_file.file_desc.id
+    assert loaded.file_desc.system_id == 20
+    assert loaded.metadata[INTERNAL].value == {"date": "2021/01/01 00:00:00"}
+    assert loaded.metadata[INTERNAL].change_id == media_file.metadata[INTERNAL].change_id
@@ -0,0 +1,127 @@
+import os
+import time
+
+import pytest
+
+from camerafile.core import DirectoryWalker, FileScanner
+from camerafile.core.MediaSet import MediaSet
+from camerafile.core.MediaSetInitializer import MediaSetInitializer
+
+
+def set_old_mtime(path, delta=0):
+    old_time = time.time() - 3600 + delta
+    os.utime(path, (old_time, old_time))
+
+
+@pytest.fixture
+def media_tree(make_media_tree):
+    root = make_media_tree(nb_files=2)
+    (root / ".cfm").mkdir()
+    for dir_path in [root, root / ".cfm", root / "2020", root / "2021", root / "2021" / "summer"]:
+        set_old_mtime(dir_path)
+    return root
+
+
+@pytest.fixture
+def listed_dirs(monkeypatch):
+    listed = []
+    original_scandir = os.scandir
+
+    def recording_scandir(path):
+        listed.append(os.path.basename(path))
+        return original_scandir(path)
+
+    monkeypatch.setattr(DirectoryWalker.os, "scandir", recording_scandir)
+    return listed
+
+
+@pytest.fixture
+def summaries(monkeypatch):
+    ended = []
+    original_end_logging = FileScanner.FilesSummary.end_logging
+
+    def recording_end_logging(files_summary):
+        ended.append((files_summary.all, files_summary.standard, files_summary.managed, files_summary.size))
+        original_end_logging(files_summary)
+
+    monkeypatch.setattr(FileScanner.FilesSummary, "end_logging", recording_end_logging)
+    return ended
+
+
+def read_ignored_files(media_tree):
+    return sorted((media_tree / ".cfm" / "ignored-files.json").read_text().splitlines())
+
+
+def test_unchanged_directories_are_not_listed_again(media_tree, listed_dirs):
+    media_set = MediaSet(str(media_tree))
+    assert len(media_set) == 6
+    assert sorted(listed_dirs) == sorted(["media_set", ".cfm", "2020", "2021", "summer"])
+
+    listed_dirs.clear()
+    MediaSetInitializer.initialize(media_set)
+
+    assert listed_dirs == []
+    assert len(media_set) == 6
+    assert all(media_file.exists for media_file in media_set)
+
+
+def test_modified_directories_are_listed_again(media_tree, listed_dirs):
+    media_set = MediaSet(str(media_tree))
+
+    os.remove(media_tree / "2020" / "photo0.jpg")
+    set_old_mtime(media_tree / "2020", delta=10)
+    (media_tree / "2021" / "summer" / "photo2.jpg").write_bytes(b"\xff\xd8\xff\xe0new")
+    set_old_mtime(media_tree / "2021" / "summer", delta=10)
+
+    listed_dirs.clear()
+    MediaSetInitializer.initialize(media_set)
+
+    assert sorted(listed_dirs) == sorted(["2020", "summer"])
+    paths = sorted(media_file.get_path() for media_file in media_set)
+    assert "2020/photo0.jpg" not in paths
+    assert "2021/summer/photo2.jpg" in paths
+    assert len(paths) == 6
+
+
+def test_full_scan_lists_all_directories(media_tree, listed_dirs):
+    from camerafile.core.Configuration import Configuration
+
+    media_set = MediaSet(str(media_tree))
+    listed_dirs.clear()
+    Configuration.get().full_scan = True
+    try:
+        MediaSetInitializer.initialize(media_set)
+    finally:
+        Configuration.get().full_scan = False
+
+    assert len(listed_dirs) == 5
+    assert len(media_set) == 6
+
+
+def test_ignored_files_are_reported_by_incremental_scan(media_tree, listed_dirs, summaries):
+    (media_tree / "2020" / "notes.txt").write_text("notes")
+    (media_tree / "2021" / "summer" / "notes.txt").write_text("notes")
+    for dir_path in [media_tree / "2020", media_tree / "2021" / "summer"]:
+        set_old_mtime(dir_path)
+    media_set = MediaSet(str(media_tree))
+    full_scan_ignored = read_ignored_files(media_tree)
+    (media_tree / ".cfm" / "ignored-files.json").unlink()
+
+    listed_dirs.clear()
+    MediaSetInitializer.initialize(media_set)
+
+    assert "2020" not in listed_dirs and "summer" not in listed_dirs
+    assert read_ignored_files(media_tree) == full_scan_ignored
+    assert summaries[1] == summaries[0]
+
+
+def test_known_files_without_system_id_are_listed_again(media_tree, listed_dirs):
+    media_set = MediaSet(str(media_tree))
+    media_file = next(media_file for media_file in media_set if media_file.get_path() == "2020/photo0.jpg")
+    media_file.file_desc.system_id = None
+
+    listed_dirs.clear()
+    MediaSetInitializer.initialize(media_set)
+
+    assert listed_dirs == ["2020"]
+    assert media_file.file_desc.system_id is not None
@@ -88,3 +88,64 @@ class TestFileScanner:
         assert isinstance(new_files, dict)
         assert len(new_dirs) == 0
         assert isinstance(new_dirs, dict)
+
+    # Parallel and sequential walks produce the same maps, in the same order
+    @pytest.mark.parametrize("nb_threads", [1, 4])
+    def test_parallel_scan_matches_sequential_scan(self, tmp_path, nb_threads):
+        # Given
+        from camerafile.core.FileScanner import FileScanner
+
+        root_dir = tmp_path / "test_dir"
+        (root_dir / ".cfm").mkdir(parents=True)
+        for i in range(5):
+            sub_dir = root_dir / f"dir{i}" / "nested"
+            sub_dir.mkdir(parents=True)
+            (sub_dir.parent / f"image{i}.jpg").write_text(f"image {i}")
+            (sub_dir / f"video{i}.mp4").write_text(f"video {i}")
+            (sub_dir / "notes.txt").write_text("not a media file")
+
+        class MockState:
+            def should_be_ignored(self, file_path):
+                return False
+
+        # When
+        expected_files, expected_dirs = FileScanner.update_from_disk(root_dir, MockState(), {}, nb_threads=0)
+        new_files, new_dirs = FileScanner.update_from_disk(root_dir, MockState(), {}, nb_threads=nb_threads)
+
+        # Then
+        assert list(new_files) == list(expected_files)
+        assert list(new_dirs) == list(expected_dirs)
+        assert len(new_files) == 10
+        assert len(new_dirs) == 11
+        for relative_path, file_desc in new_files.items():
+            assert file_desc.file_size == (root_dir / relative_path).stat().st_size
+            assert file_desc.system_id is not None
+
+    # Already known entries are not returned again, but are marked as existing
+    def test_known_entries_are_marked_as_existing(self, tmp_path):
+        # Given
+        from camerafile.core.FileScanner import FileScanner
+
+        root_dir = tmp_path / "test_dir"
+        (root_dir / "sub_dir").mkdir(parents=True)
+        (root_dir / "sub_dir" / "known.jpg").write_text("known")
+        (root_dir / "sub_dir" / "new.jpg").write_text("new")
+
+        class KnownEntry:
+            def __init__(self, file_size):
+                self.exists = False
+                self.file_desc = type('desc', (), {'system_id': 1, 'file_size': file_size})()
+
+        class MockState:
+            def should_be_ignored(self, file_path):
+                return False
+
+        filename_map = {"sub_dir": KnownEntry(0), "sub_dir/known.jpg": KnownEntry(5)}
+
+        # When
+        new_files, new_dirs = FileScanner.update_from_disk(root_dir, MockState(), filename_map, nb_threads=2)
+
+        # Then
+        assert list(new_files) == ["sub_dir/new.jpg"]
+        assert len(new_dirs) == 0
+        assert all(entry.exists for entry in filename_map.values())
@@ -37,6 +37,9 @@ class FakeIndexManager:
         # For testing propagation methods, just record the media file was re-indexed.
         self.reindexed.append(media_file)
 
+    def add_media_files(self, media_files: List[DummyMediaFile]) -> None:
+        self.reindexed.extend(media_files)
+
 # Dummy media set to wrap FakeIndexManager as its indexer.
 class DummyMediaSet:
     def __init__(self, fake_index: FakeIndexManager):
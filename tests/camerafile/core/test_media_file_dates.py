@@ -0,0 +1,34 @@
+from datetime import datetime
+
+from camerafile.core.Constants import INTERNAL
+from camerafile.core.MediaFile import MediaFile
+from camerafile.fileaccess.StandardFileDescription import StandardFileDescription
+from camerafile.mdtools.MdConstants import MetadataNames
+from camerafile.metadata.Metadata import Metadata
+
+
+def create_media_file(date, modification_date=None):
+    media_file = MediaFile(StandardFileDescription("photo.jpg"), None, None)
+    media_file.metadata[INTERNAL].value = {MetadataNames.CREATION_DATE.value: date,
+                                           MetadataNames.MODIFICATION_DATE.value: modification_date}
+    return media_file
+
+
+def test_dates_are_parsed_once():
+    media_file = create_media_file("2021/07/14 10:00:00.000250", "1969/12/31 23:59:59.500000")
+    assert media_file.get_date() == datetime(2021, 7, 14, 10, 0, 0, 250)
+    assert media_file.get_last_modification_date() == datetime(1969, 12, 31, 23, 59, 59, 500000)
+    assert media_file.get_date_timestamp() == Metadata.to_timestamp(datetime(2021, 7, 14, 10, 0, 0, 250))
+    assert media_file.get_last_modification_timestamp() == -500000
+    assert media_file.metadata[INTERNAL].timestamps is not None
+
+
+def test_parsed_dates_are_updated_with_the_internal_metadata():
+    media_file = create_media_file("2021/07/14 10:00:00.000000")
+    assert media_file.get_date() == datetime(2021, 7, 14, 10)
+    media_file.metadata[INTERNAL].value = {MetadataNames.CREATION_DATE.value: "2022/01/01 00:00:00.000000"}
+    assert media_file.get_date() == datetime(2022, 1, 1)
+    assert media_file.get_last_modification_date() is None
+    media_file.metadata[INTERNAL].value = None
+    assert media_file.get_date() is None
+    assert media_file.get_date_timestamp() is None
@@ -0,0 +1,62 @@
+
+from camerafile.core.Constants import INTERNAL, SIGNATURE
+from camerafile.core.MediaSet import MediaSet
+from camerafile.core.MediaSetCache import MediaSetCache
+from camerafile.core.OutputDirectory import OutputDirectory
+from camerafile.mdtools.MdConstants import MetadataNames
+
+
+def save_with_metadata(root):
+    media_set = MediaSet(str(root))
+    for i, media_file in enumerate(media_set):
+        media_file.metadata[INTERNAL].value = {MetadataNames.CREATION_DATE.value: "2021/07/14 10:00:00",
+                                               MetadataNames.MODEL.value: f"model{i % 2}"}
+        media_file.metadata[SIGNATURE].value = 1000 + i
+        media_set.indexer.add_media_file(media_file)
+    media_set.save_on_disk()
+    return media_set
+
+
+def test_media_set_is_restored_from_cache(media_tree, monkeypatch):
+    monkeypatch.setattr(MediaSetCache, "CHUNK_SIZE", 4)
+    saved = save_with_metadata(media_tree)
+
+    loaded = MediaSet.load_media_set(str(media_tree))
+
+    assert loaded is not saved
+    assert sorted(loaded.filename_map) == sorted(saved.filename_map)
+    assert sorted(loaded.id_map) == sorted(saved.id_map)
+    for media_file in saved:
+        loaded_file = loaded.filename_map[media_file.get_path()]
+        assert loaded_file.file_desc.file_size == media_file.file_desc.file_size
+        assert loaded_file.file_desc.system_id == media_file.file_desc.system_id
+        assert loaded_file.metadata[INTERNAL].value == media_file.metadata[INTERNAL].value
+        assert loaded_file.metadata[SIGNATURE].value == media_file.metadata[SIGNATURE].value
+        assert loaded_file.parent_dir.file_desc.relative_path == media_file.parent_dir.file_desc.relative_path
+        assert loaded_file in loaded_file.parent_dir.children_files
+    assert loaded.media_dir_list[""] is loaded.media_dir_list["."]
+    assert sorted(d.file_desc.name for d in loaded.media_dir_list["2021"].children_dirs) == ["summer"]
+    assert loaded.indexer.date_sig_map.keys() == saved.indexer.date_sig_map.keys()
+    for date, sig_map in saved.indexer.date_sig_map.items():
+        assert sorted(loaded.indexer.date_sig_map[date]) == sorted(sig_map)
+
+
+def test_invalid_cache_is_ignored(media_tree):
+    save_with_metadata(media_tree)
+    cache = MediaSetCache.get(OutputDirectory.get(MediaSet(str(media_tree), initialize=False).root_path))
+    content = cache.cache_file.read_bytes()
+    cache.cache_file.write_bytes(content[:-10])
+
+    assert not cache.load(MediaSet(str(media_tree), initialize=False))
+    loaded = MediaSet.load_media_set(str(media_tree))
+    assert len(loaded) == 9
+    assert all(media_file.metadata[SIGNATURE].value is None for media_file in loaded)
+
+
+def test_cache_with_another_version_is_ignored(media_tree, monkeypatch):
+    save_with_metadata(media_tree)
+    monkeypatch.setattr(MediaSetCache, "SCHEMA_VERSION", MediaSetCache.SCHEMA_VERSION + 1)
+
+    loaded = MediaSet.load_media_set(str(media_tree))
+    assert len(loaded) == 9
+    assert all(media_file.metadata[INTERNAL].value is None for media_file in loaded)
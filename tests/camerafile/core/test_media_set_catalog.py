@@ -0,0 +1,79 @@
+import sqlite3
+
+import pytest
+
+from camerafile.core.Configuration import Configuration
+from camerafile.core.Constants import INTERNAL, SIGNATURE, ORIGINAL_COPY_PATH
+from camerafile.core.MediaSet import MediaSet
+from camerafile.core.MediaSetCatalog import MediaSetCatalog
+from camerafile.core.OutputDirectory import OutputDirectory
+from camerafile.mdtools.MdConstants import MetadataNames
+
+
+@pytest.fixture
+def media_tree(media_tree, monkeypatch):
+    monkeypatch.setattr(Configuration.get(), "catalog", True)
+    return media_tree
+
+
+def get_catalog(root):
+    return MediaSetCatalog.get(OutputDirectory.get(MediaSet(str(root), initialize=False).root_path))
+
+
+def test_media_set_is_restored_from_catalog(media_tree):
+    saved = MediaSet(str(media_tree))
+    for i, media_file in enumerate(saved):
+        media_file.metadata[INTERNAL].value = {MetadataNames.CREATION_DATE.value: "2021/07/14 10:00:00"}
+        media_file.metadata[SIGNATURE].value = 2 ** 100 + i
+        saved.indexer.add_media_file(media_file)
+    saved.filename_map["2020/photo0.jpg"].metadata[ORIGINAL_COPY_PATH].value = "elsewhere/photo0.jpg"
+    saved.save_on_disk()
+
+    loaded = MediaSet.load_media_set(str(media_tree))
+
+    assert sorted(loaded.filename_map) == sorted(saved.filename_map)
+    for media_file in saved:
+        loaded_file = loaded.filename_map[media_file.get_path()]
+        assert loaded_file.file_desc.system_id == media_file.file_desc.system_id
+        assert loaded_file.metadata[INTERNAL].value == media_file.metadata[INTERNAL].value
+        assert loaded_file.metadata[SIGNATURE].value == media_file.metadata[SIGNATURE].value
+        assert loaded_file.parent_dir.file_desc.relative_path == media_file.parent_dir.file_desc.relative_path
+    assert loaded.filename_map["2020/photo0.jpg"].metadata[ORIGINAL_COPY_PATH].value == "elsewhere/photo0.jpg"
+    assert loaded.indexer.date_sig_map.keys() == saved.indexer.date_sig_map.keys()
+
+
+def test_only_modified_rows_are_written(media_tree):
+    MediaSet(str(media_tree)).save_on_disk()
+    catalog = get_catalog(media_tree)
+
+    media_set = MediaSet.load_media_set(str(media_tree))
+    assert catalog.save(media_set) == 0
+
+    media_set.filename_map["2021/photo1.jpg"].metadata[SIGNATURE].value = 123
+    media_set.unregister_file(media_set.filename_map["2020/photo2.jpg"])
+    assert catalog.save(media_set) == 1
+
+    with sqlite3.connect(catalog.catalog_file) as connection:
+        assert connection.execute("SELECT COUNT(*) FROM files").fetchone()[0] == 8
+        assert connection.execute("SELECT path FROM signatures").fetchall() == [("2021/photo1.jpg",)]
+
+
+def test_media_set_is_migrated_from_catalog_to_cache(media_tree, monkeypatch):
+    saved = MediaSet(str(media_tree))
+    for i, media_file in enumerate(saved):
+        media_file.metadata[SIGNATURE].value = 2 ** 100 + i
+    saved.save_on_disk()
+    signatures = {media_file.get_path(): media_file.get_signature() for media_file in saved}
+    # Next execution, without --catalog
+    monkeypatch.setattr(Configuration.get(), "catalog", False)
+    catalog = get_catalog(media_tree)
+    monkeypatch.setattr(catalog, "is_active", False)
+
+    loaded = MediaSet.load_media_set(str(media_tree))
+    assert {media_file.get_path(): media_file.get_signature() for media_file in loaded} == signatures
+    assert list(loaded.iter_dirty()) == []
+    loaded.save_on_disk()
+    assert not catalog.exists()
+
+    reloaded = MediaSet.load_media_set(str(media_tree))
+    assert {media_file.get_path(): media_file.get_signature() for media_file in reloaded} == signatures
@@ -0,0 +1,57 @@
+import pytest
+
+from camerafile.core.Constants import INTERNAL, SIGNATURE, THUMBNAIL
+from camerafile.core.MediaSet import MediaSet
+
+
+@pytest.fixture
+def media_set(tmp_path):
+    root = tmp_path / "media_set"
+    (root / "dir").mkdir(parents=True)
+    for i in range(4):
+        (root / "dir" / f"photo{i}.jpg").write_bytes(b"\xff\xd8\xff\xe0" + bytes([i]))
+    MediaSet(str(root)).save_on_disk()
+    return MediaSet.load_media_set(str(root))
+
+
+def dirty_paths(media_set):
+    return sorted(media_file.get_path() for media_file in media_set.iter_dirty())
+
+
+def test_loaded_media_set_has_no_changes(media_set):
+    assert dirty_paths(media_set) == []
+    assert not media_set.has_changes()
+
+
+def test_modified_media_files_are_dirty(media_set):
+    media_set.filename_map["dir/photo0.jpg"].metadata[SIGNATURE].value = 12
+    media_set.filename_map["dir/photo1.jpg"].metadata[THUMBNAIL].binary_value = b"thumbnail"
+    media_set.indexer.add_media_file(media_set.filename_map["dir/photo2.jpg"])
+    media_set.filename_map["dir/photo3.jpg"].file_desc.update_relative_path("dir/renamed.jpg")
+
+    assert dirty_paths(media_set) == ["dir/photo0.jpg", "dir/photo1.jpg", "dir/photo2.jpg", "dir/renamed.jpg"]
+
+    media_set.save_on_disk()
+    assert dirty_paths(media_set) == []
+
+
+def test_removed_media_file_is_a_change(media_set):
+    media_set.unregister_file(media_set.filename_map["dir/photo0.jpg"])
+    assert dirty_paths(media_set) == []
+    assert media_set.has_changes()
+
+
+def test_shared_metadata_is_dirty_in_both_media_sets(media_set, tmp_path):
+    (tmp_path / "other").mkdir()
+    (tmp_path / "other" / "photo.jpg").write_bytes(b"\xff\xd8\xff\xe0")
+    other_media_set = MediaSet(str(tmp_path / "other"))
+    other_media_set.save_on_disk()
+    media_file = media_set.filename_map["dir/photo0.jpg"]
+    other_media_file = other_media_set.filename_map["photo.jpg"]
+    other_media_file.metadata[INTERNAL] = media_file.metadata[INTERNAL]
+    other_media_set.save_on_disk()
+
+    media_file.metadata[INTERNAL].value = {"date": "2021/01/01 00:00:00"}
+
+    assert dirty_paths(media_set) == ["dir/photo0.jpg"]
+    assert dirty_paths(other_media_set) == ["photo.jpg"]
@@ -62,7 +62,7 @@ def test_move_to_trash(test_environment):
     initial_dir_count = len(media_set.media_dir_list)
     initial_id_map_size = len(media_set.id_map)
     initial_filename_map_size = len(media_set.filename_map)
-    original_parent_dir_id = media_file.parent_dir.file_desc.id  # Capture the original parent directory ID
+    original_parent_dir_id = media_file.parent_dir.file_desc.get_hex_id()  # Capture the original parent directory ID
     
     # Move file to trash
     assert media_set.move_to_trash(media_file)
@@ -0,0 +1,37 @@
+import pickle
+
+import pytest
+
+from camerafile.core.OrderedSet import OrderedSet
+
+
+def test_items_keep_their_insertion_order():
+    items = OrderedSet(["c", "a"])
+    items.add("b")
+    items.append("a")
+    assert list(items) == ["c", "a", "b"]
+    assert items[0] == "c"
+    assert items[::-1] == ["b", "a", "c"]
+    assert items == ["c", "a", "b"]
+
+
+def test_removed_items_are_not_found():
+    items = OrderedSet(["a", "b", "c"])
+    items.remove("b")
+    items.discard("b")
+    assert "b" not in items
+    assert list(items) == ["a", "c"]
+    with pytest.raises(ValueError):
+        items.remove("b")
+    items.discard("a")
+    items.discard("c")
+    assert not items
+    with pytest.raises(IndexError):
+        _ = items[0]
+
+
+def test_items_can_be_sorted_and_pickled():
+    items = OrderedSet([3, 1, 2])
+    items.sort(reverse=True)
+    assert list(items) == [3, 2, 1]
+    assert pickle.loads(pickle.dumps(items)) == items
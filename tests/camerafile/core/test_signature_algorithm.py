@@ -0,0 +1,184 @@
+import hashlib
+import random
+import zipfile
+
+import cv2
+import dhash
+import numpy
+import pytest
+from PIL import Image
+
+from camerafile.core.Configuration import Configuration
+from camerafile.core.Constants import SIGNATURE, DHASH, DRAFT_DHASH, FILE_SIZE, CONTENT_MD5, KEYFRAME_DHASH
+from camerafile.core.MediaSet import MediaSet
+from camerafile.fileaccess.StandardFileAccess import StandardFileAccess
+from camerafile.fileaccess.StandardFileDescription import StandardFileDescription
+from camerafile.fileaccess.ZipFileAccess import ZipFileAccess
+from camerafile.fileaccess.ZipFileDescription import ZipFileDescription
+from camerafile.tools.Hash import Hash
+
+SIGNATURES = {"photo0.jpg": 1000, "photo1.jpg": 1001, "video.mp4": 1002}
+
+
+@pytest.fixture
+def media_tree(tmp_path):
+    root = tmp_path / "media_set"
+    root.mkdir()
+    for name in SIGNATURES:
+        (root / name).write_bytes(name.encode())
+    return root
+
+
+def save_media_set_with_signatures(root):
+    media_set = MediaSet(str(root))
+    for name, signature in SIGNATURES.items():
+        media_file = media_set.filename_map[name]
+        media_file.metadata[SIGNATURE].value = signature
+        media_set.indexer.add_media_file(media_file)
+    media_set.save_on_disk()
+
+
+def test_signatures_of_images_are_removed_when_the_algorithm_changes(media_tree, monkeypatch):
+    monkeypatch.setattr(Configuration.get(), "signature_algorithm", DHASH)
+    save_media_set_with_signatures(media_tree)
+
+    monkeypatch.setattr(Configuration.get(), "signature_algorithm", DRAFT_DHASH)
+    media_set = MediaSet.load_media_set(str(media_tree))
+
+    assert media_set.filename_map["photo0.jpg"].get_signature() is None
+    assert media_set.filename_map["photo1.jpg"].get_signature() is None
+    # Signatures of videos do not depend on the algorithm
+    assert media_set.filename_map["video.mp4"].get_signature() == 1002
+
+    media_set.save_on_disk()
+    assert media_set.state.get_signature_algorithms() == (DRAFT_DHASH, FILE_SIZE)
+
+
+def test_signatures_are_kept_with_the_same_algorithm(media_tree, monkeypatch):
+    monkeypatch.setattr(Configuration.get(), "signature_algorithm", DRAFT_DHASH)
+    save_media_set_with_signatures(media_tree)
+
+    media_set = MediaSet.load_media_set(str(media_tree))
+
+    assert {name: media_set.filename_map[name].get_signature() for name in SIGNATURES} == SIGNATURES
+
+
+def test_signatures_of_other_files_computed_from_their_size_are_removed(media_tree, monkeypatch):
+    monkeypatch.setattr(Configuration.get(), "signature_algorithm", DRAFT_DHASH)
+    monkeypatch.setattr(Configuration.get(), "file_signature_algorithm", CONTENT_MD5)
+    save_media_set_with_signatures(media_tree)
+    # State saved by an older version
+    state = MediaSet(str(media_tree), initialize=False).state
+    del state.state["file_signature_algorithm"]
+    state.save()
+
+    media_set = MediaSet.load_media_set(str(media_tree))
+
+    assert media_set.filename_map["photo0.jpg"].get_signature() == 1000
+    assert media_set.filename_map["video.mp4"].get_signature() is None
+
+
+def test_signatures_saved_by_older_versions_are_kept_by_default(media_tree, monkeypatch):
+    monkeypatch.setattr(Configuration.get(), "signature_algorithm", Configuration().signature_algorithm)
+    monkeypatch.setattr(Configuration.get(), "file_signature_algorithm", Configuration().file_signature_algorithm)
+    save_media_set_with_signatures(media_tree)
+    # State saved by an older version
+    state = MediaSet(str(media_tree), initialize=False).state
+    del state.state["signature_algorithm"]
+    del state.state["file_signature_algorithm"]
+    state.save()
+
+    media_set = MediaSet.load_media_set(str(media_tree))
+
+    assert {name: media_set.filename_map[name].get_signature() for name in SIGNATURES} == SIGNATURES
+
+
+def test_draft_signatures_are_close_to_full_ones(tmp_path, monkeypatch):
+    rnd = random.Random(0)
+    image = Image.new("RGB", (2400, 1800))
+    for x in range(0, 2400, 200):
+        for y in range(0, 1800, 200):
+            image.paste((rnd.randrange(256), rnd.randrange(256), rnd.randrange(256)), (x, y, x + 200, y + 200))
+    image.save(tmp_path / "image.jpg")
+    file_access = StandardFileAccess(str(tmp_path), StandardFileDescription("image.jpg"))
+
+    monkeypatch.setattr(Configuration.get(), "signature_algorithm", DHASH)
+    full_signature = file_access.hash()
+    monkeypatch.setattr(Configuration.get(), "signature_algorithm", DRAFT_DHASH)
+    draft_signature = file_access.hash()
+
+    assert dhash.get_num_bits_different(full_signature, draft_signature) <= 4
+
+
+def test_large_files_are_hashed_by_samples(tmp_path, monkeypatch):
+    monkeypatch.setattr(Configuration.get(), "file_signature_algorithm", CONTENT_MD5)
+    content = bytearray(random.Random(0).randbytes(10 * Hash.SAMPLE_SIZE))
+    (tmp_path / "video.mp4").write_bytes(content)
+    file_access = StandardFileAccess(str(tmp_path), StandardFileDescription("video.mp4"))
+    signature = file_access.hash()
+
+    # Outside of the head, the middle and the tail
+    content[2 * Hash.SAMPLE_SIZE] ^= 0xFF
+    (tmp_path / "video.mp4").write_bytes(content)
+    assert StandardFileAccess(str(tmp_path), StandardFileDescription("video.mp4")).hash() == signature
+
+    content[5 * Hash.SAMPLE_SIZE] ^= 0xFF
+    (tmp_path / "video.mp4").write_bytes(content)
+    assert StandardFileAccess(str(tmp_path), StandardFileDescription("video.mp4")).hash() != signature
+
+    with zipfile.ZipFile(tmp_path / "archive.zip", "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.write(tmp_path / "video.mp4", "video.mp4")
+    zip_file_access = ZipFileAccess(str(tmp_path), ZipFileDescription("archive.zip", "video.mp4", None))
+    assert zip_file_access.hash() == StandardFileAccess(str(tmp_path), StandardFileDescription("video.mp4")).hash()
+
+
+def test_invalid_images_are_hashed_by_content(tmp_path):
+    content = b"\xff\xd8\xff\xe0" + random.Random(0).randbytes(3 * Hash.CHUNK_SIZE)
+    (tmp_path / "image.jpg").write_bytes(content)
+
+    signature = StandardFileAccess(str(tmp_path), StandardFileDescription("image.jpg")).hash()
+
+    assert signature == int(hashlib.md5(content).hexdigest(), 16)
+
+
+def create_video(path, size):
+    video_writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), 10, size)
+    for i in range(30):
+        frame = numpy.zeros((240, 320, 3), numpy.uint8)
+        frame[:, :160] = (i * 8, 100, 50)
+        frame[:120, 160:] = (200, i * 5, 30)
+        video_writer.write(cv2.resize(frame, size))
+    video_writer.release()
+
+
+def test_videos_encoded_differently_have_similar_keyframe_signatures(tmp_path, monkeypatch):
+    create_video(tmp_path / "video.mp4", (320, 240))
+    create_video(tmp_path / "video-hd.mp4", (960, 720))
+    with zipfile.ZipFile(tmp_path / "archive.zip", "w") as archive:
+        archive.write(tmp_path / "video.mp4", "dir/video.mp4")
+
+    def signatures():
+        return [StandardFileAccess(str(tmp_path), StandardFileDescription("video.mp4")).hash(),
+                StandardFileAccess(str(tmp_path), StandardFileDescription("video-hd.mp4")).hash(),
+                ZipFileAccess(str(tmp_path), ZipFileDescription("archive.zip", "dir/video.mp4", None)).hash()]
+
+    monkeypatch.setattr(Configuration.get(), "file_signature_algorithm", CONTENT_MD5)
+    content_signatures = signatures()
+    monkeypatch.setattr(Configuration.get(), "file_signature_algorithm", KEYFRAME_DHASH)
+    keyframe_signatures = signatures()
+
+    assert content_signatures[0] != content_signatures[1]
+    assert content_signatures[0] == content_signatures[2]
+    assert dhash.get_num_bits_different(keyframe_signatures[0], keyframe_signatures[1]) <= 3
+    assert keyframe_signatures[0] == keyframe_signatures[2]
+    assert keyframe_signatures[0] != content_signatures[0]
+
+
+def test_audio_files_are_hashed_by_content_with_keyframe_signatures(tmp_path, monkeypatch):
+    content = random.Random(0).randbytes(1000)
+    (tmp_path / "audio.mp3").write_bytes(content)
+    monkeypatch.setattr(Configuration.get(), "file_signature_algorithm", KEYFRAME_DHASH)
+
+    signature = StandardFileAccess(str(tmp_path), StandardFileDescription("audio.mp3")).hash()
+
+    assert signature == int(hashlib.md5(content).hexdigest(), 16)
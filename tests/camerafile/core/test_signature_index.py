@@ -0,0 +1,54 @@
+import pickle
+import random
+
+import dhash
+
+from camerafile.core.SignatureIndex import SignatureIndex
+
+
+def flip_bits(signature, nb_bits, rnd):
+    for bit in rnd.sample(range(128), nb_bits):
+        signature ^= 1 << bit
+    return signature
+
+
+def linear_find_similar(signatures, signature):
+    return [existing for existing in signatures if dhash.get_num_bits_different(signature, existing) < 4]
+
+
+def test_similar_signatures_are_the_same_as_with_a_linear_search():
+    rnd = random.Random(1)
+    index = SignatureIndex()
+    signatures = []
+    for i in range(300):
+        base = rnd.getrandbits(128)
+        for nb_bits in [0, 1, 3, 4, 6]:
+            signature = flip_bits(base, nb_bits, rnd)
+            if signature not in index:
+                index[signature] = [i]
+                signatures.append(signature)
+    signatures.append(1 << 200)
+    index[1 << 200] = []
+
+    for signature in signatures[::7] + [rnd.getrandbits(128) for _ in range(50)]:
+        assert index.find_similar(signature) == linear_find_similar(signatures, signature)
+        expected = linear_find_similar(signatures, signature)
+        assert index.find_first_similar(signature) == (expected[0] if expected else None)
+
+
+def test_removed_signatures_are_not_found():
+    index = SignatureIndex()
+    index[0b1111] = ["a"]
+    index[0b111] = ["b"]
+    del index[0b1111]
+    assert index.find_similar(0) == [0b111]
+    assert index.pop(0b111) == ["b"]
+    assert index.find_similar(0) == []
+    assert index.bands == [{}, {}, {}, {}]
+
+
+def test_index_can_be_pickled():
+    index = SignatureIndex({12: ["a"], 1 << 100: ["b"]})
+    loaded = pickle.loads(pickle.dumps(index))
+    assert loaded == index
+    assert loaded.find_similar((1 << 100) | 1) == [1 << 100]
@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from camerafile.core.MediaIndexer import MediaIndexer
+from camerafile.core.SignatureIndex import SignatureIndex
+from camerafile.core.SignatureMatrix import SignatureMatrix
+
+pytestmark = pytest.mark.skipif(not SignatureMatrix.is_available(), reason="NumPy is not installed")
+
+
+def create_signatures(nb_signatures, rnd):
+    signatures = []
+    while len(signatures) < nb_signatures:
+        base = rnd.getrandbits(128)
+        for nb_bits in [0, 0, 1, 3, 4, 6][:rnd.randint(1, 6)]:
+            signature = base
+            for bit in rnd.sample(range(128), nb_bits):
+                signature ^= 1 << bit
+            signatures.append(signature)
+    return signatures[:nb_signatures]
+
+
+def group_one_by_one(signatures, keys=()):
+    index = SignatureIndex({key: [] for key in keys})
+    groups = []
+    for signature in signatures:
+        group = index.find_first_similar(signature)
+        if group is None:
+            group = signature
+            index[signature] = []
+        groups.append(group)
+    return groups
+
+
+def test_groups_are_the_same_as_with_a_signature_index():
+    rnd = random.Random(2)
+    keys = create_signatures(200, rnd)
+    keys = list(SignatureIndex({key: [] for key in group_one_by_one(keys)}))
+    signatures = create_signatures(1000, rnd) + keys[::5] + [0, 0, 1, 7]
+    rnd.shuffle(signatures)
+
+    assert SignatureMatrix.group(signatures) == group_one_by_one(signatures)
+    assert SignatureMatrix.group(signatures, keys) == group_one_by_one(signatures, keys)
+
+
+def test_signatures_longer_than_128_bits_are_not_grouped():
+    assert SignatureMatrix.group([1 << 128, 1]) is None
+    assert SignatureMatrix.group([1], [-1]) is None
+
+
+class IndexedMediaFile:
+
+    def __init__(self, signature):
+        self.signature = signature
+        self.file_desc = self
+        self.system_id = None
+
+    def set_modified(self):
+        pass
+
+    def get_exif_date(self):
+        return "2021/07/14 10:00:00.000000"
+
+    def get_file_size(self):
+        return None
+
+    def get_signature(self):
+        return self.signature
+
+
+def test_media_files_indexed_in_bulk_are_indexed_as_one_by_one():
+    signatures = create_signatures(500, random.Random(3))
+    media_files = [IndexedMediaFile(signature) for signature in signatures]
+    one_by_one = MediaIndexer()
+    for media_file in media_files:
+        one_by_one.add_media_file(media_file)
+    in_bulk = MediaIndexer()
+    in_bulk.add_media_files(media_files[:100])
+    in_bulk.add_media_files(media_files[100:])
+
+    date = media_files[0].get_exif_date()
+    assert list(in_bulk.date_sig_map[date].items()) == list(one_by_one.date_sig_map[date].items())
@@ -0,0 +1,69 @@
+import os
+
+import pytest
+from pyzipper import zipfile
+
+from camerafile.fileaccess.ZipFileAccess import ZipFileAccess
+from camerafile.fileaccess.ZipFileDescription import ZipFileDescription
+
+
+def create_zip(path, nb_files, content=b"content"):
+    with zipfile.ZipFile(path, "w") as archive:
+        for i in range(nb_files):
+            archive.writestr(f"dir/file{i}.txt", content + str(i).encode())
+
+
+@pytest.fixture
+def opened_archives(monkeypatch):
+    opened = []
+    zip_file_class = zipfile.ZipFile
+
+    def open_zip_file(path, mode="r", *args, **kwargs):
+        if mode == "r":
+            opened.append(os.path.basename(path))
+        return zip_file_class(path, mode, *args, **kwargs)
+
+    monkeypatch.setattr(zipfile, "ZipFile", open_zip_file)
+    ZipFileAccess.close_archives()
+    yield opened
+    ZipFileAccess.close_archives()
+
+
+def test_archive_is_opened_once_for_all_its_files(tmp_path, opened_archives):
+    create_zip(tmp_path / "archive.zip", 20)
+
+    for i in range(20):
+        file_access = ZipFileAccess(str(tmp_path), ZipFileDescription("archive.zip", f"dir/file{i}.txt"))
+        assert file_access.get_file_size() == len(f"content{i}")
+        assert file_access.get_last_modification_date() is not None
+        with file_access.open() as file:
+            assert file.read() == f"content{i}".encode()
+
+    assert opened_archives == ["archive.zip"]
+
+
+def test_modified_archive_is_opened_again(tmp_path, opened_archives):
+    create_zip(tmp_path / "archive.zip", 1)
+    file_access = ZipFileAccess(str(tmp_path), ZipFileDescription("archive.zip", "dir/file0.txt"))
+    with file_access.open() as file:
+        assert file.read() == b"content0"
+
+    create_zip(tmp_path / "archive.zip", 1, b"new content")
+    stat = os.stat(tmp_path / "archive.zip")
+    os.utime(tmp_path / "archive.zip", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+    with file_access.open() as file:
+        assert file.read() == b"new content0"
+    assert opened_archives == ["archive.zip", "archive.zip"]
+
+
+def test_least_recently_used_archives_are_closed(tmp_path, opened_archives, monkeypatch):
+    monkeypatch.setattr(ZipFileAccess, "ARCHIVE_CACHE_SIZE", 2)
+    for name in ["a.zip", "b.zip", "c.zip"]:
+        create_zip(tmp_path / name, 1)
+
+    for name in ["a.zip", "b.zip", "a.zip", "c.zip", "a.zip", "b.zip"]:
+        ZipFileAccess(str(tmp_path), ZipFileDescription(name, "dir/file0.txt")).get_last_modification_date()
+
+    assert opened_archives == ["a.zip", "b.zip", "c.zip", "b.zip"]
+    assert len(ZipFileAccess.get_opened_archives()) == 2
@@ -0,0 +1,100 @@
+import os
+import sys
+import tempfile
+import zipfile
+
+import pytest
+
+from camerafile.core.Resource import Resource
+from camerafile.fileaccess.ZipFileAccess import ZipFileAccess
+from camerafile.fileaccess.ZipFileDescription import ZipFileDescription
+from camerafile.mdtools.ExifToolReader import ExifTool
+from camerafile.mdtools.MdConstants import MetadataNames
+from camerafile.mdtools.MdException import MdException
+
+# Fake exiftool -stay_open process: the model of each file is its content, and each command is logged
+FAKE_EXIF_TOOL = '''
+import json, os, sys
+log_path = sys.argv[0] + ".log"
+with open(log_path, "a") as log:
+    log.write("start\\n")
+args = []
+for line in sys.stdin:
+    arg = line.rstrip("\\n")
+    if arg == "-execute":
+        files = [a for a in args if not a.startswith("-") and not a.startswith("filename=")]
+        with open(log_path, "a") as log:
+            log.write("execute " + str(len(files)) + "\\n")
+        results = []
+        for file in files:
+            if os.path.exists(file):
+                with open(file) as f:
+                    results.append({"SourceFile": file, "Model": f.read()})
+            else:
+                sys.stderr.write("Error: File not found - " + file + "\\n")
+        if results:
+            sys.stdout.write(json.dumps(results) + "\\n")
+        sys.stdout.write("{ready}\\n")
+        sys.stdout.flush()
+        args = []
+    elif args[-1:] == ["-stay_open"] and arg == "False":
+        break
+    else:
+        args.append(arg)
+'''
+
+
+@pytest.fixture
+def exif_tool(tmp_path, monkeypatch):
+    script = tmp_path / "exiftool"
+    script.write_text("#!" + sys.executable + "\n" + FAKE_EXIF_TOOL)
+    script.chmod(0o755)
+    monkeypatch.setattr(Resource, "exiftool_executable", str(script))
+    yield tmp_path / "exiftool.log"
+    ExifTool.stop()
+
+
+def create_files(directory, nb_files):
+    files = []
+    for i in range(nb_files):
+        path = directory / f"video{i}.mp4"
+        path.write_text(f"model {i}")
+        files.append(str(path))
+    return files
+
+
+def test_metadata_of_many_files_are_read_with_few_commands(exif_tool, tmp_path, monkeypatch):
+    monkeypatch.setattr(ExifTool, "BATCH_SIZE", 4)
+    files = create_files(tmp_path, 6)
+
+    results = ExifTool.get_metadata_list(files + [str(tmp_path / "missing.mp4")], MetadataNames.MODEL)
+
+    assert results[:6] == [{MetadataNames.MODEL: f"model {i}"} for i in range(6)]
+    assert isinstance(results[6], MdException)
+    assert "missing.mp4" in str(results[6])
+    assert exif_tool.read_text().splitlines() == ["start", "execute 4", "execute 3"]
+
+
+def test_processes_are_reused_until_stopped(exif_tool, tmp_path):
+    files = create_files(tmp_path, 2)
+    assert ExifTool.get_metadata(files[0], MetadataNames.MODEL) == {MetadataNames.MODEL: "model 0"}
+    assert ExifTool.get_metadata(files[1], MetadataNames.MODEL) == {MetadataNames.MODEL: "model 1"}
+    with pytest.raises(MdException):
+        ExifTool.get_metadata(str(tmp_path / "missing.mp4"), MetadataNames.MODEL)
+    ExifTool.stop()
+    ExifTool.get_metadata(files[0], MetadataNames.MODEL)
+    assert exif_tool.read_text().splitlines() == ["start", "execute 1", "execute 1", "execute 1",
+                                                  "start", "execute 1"]
+
+
+def test_zipped_files_are_read_by_the_same_process(exif_tool, tmp_path):
+    with zipfile.ZipFile(tmp_path / "archive.zip", "w") as archive:
+        archive.writestr("dir/video.mp4", "zipped model")
+        archive.writestr("dir/other.mp4", "other zipped model")
+    for name, model in [("dir/video.mp4", "zipped model"), ("dir/other.mp4", "other zipped model")]:
+        file_access = ZipFileAccess(str(tmp_path), ZipFileDescription("archive.zip", name, None))
+        # Not valid videos for QuickTimeMdReader: they are read by ExifTool
+        assert file_access.read_md((MetadataNames.MODEL,)) == ("QuickTimeMdReader -> ExifTool",
+                                                               {MetadataNames.MODEL: model})
+    assert exif_tool.read_text().splitlines() == ["start", "execute 1", "execute 1"]
+    assert not [name for name in os.listdir(tempfile.gettempdir()) if name.startswith("cfm-exiftool-")]
@@ -0,0 +1,60 @@
+import os
+import random
+import zipfile
+from datetime import datetime
+
+import pytest
+from PIL import Image
+from pillow_heif import register_heif_opener
+
+from camerafile.fileaccess.StandardFileAccess import StandardFileAccess
+from camerafile.fileaccess.StandardFileDescription import StandardFileDescription
+from camerafile.fileaccess.ZipFileAccess import ZipFileAccess
+from camerafile.fileaccess.ZipFileDescription import ZipFileDescription
+from camerafile.mdtools.HEIFMdReader import HEIFMdReader
+from camerafile.mdtools.MdConstants import MetadataNames
+
+NEEDED_METADATA = (MetadataNames.CREATION_DATE, MetadataNames.MODEL, MetadataNames.ORIENTATION,
+                   MetadataNames.WIDTH, MetadataNames.HEIGHT)
+
+EXPECTED_METADATA = {MetadataNames.CREATION_DATE: datetime(2021, 7, 14, 10, 20, 30, 500000),
+                     MetadataNames.MODEL: "iPhone 12",
+                     MetadataNames.ORIENTATION: 6,
+                     MetadataNames.WIDTH: 640,
+                     MetadataNames.HEIGHT: 480}
+
+
+def create_heic(path, with_exif=True):
+    register_heif_opener()
+    image = Image.frombytes("RGB", (640, 480), random.Random(0).randbytes(640 * 480 * 3))
+    exif = Image.Exif()
+    exif[0x0110] = "iPhone 12"
+    exif[0x0112] = 6
+    exif_ifd = exif.get_ifd(0x8769)
+    exif_ifd[0x9003] = "2021:07:14 10:20:30"
+    exif_ifd[0x9291] = "5"
+    image.save(path, exif=exif.tobytes() if with_exif else None)
+
+
+def test_heic_images_are_read_without_exif_tool(tmp_path):
+    create_heic(tmp_path / "image.heic")
+    file_access = StandardFileAccess(str(tmp_path), StandardFileDescription("image.heic"))
+
+    assert file_access.read_md(NEEDED_METADATA) == ("HEIFMdReader", EXPECTED_METADATA)
+    # meta box and Exif item only
+    assert file_access.bytes_read < os.path.getsize(tmp_path / "image.heic") / 10
+
+
+def test_zipped_heic_images(tmp_path):
+    create_heic(tmp_path / "image.heic")
+    with zipfile.ZipFile(tmp_path / "archive.zip", "w") as archive:
+        archive.write(tmp_path / "image.heic", "dir/image.heic")
+    file_access = ZipFileAccess(str(tmp_path), ZipFileDescription("archive.zip", "dir/image.heic", None))
+
+    assert file_access.read_md(NEEDED_METADATA) == ("HEIFMdReader", EXPECTED_METADATA)
+
+
+def test_heic_images_without_exif_are_not_read(tmp_path):
+    create_heic(tmp_path / "image.heic", with_exif=False)
+    with pytest.raises(ValueError):
+        HEIFMdReader(str(tmp_path / "image.heic")).get_metadata(*NEEDED_METADATA)
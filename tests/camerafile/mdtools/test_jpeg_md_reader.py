@@ -0,0 +1,65 @@
+import io
+import os
+import random
+import zipfile
+from datetime import datetime
+
+from PIL import Image
+
+from camerafile.fileaccess.StandardFileAccess import StandardFileAccess
+from camerafile.fileaccess.StandardFileDescription import StandardFileDescription
+from camerafile.fileaccess.ZipFileAccess import ZipFileAccess
+from camerafile.fileaccess.ZipFileDescription import ZipFileDescription
+from camerafile.mdtools.BlockReader import BlockReader
+from camerafile.mdtools.JPEGMdReader import JPEGMdReader
+from camerafile.mdtools.MdConstants import MetadataNames
+
+NEEDED_METADATA = (MetadataNames.CREATION_DATE, MetadataNames.MODEL, MetadataNames.ORIENTATION)
+
+
+def create_jpeg(path):
+    # Noise: the image data are much larger than the EXIF segment
+    image = Image.frombytes("RGB", (800, 600), random.Random(0).randbytes(800 * 600 * 3))
+    exif = Image.Exif()
+    exif[0x0110] = "Camera X1"
+    exif[0x0112] = 6
+    exif_ifd = exif.get_ifd(0x8769)
+    exif_ifd[0x9003] = "2021:07:14 10:20:30"
+    exif_ifd[0x9291] = "25"
+    image.save(path, exif=exif, quality=95)
+
+
+def test_only_the_header_of_jpeg_files_is_read(tmp_path):
+    create_jpeg(tmp_path / "image.jpg")
+    file_access = StandardFileAccess(str(tmp_path), StandardFileDescription("image.jpg"))
+
+    assert file_access.read_md(NEEDED_METADATA) == ("JPEGMdReader", {
+        MetadataNames.CREATION_DATE: datetime(2021, 7, 14, 10, 20, 30, 250000),
+        MetadataNames.MODEL: "Camera X1",
+        MetadataNames.ORIENTATION: 6})
+    assert file_access.bytes_read == BlockReader.BLOCK_SIZE < os.path.getsize(tmp_path / "image.jpg")
+
+
+def test_zipped_jpeg_files(tmp_path):
+    create_jpeg(tmp_path / "image.jpg")
+    with zipfile.ZipFile(tmp_path / "archive.zip", "w") as archive:
+        archive.write(tmp_path / "image.jpg", "dir/image.jpg")
+    file_access = ZipFileAccess(str(tmp_path), ZipFileDescription("archive.zip", "dir/image.jpg", None))
+
+    assert file_access.read_md(NEEDED_METADATA) == ("JPEGMdReader", JPEGMdReader(str(tmp_path / "image.jpg"))
+                                                    .get_metadata(*NEEDED_METADATA))
+    assert file_access.bytes_read == BlockReader.BLOCK_SIZE
+
+
+def test_block_reader_reads_like_the_underlying_file():
+    data = random.Random(0).randbytes(10000)
+    expected = io.BytesIO(data)
+    block_reader = BlockReader(io.BytesIO(data), block_size=1000)
+
+    for offset, whence, size in [(0, 0, 12), (2500, 0, 100), (-50, 1, 2000), (-10, 2, 100), (9000, 0, -1),
+                                 (2600, 0, 1)]:
+        assert block_reader.seek(offset, whence) == expected.seek(offset, whence)
+        assert block_reader.read(size) == expected.read(size)
+        assert block_reader.tell() == expected.tell()
+    # blocks 0, 2, 3, 4, 9 (and the size of the file)
+    assert block_reader.bytes_read == 5000
@@ -0,0 +1,101 @@
+import io
+import struct
+from datetime import datetime
+
+import pytest
+
+from camerafile.fileaccess.StandardFileAccess import StandardFileAccess
+from camerafile.fileaccess.StandardFileDescription import StandardFileDescription
+from camerafile.mdtools.MdConstants import MetadataNames
+from camerafile.mdtools.QuickTimeMdReader import QuickTimeMdReader
+
+ALL_METADATA = (MetadataNames.CREATION_DATE, MetadataNames.WIDTH, MetadataNames.HEIGHT,
+                MetadataNames.ORIENTATION, MetadataNames.MODEL, MetadataNames.THUMBNAIL)
+
+# 2021/07/14 10:20:30, in seconds since 1904/01/01
+CREATION_TIME = int((datetime(2021, 7, 14, 10, 20, 30) - datetime(1904, 1, 1)).total_seconds())
+
+
+def box(box_type, *content):
+    content = b"".join(content)
+    return struct.pack(">I4s", len(content) + 8, box_type) + content
+
+
+def large_box(box_type, content):
+    return struct.pack(">I4sQ", 1, box_type, len(content) + 16) + content
+
+
+def mvhd(version=0):
+    if version == 1:
+        return box(b"mvhd", bytes([1, 0, 0, 0]), struct.pack(">QQ", CREATION_TIME, CREATION_TIME), bytes(88))
+    return box(b"mvhd", bytes(4), struct.pack(">II", CREATION_TIME, CREATION_TIME), bytes(88))
+
+
+def trak(handler, width, height, a=1, b=0, c=0, d=1):
+    matrix = struct.pack(">9i", a << 16, b << 16, 0, c << 16, d << 16, 0, 0, 0, 1 << 30)
+    tkhd = box(b"tkhd", bytes(4), bytes(20), bytes(16), matrix, struct.pack(">II", width << 16, height << 16))
+    hdlr = box(b"hdlr", bytes(8), handler, bytes(12))
+    return box(b"trak", tkhd, box(b"mdia", hdlr))
+
+
+def apple_meta(**values):
+    keys = b"".join(box(b"mdta", key.encode()) for key in values)
+    items = b"".join(box(struct.pack(">I", index + 1), box(b"data", struct.pack(">II", 1, 0), value.encode()))
+                     for index, value in enumerate(values.values()))
+    return box(b"meta", box(b"hdlr", bytes(8), b"mdta", bytes(12)),
+               box(b"keys", bytes(4), struct.pack(">I", len(values)), keys),
+               box(b"ilst", items))
+
+
+def video(*moov_content, mdat_first=True):
+    ftyp = box(b"ftyp", b"qt  ", bytes(4), b"qt  ")
+    mdat = large_box(b"mdat", bytes(4096))
+    moov = box(b"moov", *moov_content)
+    return ftyp + (mdat + moov if mdat_first else moov + mdat)
+
+
+def test_metadata_of_a_rotated_iphone_video():
+    data = video(mvhd(), trak(b"soun", 0, 0), trak(b"vide", 1920, 1080, a=0, b=1, c=-1, d=0),
+                 apple_meta(**{"com.apple.quicktime.make": "Apple", "com.apple.quicktime.model": "iPhone 12"}))
+
+    assert QuickTimeMdReader(io.BytesIO(data)).get_metadata(*ALL_METADATA) == {
+        MetadataNames.CREATION_DATE: datetime(2021, 7, 14, 10, 20, 30),
+        MetadataNames.WIDTH: 1920,
+        MetadataNames.HEIGHT: 1080,
+        MetadataNames.ORIENTATION: 6,
+        MetadataNames.MODEL: "iPhone 12",
+        MetadataNames.THUMBNAIL: None}
+
+
+def test_metadata_of_a_mp4_video_with_udta_tags():
+    mod = box(b"\xa9mod", struct.pack(">HH", 9, 0), b"Camera X1")
+    data = video(mvhd(version=1), trak(b"vide", 640, 480, a=-1, d=-1), box(b"udta", mod), mdat_first=False)
+
+    reader = QuickTimeMdReader(io.BytesIO(data))
+
+    assert reader.get_metadata(MetadataNames.CREATION_DATE, MetadataNames.ORIENTATION, MetadataNames.MODEL) == {
+        MetadataNames.CREATION_DATE: datetime(2021, 7, 14, 10, 20, 30),
+        MetadataNames.ORIENTATION: 3,
+        MetadataNames.MODEL: "Camera X1"}
+
+
+def test_unset_creation_date():
+    data = video(box(b"mvhd", bytes(100)), trak(b"vide", 640, 480))
+    assert QuickTimeMdReader(io.BytesIO(data)).get_metadata(MetadataNames.CREATION_DATE) == {
+        MetadataNames.CREATION_DATE: None}
+
+
+@pytest.mark.parametrize("data", [b"not a video at all", box(b"ftyp", b"isom"), video(trak(b"vide", 640, 480))])
+def test_invalid_videos_are_not_read(data):
+    with pytest.raises(ValueError):
+        QuickTimeMdReader(io.BytesIO(data))
+
+
+def test_videos_are_read_without_exif_tool(tmp_path):
+    (tmp_path / "video.mov").write_bytes(video(mvhd(), trak(b"vide", 1280, 720)))
+    file_access = StandardFileAccess(str(tmp_path), StandardFileDescription("video.mov"))
+
+    assert file_access.read_md((MetadataNames.WIDTH, MetadataNames.HEIGHT)) == (
+        "QuickTimeMdReader", {MetadataNames.WIDTH: 1280, MetadataNames.HEIGHT: 720})
+    assert StandardFileAccess.read_md_list([file_access], (MetadataNames.WIDTH,)) == [
+        ("QuickTimeMdReader", {MetadataNames.WIDTH: 1280})]
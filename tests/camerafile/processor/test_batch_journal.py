@@ -0,0 +1,103 @@
+import pytest
+
+from camerafile.core.Configuration import Configuration
+from camerafile.processor.BatchJournal import BatchJournal
+from camerafile.processor.BatchTool import BatchElement, Executor, TaskWithProgression
+
+
+class Interruption(BaseException):
+    pass
+
+
+def square(batch_element: BatchElement):
+    batch_element.result = batch_element.args, batch_element.args ** 2
+    return batch_element
+
+
+class JournaledBatch(TaskWithProgression):
+
+    def __init__(self, journal_path, key="key", interrupt_after=None):
+        super().__init__(nb_sub_process=0)
+        self.executor = Executor.INLINE
+        self.journal_path = journal_path
+        self.key = key
+        self.interrupt_after = interrupt_after
+        self.results = {}
+        self.computed = []
+
+    def initialize(self):
+        self.journal = BatchJournal(self.journal_path, self.key)
+
+    def task_getter(self):
+        return square
+
+    def arguments(self):
+        self.computed = [i for i in range(100) if i not in self.results]
+        return [BatchElement(i, f"element {i}") for i in self.computed]
+
+    def post_task(self, result, progress_bar, replace=False):
+        if len(self.results) == self.interrupt_after:
+            raise Interruption()
+        self.results[result[0]] = result[1]
+        progress_bar.increment()
+
+    def display_final_status(self, progress_bar):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def journal_settings(monkeypatch):
+    monkeypatch.setattr(Configuration.get(), "progress", False)
+    monkeypatch.setattr(BatchJournal, "CHECKPOINT_RESULTS", 10)
+    # Journals are replayed once per process
+    monkeypatch.setattr(BatchJournal, "_BatchJournal__opened", {})
+
+
+def new_process(monkeypatch):
+    monkeypatch.setattr(BatchJournal, "_BatchJournal__opened", {})
+
+
+def test_results_of_an_interrupted_batch_are_replayed(tmp_path, monkeypatch):
+    with pytest.raises(Interruption):
+        JournaledBatch(tmp_path / "test.journal", interrupt_after=25).execute()
+
+    new_process(monkeypatch)
+    batch = JournaledBatch(tmp_path / "test.journal")
+    batch.execute()
+
+    # The results after the last checkpoint are computed again
+    assert batch.computed == list(range(20, 100))
+    assert batch.results == {i: i ** 2 for i in range(100)}
+
+    # Replayed only once by a process
+    batch = JournaledBatch(tmp_path / "test.journal")
+    batch.execute()
+    assert len(batch.computed) == 100
+
+
+def test_journal_written_with_another_key_is_not_replayed(tmp_path, monkeypatch):
+    JournaledBatch(tmp_path / "test.journal", key="key1").execute()
+
+    new_process(monkeypatch)
+    batch = JournaledBatch(tmp_path / "test.journal", key="key2")
+    batch.execute()
+
+    assert len(batch.computed) == 100
+    new_process(monkeypatch)
+    assert BatchJournal(tmp_path / "test.journal", "key2").replay() == [(i, i ** 2) for i in range(100)]
+
+
+def test_incomplete_checkpoint_is_removed(tmp_path, monkeypatch):
+    with pytest.raises(Interruption):
+        JournaledBatch(tmp_path / "test.journal", interrupt_after=25).execute()
+    content = (tmp_path / "test.journal").read_bytes()
+    (tmp_path / "test.journal").write_bytes(content[:-5])
+
+    new_process(monkeypatch)
+    with pytest.raises(Interruption):
+        JournaledBatch(tmp_path / "test.journal", interrupt_after=35).execute()
+
+    new_process(monkeypatch)
+    batch = JournaledBatch(tmp_path / "test.journal")
+    batch.execute()
+    assert batch.computed == list(range(30, 100))
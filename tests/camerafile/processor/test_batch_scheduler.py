@@ -0,0 +1,42 @@
+from camerafile.core.Configuration import Configuration
+from camerafile.core.Constants import CONTENT_MD5
+from camerafile.fileaccess.StandardFileDescription import StandardFileDescription
+from camerafile.fileaccess.ZipFileDescription import ZipFileDescription
+from camerafile.processor.BatchScheduler import BatchScheduler
+from camerafile.processor.BatchTool import BatchElement
+from camerafile.task.TaskCost import TaskCost
+
+MB = 1024 * 1024
+
+
+def test_longest_elements_and_groups_are_scheduled_first():
+    args_list = [BatchElement("a", "a", 1.0),
+                 BatchElement("b", "b", 5.0),
+                 BatchElement("zip1", "zip1", 2.0, "archive.zip"),
+                 BatchElement("c", "c", 3.0),
+                 BatchElement("zip2", "zip2", 2.0, "archive.zip")]
+
+    assert [batch_element.args for batch_element in BatchScheduler.schedule(args_list)] == \
+           ["b", "zip1", "zip2", "c", "a"]
+
+
+def test_makespan_is_shorter_when_longest_elements_are_first():
+    args_list = [BatchElement(i, str(i), 1.0) for i in range(8)] + [BatchElement(8, "8", 4.0)]
+
+    assert BatchScheduler.predict_makespan(args_list, 3) == 6.0
+    assert BatchScheduler.predict_makespan(BatchScheduler.schedule(args_list), 3) == 4.0
+    assert BatchScheduler.predict_makespan(args_list, 1) == 12.0
+
+
+def test_costs_depend_on_the_files(monkeypatch):
+    monkeypatch.setattr(Configuration.get(), "file_signature_algorithm", CONTENT_MD5)
+    photo = StandardFileDescription("photo.jpg", 4 * MB)
+    video = StandardFileDescription("video.mp4", 400 * MB)
+    zipped_photo = ZipFileDescription("archive.zip", "photo.jpg", 4 * MB)
+
+    assert TaskCost.read_md(StandardFileDescription("audio.mp3", MB)) > TaskCost.read_md(photo)
+    assert TaskCost.signature(zipped_photo) > TaskCost.signature(photo)
+    # Large files are hashed by samples
+    assert TaskCost.signature(video) < TaskCost.signature(StandardFileDescription("video.mp4", 4 * MB)) * 2
+    assert BatchScheduler.get_group(zipped_photo) == "archive.zip"
+    assert BatchScheduler.get_group(photo) is None
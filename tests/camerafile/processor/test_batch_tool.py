@@ -0,0 +1,168 @@
+import os
+import time
+
+import pytest
+
+from camerafile.core.Configuration import Configuration
+from camerafile.processor.BatchTool import BatchElement, ChunkSizer, Executor, TaskWithProgression
+from camerafile.processor.WorkerPool import WorkerPool
+
+OFFSET = 0
+
+
+def square(batch_element: BatchElement):
+    if batch_element.args == 13:
+        batch_element.error = "unlucky"
+    else:
+        print(f"square of {batch_element.args}")
+        batch_element.result = batch_element.args, batch_element.args ** 2
+    return batch_element
+
+
+def set_offset(offset):
+    global OFFSET
+    OFFSET = offset
+
+
+def add_offset(batch_element: BatchElement):
+    batch_element.result = batch_element.args, (batch_element.args + OFFSET, os.getpid())
+    return batch_element
+
+
+class SquareBatch(TaskWithProgression):
+
+    def __init__(self, nb_elements, nb_sub_process):
+        super().__init__(nb_sub_process=nb_sub_process)
+        self.nb_elements = nb_elements
+        self.results = {}
+        self.errors = []
+
+    def task_getter(self):
+        return square if self.task_initializer is None else add_offset
+
+    def arguments(self):
+        return [BatchElement(i, f"element {i}") for i in range(self.nb_elements)]
+
+    def post_task(self, result, progress_bar, replace=False):
+        if result is not None:
+            self.results[result[0]] = result[1]
+        progress_bar.increment()
+
+    def write_error(self, error):
+        self.errors.append(error)
+
+    def display_final_status(self, progress_bar):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def no_progress_bar(monkeypatch):
+    monkeypatch.setattr(Configuration.get(), "progress", False)
+
+
+@pytest.mark.parametrize("chunk_size", [None, 1, 7])
+def test_all_elements_are_processed_by_chunks(chunk_size, tmp_path):
+    batch = SquareBatch(500, 3)
+    batch.stdout_file = tmp_path / "stdout.txt"
+    batch.chunk_size = chunk_size
+
+    batch.execute()
+
+    assert batch.results == {i: i ** 2 for i in range(500) if i != 13}
+    assert len(batch.errors) == 1 and "unlucky" in batch.errors[0]
+    assert (tmp_path / "stdout.txt").read_text().count("square of") == 499
+
+
+@pytest.mark.parametrize("executor", [Executor.THREAD, Executor.INLINE])
+def test_all_elements_are_processed_in_the_main_process(executor, monkeypatch):
+    batch = SquareBatch(500, 3)
+    batch.executor = executor
+    monkeypatch.setattr(TaskWithProgression, "execute_multiprocess_batch", None)
+
+    batch.execute()
+
+    assert batch.results == {i: i ** 2 for i in range(500) if i != 13}
+
+
+def inverse(batch_element: BatchElement):
+    batch_element.result = batch_element.args, 1 / (batch_element.args - 5)
+    return batch_element
+
+
+def test_exceptions_of_threads_are_errors():
+    batch = SquareBatch(10, 2)
+    batch.executor = Executor.THREAD
+    batch.task_getter = lambda: inverse
+
+    batch.execute()
+
+    assert set(batch.results) == {0, 1, 2, 3, 4, 6, 7, 8, 9}
+    assert len(batch.errors) == 1 and "ZeroDivisionError" in batch.errors[0]
+
+
+def test_pending_thread_tasks_are_cancelled_on_interruption():
+    batch = SquareBatch(200, 2)
+    batch.executor = Executor.THREAD
+    executed = []
+
+    def slow_square(batch_element: BatchElement):
+        executed.append(batch_element.args)
+        time.sleep(0.01)
+        return square(batch_element)
+
+    def interrupt(batch_element, progress_bar):
+        raise KeyboardInterrupt()
+
+    batch.task_getter = lambda: slow_square
+    batch.process_error = interrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        batch.execute()
+
+    assert 13 in executed and len(executed) < 50
+
+
+def test_chunks_are_sized_from_task_durations():
+    chunk_sizer = ChunkSizer(100000, 4)
+    assert chunk_sizer.next_size() == 1
+
+    # 1 ms per task
+    chunk_sizer.add_measure(10, 0.01)
+    assert chunk_sizer.next_size() == int(ChunkSizer.TARGET_DURATION / 0.001)
+
+    # Very cheap tasks
+    chunk_sizer.add_measure(100000, 0.0)
+    assert chunk_sizer.next_size() == ChunkSizer.MAX_SIZE
+
+
+def test_last_chunks_are_shared_between_workers():
+    chunk_sizer = ChunkSizer(100, 4)
+    chunk_sizer.add_measure(10, 0.0)
+
+    sizes = []
+    while chunk_sizer.remaining > 0:
+        sizes.append(chunk_sizer.next_size())
+
+    assert sum(sizes) == 100
+    assert max(sizes) <= 100 // (ChunkSizer.MIN_CHUNKS_PER_WORKER * 4)
+
+
+@pytest.fixture
+def stop_shared_worker_pool():
+    yield
+    WorkerPool.stop_shared()
+
+
+def test_shared_worker_pool_is_reused_between_batches(stop_shared_worker_pool):
+    results = []
+    for offset in [1000, 2000]:
+        batch = SquareBatch(50, 2)
+        batch.shared_worker_pool = True
+        batch.task_initializer, batch.task_initializer_args = set_offset, (offset,)
+        batch.execute()
+        results.append(batch.results)
+
+    # The initializer of each batch is called in workers started for the first one
+    assert {value for value, _ in results[0].values()} == set(range(1000, 1050))
+    assert {value for value, _ in results[1].values()} == set(range(2000, 2050))
+    assert {pid for _, pid in results[1].values()} <= {pid for _, pid in results[0].values()}
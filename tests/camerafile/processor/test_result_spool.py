@@ -0,0 +1,76 @@
+import os
+
+import pytest
+
+from camerafile.core.Configuration import Configuration
+from camerafile.processor.BatchTool import BatchElement, Executor, TaskWithProgression
+from camerafile.processor.ResultSpool import ResultSpool, SpoolRef
+
+
+def payload_task(batch_element: BatchElement):
+    payload = bytes([batch_element.args % 256]) * batch_element.args
+    batch_element.result = batch_element.args, ResultSpool.put(payload)
+    return batch_element
+
+
+class PayloadBatch(TaskWithProgression):
+
+    def __init__(self, nb_elements, nb_sub_process):
+        super().__init__(nb_sub_process=nb_sub_process)
+        self.nb_elements = nb_elements
+        self.use_result_spool = True
+        self.payloads = {}
+        self.sent = {}
+
+    def task_getter(self):
+        return payload_task
+
+    def arguments(self):
+        return [BatchElement(i, f"element {i}") for i in range(self.nb_elements)]
+
+    def post_task(self, result, progress_bar, replace=False):
+        element, payload = result
+        self.sent[element] = type(payload)
+        self.payloads[element] = self.get_payload(payload)
+        progress_bar.increment()
+
+    def display_final_status(self, progress_bar):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def no_progress_bar(monkeypatch):
+    monkeypatch.setattr(Configuration.get(), "progress", False)
+
+
+def test_payloads_of_workers_are_sent_through_the_spool(monkeypatch):
+    spool_directories = []
+    spool_init = ResultSpool.__init__
+
+    def init(spool):
+        spool_init(spool)
+        spool_directories.append(spool.directory)
+
+    monkeypatch.setattr(ResultSpool, "__init__", init)
+    batch = PayloadBatch(300, 2)
+    batch.chunk_size = 7
+
+    batch.execute()
+
+    assert batch.payloads == {i: bytes([i % 256]) * i for i in range(300)}
+    # Empty payload
+    assert batch.sent[0] == bytes
+    assert set(batch.sent[i] for i in range(1, 300)) == {SpoolRef}
+    assert batch.result_spool is None
+    assert not os.path.exists(spool_directories[0])
+
+
+@pytest.mark.parametrize("executor", [Executor.THREAD, Executor.INLINE])
+def test_payloads_of_the_main_process_are_kept(executor):
+    batch = PayloadBatch(20, 2)
+    batch.executor = executor
+
+    batch.execute()
+
+    assert batch.payloads == {i: bytes([i % 256]) * i for i in range(20)}
+    assert set(batch.sent.values()) == {bytes}
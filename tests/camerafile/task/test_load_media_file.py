@@ -0,0 +1,77 @@
+import random
+
+from PIL import Image
+
+from camerafile.core.Configuration import Configuration
+from camerafile.core.Constants import DRAFT_DHASH
+from camerafile.fileaccess.StandardFileAccess import StandardFileAccess
+from camerafile.fileaccess.StandardFileDescription import StandardFileDescription
+from camerafile.mdtools.MdConstants import MetadataNames
+from camerafile.metadata.Metadata import Metadata
+from camerafile.processor.BatchTool import BatchElement
+from camerafile.task.LoadInternalMetadata import LoadInternalMetadata
+from camerafile.task.LoadMediaFile import LoadMediaFile
+
+
+def create_jpeg(path, width=4800, height=3600):
+    rnd = random.Random(0)
+    # Blocks of colors, so that the image has a meaningful dhash
+    image = Image.new("RGB", (width, height))
+    for x in range(0, width, 400):
+        for y in range(0, height, 400):
+            image.paste((rnd.randrange(256), rnd.randrange(256), rnd.randrange(256)), (x, y, x + 400, y + 400))
+    exif = Image.Exif()
+    exif[0x0110] = "Camera X1"
+    exif[0x0112] = 6
+    exif.get_ifd(0x8769)[0x9003] = "2021:07:14 10:20:30"
+    image.save(path, exif=exif)
+
+
+def load_media_file(tmp_path, signature_metadata, thb_path):
+    LoadInternalMetadata.md_needed = (MetadataNames.CREATION_DATE, MetadataNames.MODEL, MetadataNames.ORIENTATION)
+    metadata = Metadata()
+    batch_element = BatchElement((str(tmp_path), StandardFileDescription("image.jpg"), metadata,
+                                  signature_metadata, thb_path), "image.jpg")
+    return LoadMediaFile.execute(batch_element)
+
+
+def test_metadata_signature_and_thumbnail_are_computed_together(tmp_path):
+    create_jpeg(tmp_path / "image.jpg")
+
+    batch_element = load_media_file(tmp_path, Metadata(), tmp_path / "image.thb")
+
+    assert batch_element.error is None
+    _, _, metadata, _, signature_metadata = batch_element.result
+    assert metadata.call_info == "JPEGMdReader"
+    assert metadata.value[MetadataNames.CREATION_DATE.value] == "2021/07/14 10:20:30.000000"
+    assert metadata.value[MetadataNames.MODEL.value] == "Camera X1"
+    # Same signature as the one computed by ComputeSignature
+    assert signature_metadata.value == StandardFileAccess(str(tmp_path), StandardFileDescription("image.jpg")).hash()
+    with Image.open(tmp_path / "image.thb") as thumbnail:
+        # Rotated according to the orientation
+        assert thumbnail.size == (384, 512)
+
+
+def test_thumbnail_alone_is_generated_from_a_reduced_image(tmp_path):
+    create_jpeg(tmp_path / "image.jpg")
+    signature_metadata = Metadata()
+    signature_metadata.value = 1234
+
+    batch_element = load_media_file(tmp_path, signature_metadata, tmp_path / "image.thb")
+
+    assert batch_element.result[4].value == 1234
+    with Image.open(tmp_path / "image.thb") as thumbnail:
+        assert thumbnail.size == (384, 512)
+
+
+def test_thumbnail_is_not_reduced_by_draft_signatures(tmp_path, monkeypatch):
+    monkeypatch.setattr(Configuration.get(), "signature_algorithm", DRAFT_DHASH)
+    # Decoded at 1/8 scale (300x225) for its signature
+    create_jpeg(tmp_path / "image.jpg", 2400, 1800)
+
+    batch_element = load_media_file(tmp_path, Metadata(), tmp_path / "image.thb")
+
+    signature_metadata = batch_element.result[4]
+    assert signature_metadata.value == StandardFileAccess(str(tmp_path), StandardFileDescription("image.jpg")).hash()
+    with Image.open(tmp_path / "image.thb") as thumbnail:
+        assert thumbnail.size == (384, 512)
@@ -0,0 +1,11 @@
+from camerafile.cfm import create_main_args_parser, ORGANIZE_CMD
+
+
+def test_organize_format_option_is_not_ambiguous():
+    parser = create_main_args_parser()
+
+    args = parser.parse_args([ORGANIZE_CMD, "dir1", "dir2", "-f", "${date:%Y}/${filename}"])
+
+    assert args.command == ORGANIZE_CMD
+    assert args.format == "${date:%Y}/${filename}"
+    assert args.file_signature_algorithm == parser.get_default("file_signature_algorithm")
@@ -0,0 +1,72 @@
+"""
+Measures the number of batch elements processed per second by TaskWithProgression.execute_multiprocess_batch,
+depending on the size of the chunks of elements sent to the workers: fixed sizes, and adaptive size (ChunkSizer).
+Tasks are cheap (like ComputeCameraModel), or take about 1 ms.
+A chunk size of 1 with details sent for each element (DETAILS_INTERVAL = 0) is the previous behaviour.
+
+Usage: python tools/benchmarks/batch_chunking.py [number of elements] [number of workers]
+"""
+import sys
+import time
+
+from camerafile.core.Configuration import Configuration
+from camerafile.processor.BatchTool import BatchElement, TaskWithProgression
+
+
+def cheap_task(batch_element: BatchElement):
+    batch_element.result = batch_element.args
+    batch_element.args = None
+    return batch_element
+
+
+def one_ms_task(batch_element: BatchElement):
+    end = time.perf_counter() + 0.001
+    while time.perf_counter() < end:
+        pass
+    return cheap_task(batch_element)
+
+
+class BenchmarkBatch(TaskWithProgression):
+
+    def __init__(self, task, nb_elements, nb_sub_process, chunk_size):
+        TaskWithProgression.__init__(self, nb_sub_process=nb_sub_process)
+        self.task = task
+        self.nb_elements = nb_elements
+        self.chunk_size = chunk_size
+
+    def task_getter(self):
+        return self.task
+
+    def arguments(self):
+        return [BatchElement(("root", f"dir/file{i}.jpg", i), f"dir/file{i}.jpg") for i in range(self.nb_elements)]
+
+    def post_task(self, result, progress_bar, replace=False):
+        progress_bar.increment()
+
+    def display_final_status(self, progress_bar):
+        pass
+
+
+def run(task, nb_elements, nb_workers, chunk_size, details_interval):
+    TaskWithProgression.DETAILS_INTERVAL = details_interval
+    start = time.perf_counter()
+    BenchmarkBatch(task, nb_elements, nb_workers, chunk_size).execute()
+    duration = time.perf_counter() - start
+    name = "adaptive" if chunk_size is None else str(chunk_size)
+    if details_interval == 0:
+        name += ", all details"
+    print(f"{task.__name__:>11} | chunk size {name:>16}: {nb_elements / duration:>9.0f} elements/s")
+
+
+def main():
+    nb_elements = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    nb_workers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    Configuration.get().progress = False
+    for task, nb_task_elements in [(cheap_task, nb_elements), (one_ms_task, nb_elements // 4)]:
+        run(task, nb_task_elements, nb_workers, 1, 0)
+        for chunk_size in [1, 4, 16, 64, 256, None]:
+            run(task, nb_task_elements, nb_workers, chunk_size, 0.1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Measures the number of files hard-linked per second by a batch of CopyFile tasks (like BatchCopy in an organize with
+the hard link copy mode), depending on the executor of the batch: worker processes, threads, or the main process.
+
+Usage: python tools/benchmarks/batch_executors.py [number of files] [number of workers]
+"""
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from camerafile.core.Configuration import Configuration
+from camerafile.fileaccess.FileAccess import CopyMode
+from camerafile.fileaccess.StandardFileDescription import StandardFileDescription
+from camerafile.processor.BatchTool import BatchElement, Executor, TaskWithProgression
+from camerafile.task.CopyFile import CopyFile
+
+
+class HardLinkBatch(TaskWithProgression):
+
+    def __init__(self, executor, source, target, file_names, nb_sub_process):
+        TaskWithProgression.__init__(self, nb_sub_process=nb_sub_process)
+        self.executor = executor
+        self.source = source
+        self.target = target
+        self.file_names = file_names
+
+    def task_getter(self):
+        return CopyFile.execute
+
+    def arguments(self):
+        return [BatchElement((str(self.source), StandardFileDescription(file_name), self.target,
+                              f"2020/01/{file_name}", CopyMode.HARD_LINK), file_name)
+                for file_name in self.file_names]
+
+    def post_task(self, result, progress_bar, replace=False):
+        assert result[0], result[1]
+        progress_bar.increment()
+
+    def display_final_status(self, progress_bar):
+        pass
+
+
+def create_files(directory: Path, nb_files):
+    file_names = []
+    for i in range(nb_files):
+        file_name = f"dir{i // 1000:03d}/IMG_{i:06d}.jpg"
+        (directory / file_name).parent.mkdir(exist_ok=True)
+        (directory / file_name).touch()
+        file_names.append(file_name)
+    return file_names
+
+
+def main():
+    nb_files = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    nb_workers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    Configuration.get().progress = False
+    with tempfile.TemporaryDirectory() as directory:
+        source = Path(directory) / "source"
+        source.mkdir()
+        file_names = create_files(source, nb_files)
+        for executor in Executor:
+            target = Path(directory) / executor.value
+            start = time.perf_counter()
+            HardLinkBatch(executor, source, target, file_names, nb_workers).execute()
+            duration = time.perf_counter() - start
+            print(f"{executor.value:>7}: {nb_files} hard links in {duration:.2f}s ({nb_files / duration:.0f} files/s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Measures the duration of a batch whose tasks have very different durations (many photos, and a few large videos
+found last, like in scan order), with the batch elements executed in their order, or scheduled by
+TaskWithProgression (longest first, see BatchScheduler). Tasks sleep for their duration, so that the results do not
+depend on the number of cores.
+
+Usage: python tools/benchmarks/batch_scheduling.py [number of photos] [number of videos] [number of workers]
+"""
+import logging
+import random
+import sys
+import time
+
+from camerafile.core.Configuration import Configuration
+from camerafile.processor.BatchTool import BatchElement, TaskWithProgression
+
+
+def sleep_task(batch_element: BatchElement):
+    time.sleep(batch_element.args)
+    batch_element.result = batch_element.args
+    return batch_element
+
+
+class BenchmarkBatch(TaskWithProgression):
+
+    def __init__(self, durations, nb_sub_process, scheduled):
+        TaskWithProgression.__init__(self, nb_sub_process=nb_sub_process)
+        self.durations = durations
+        self.scheduled = scheduled
+
+    def task_getter(self):
+        return sleep_task
+
+    def arguments(self):
+        return [BatchElement(duration, f"file{i}", duration if self.scheduled else None)
+                for i, duration in enumerate(self.durations)]
+
+    def post_task(self, result, progress_bar, replace=False):
+        progress_bar.increment()
+
+    def display_final_status(self, progress_bar):
+        pass
+
+
+def main():
+    nb_photos = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    nb_videos = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    nb_workers = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    Configuration.get().progress = False
+    rnd = random.Random(0)
+    durations = [rnd.uniform(0.002, 0.01) for _ in range(nb_photos)] + [rnd.uniform(0.5, 1.0) for _ in range(nb_videos)]
+    for scheduled in [False, True]:
+        start = time.perf_counter()
+        BenchmarkBatch(durations, nb_workers, scheduled).execute()
+        name = "scheduled" if scheduled else "scan order"
+        print(f"{name:>10}: {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
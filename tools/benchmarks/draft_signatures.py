@@ -0,0 +1,60 @@
+"""
+Measures the computation of the signatures of JPEG images (StandardFileAccess.hash) with each signature algorithm:
+dhash of the fully decoded image, and dhash of the image decoded at 1/8 scale (JPEG draft mode).
+Also gives the number of different bits between the signatures of both algorithms.
+
+Usage: python tools/benchmarks/draft_signatures.py [number of JPEG files]
+"""
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import dhash
+from PIL import Image
+
+from camerafile.core.Configuration import Configuration
+from camerafile.core.Constants import SIGNATURE_ALGORITHMS
+from camerafile.fileaccess.StandardFileAccess import StandardFileAccess
+from camerafile.fileaccess.StandardFileDescription import StandardFileDescription
+
+
+def create_jpeg_files(directory, nb_files):
+    rnd = random.Random(0)
+    file_names = []
+    for i in range(nb_files):
+        # 24 MP, blocks of colors with some noise
+        image = Image.new("RGB", (6000, 4000))
+        for x in range(0, 6000, 500):
+            for y in range(0, 4000, 500):
+                image.paste((rnd.randrange(256), rnd.randrange(256), rnd.randrange(256)), (x, y, x + 500, y + 500))
+        noise = Image.frombytes("RGB", (600, 400), rnd.randbytes(600 * 400 * 3)).resize((6000, 4000))
+        file_name = f"IMG_{i:05d}.jpg"
+        Image.blend(image, noise, 0.2).save(directory / file_name, quality=90)
+        file_names.append(file_name)
+    return file_names
+
+
+def run(algorithm, directory, file_names):
+    Configuration.get().signature_algorithm = algorithm
+    start = time.perf_counter()
+    signatures = [StandardFileAccess(str(directory), StandardFileDescription(file_name)).hash()
+                  for file_name in file_names]
+    duration = time.perf_counter() - start
+    print(f"{algorithm:>13}: {len(file_names)} signatures computed in {duration:.3f}s "
+          f"({duration / len(file_names) * 1000:.1f} ms per image)")
+    return signatures
+
+
+def main():
+    nb_files = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    with tempfile.TemporaryDirectory() as directory:
+        file_names = create_jpeg_files(Path(directory), nb_files)
+        full, draft = (run(algorithm, Path(directory), file_names) for algorithm in SIGNATURE_ALGORITHMS)
+        bits = [dhash.get_num_bits_different(s1, s2) for s1, s2 in zip(full, draft)]
+        print(f"Different bits between signatures: max {max(bits)}, mean {sum(bits) / len(bits):.1f} (of 128)")
+
+
+if __name__ == "__main__":
+    main()
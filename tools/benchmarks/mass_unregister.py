@@ -0,0 +1,88 @@
+"""
+Measures the registration (and indexing) of media files in a media set, their re-indexing, and the
+unregistration of all of them (as when a folder is moved, or by delete_not_existing_media), with the
+OrderedSet containers used now and with lists, as they were used before.
+
+Usage: python tools/benchmarks/mass_unregister.py [number of media files]
+"""
+import random
+import sys
+import tempfile
+import time
+
+import camerafile.core.MediaDirectory
+import camerafile.core.MediaIndexer
+import camerafile.core.MediaSet
+from camerafile.core.Constants import INTERNAL, SIGNATURE
+from camerafile.core.MediaDirectory import MediaDirectory
+from camerafile.core.MediaFile import MediaFile
+from camerafile.core.MediaSet import MediaSet
+from camerafile.core.OrderedSet import OrderedSet
+from camerafile.fileaccess.StandardFileDescription import StandardFileDescription
+from camerafile.mdtools.MdConstants import MetadataNames
+
+
+class ListOrderedSet(list):
+    """
+    Previous behaviour: lists with linear membership tests and removals.
+    """
+
+    def add(self, item):
+        if item not in self:
+            self.append(item)
+
+    def discard(self, item):
+        if item in self:
+            self.remove(item)
+
+
+def use_containers(container_class):
+    for module in [camerafile.core.MediaDirectory, camerafile.core.MediaIndexer, camerafile.core.MediaSet]:
+        module.OrderedSet = container_class
+
+
+def create_media_set(root_path, nb_files):
+    media_set = MediaSet(root_path, initialize=False)
+    root_dir = MediaDirectory(StandardFileDescription("."), None, media_set)
+    media_set.register_directory(root_dir)
+    rnd = random.Random(0)
+    media_files = []
+    for i in range(nb_files):
+        media_file = MediaFile(StandardFileDescription(f"IMG_{i:08d}.jpg", 1000 + i % 10, i), root_dir, media_set)
+        media_file.metadata[INTERNAL].value = {MetadataNames.CREATION_DATE.value: f"2021/07/{i % 20 + 1:02d} 10:00:00"}
+        media_file.metadata[SIGNATURE].value = rnd.getrandbits(128)
+        media_files.append(media_file)
+    return media_set, media_files
+
+
+def run(name, container_class, root_path, nb_files):
+    use_containers(container_class)
+    media_set, media_files = create_media_set(root_path, nb_files)
+    start = time.perf_counter()
+    for media_file in media_files:
+        media_set.register_file(media_file)
+    register = time.perf_counter() - start
+    start = time.perf_counter()
+    for media_file in media_files:
+        media_set.indexer.add_media_file(media_file)
+    reindex = time.perf_counter() - start
+    # Files are not removed in the order they were added
+    random.Random(1).shuffle(media_files)
+    start = time.perf_counter()
+    for media_file in media_files:
+        media_set.unregister_file(media_file)
+    unregister = time.perf_counter() - start
+    assert len(media_set) == 0 and not media_set.indexer.date_size_map and not media_set.indexer.date_sig_map
+    print(f"{name:>11}: {nb_files} media files registered in {register:.3f}s, "
+          f"re-indexed in {reindex:.3f}s, unregistered in {unregister:.3f}s")
+
+
+def main():
+    nb_files = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    with tempfile.TemporaryDirectory() as root_path:
+        run("lists", ListOrderedSet, root_path, nb_files)
+        run("OrderedSet", OrderedSet, root_path, nb_files)
+
+
+if __name__ == "__main__":
+    main()
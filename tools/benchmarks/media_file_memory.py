@@ -0,0 +1,45 @@
+"""
+Measures the memory used by MediaFile objects, as they are after a scan and a metadata read:
+file description, internal metadata (date, model, dimensions, orientation) and signature.
+
+Usage: python tools/benchmarks/media_file_memory.py [number of media files]
+"""
+import gc
+import sys
+import tracemalloc
+
+from camerafile.core.Constants import INTERNAL, SIGNATURE
+from camerafile.core.MediaFile import MediaFile
+from camerafile.fileaccess.StandardFileDescription import StandardFileDescription
+from camerafile.mdtools.MdConstants import MetadataNames
+
+
+def create_media_files(nb_files):
+    media_files = []
+    for i in range(nb_files):
+        relative_path = f"{2000 + i % 20}/{i % 12 + 1:02d}/dir-{i % 500}/IMG_{i:08d}.jpg"
+        media_file = MediaFile(StandardFileDescription(relative_path, 1000000 + i, (1 << 64) | i), None, None)
+        media_file.metadata[INTERNAL].value = {MetadataNames.CREATION_DATE.value: "2021/07/14 10:00:00.000000",
+                                               MetadataNames.MODEL.value: "Model",
+                                               MetadataNames.WIDTH.value: 4000,
+                                               MetadataNames.HEIGHT.value: 3000,
+                                               MetadataNames.ORIENTATION.value: 1}
+        media_file.metadata[SIGNATURE].value = (1 << 127) | i
+        media_files.append(media_file)
+    return media_files
+
+
+def main():
+    nb_files = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    gc.collect()
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    media_files = create_media_files(nb_files)
+    gc.collect()
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{nb_files} media files: {(end - start) / len(media_files):.0f} bytes per media file")
+
+
+if __name__ == "__main__":
+    main()
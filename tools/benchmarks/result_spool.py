@@ -0,0 +1,68 @@
+"""
+Measures the results of tasks that return a thumbnail (like LoadInternalMetadata) received per second by the main
+process, and its CPU time, depending on how thumbnails are sent back by the workers: through the result pipe of the
+worker pool (pickled with the results), or through a result spool (ResultSpool).
+
+Usage: python tools/benchmarks/result_spool.py [number of elements] [thumbnail size in KB] [number of workers]
+"""
+import random
+import sys
+import time
+
+from camerafile.core.Configuration import Configuration
+from camerafile.metadata.Metadata import Metadata
+from camerafile.processor.BatchTool import BatchElement, TaskWithProgression
+from camerafile.processor.ResultSpool import ResultSpool
+
+THUMBNAIL = random.Random(0).randbytes(int(sys.argv[2]) * 1024 if len(sys.argv) > 2 else 16 * 1024)
+
+
+def thumbnail_task(batch_element: BatchElement):
+    metadata = Metadata()
+    metadata.value = {"model": "Camera X1", "date": "2021/07/14 10:20:30.000000", "width": 4000, "height": 3000}
+    # Each thumbnail is a different object, as pickle would only send once the same object
+    thumbnail = batch_element.args.to_bytes(8, "little") + THUMBNAIL
+    batch_element.result = batch_element.args, ResultSpool.put(thumbnail), metadata
+    batch_element.args = None
+    return batch_element
+
+
+class BenchmarkBatch(TaskWithProgression):
+
+    def __init__(self, nb_elements, nb_sub_process, use_result_spool):
+        TaskWithProgression.__init__(self, nb_sub_process=nb_sub_process)
+        self.nb_elements = nb_elements
+        self.use_result_spool = use_result_spool
+        self.nb_bytes = 0
+
+    def task_getter(self):
+        return thumbnail_task
+
+    def arguments(self):
+        return [BatchElement(i, f"dir/file{i}.jpg") for i in range(self.nb_elements)]
+
+    def post_task(self, result, progress_bar, replace=False):
+        self.nb_bytes += len(self.get_payload(result[1]))
+        progress_bar.increment()
+
+    def display_final_status(self, progress_bar):
+        pass
+
+
+def main():
+    nb_elements = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    nb_workers = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+    Configuration.get().progress = False
+    for use_result_spool in [False, True]:
+        batch = BenchmarkBatch(nb_elements, nb_workers, use_result_spool)
+        start, start_cpu = time.perf_counter(), time.process_time()
+        batch.execute()
+        duration, cpu = time.perf_counter() - start, time.process_time() - start_cpu
+        assert batch.nb_bytes == nb_elements * (len(THUMBNAIL) + 8)
+        name = "result spool" if use_result_spool else "result pipe"
+        print(f"{name:>12}: {nb_elements / duration:>6.0f} results/s, "
+              f"main process CPU time {cpu / nb_elements * 1e6:.1f} µs per result")
+
+
+if __name__ == "__main__":
+    main()
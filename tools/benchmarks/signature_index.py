@@ -0,0 +1,79 @@
+"""
+Compares the indexing of signatures by date (MediaIndexer.date_sig_map) with a linear search of similar
+signatures, with the SignatureIndex used when media files are indexed one by one, and with the
+SignatureMatrix used to index them in bulk, on synthetic sets of signatures of the same date:
+bursts of near-duplicate signatures (less than 4 different bits) and unrelated signatures.
+
+Usage: python tools/benchmarks/signature_index.py [number of signatures per date]
+"""
+import random
+import sys
+import time
+
+import dhash
+
+from camerafile.core.SignatureIndex import SignatureIndex
+from camerafile.core.SignatureMatrix import SignatureMatrix
+
+
+def create_signatures(nb_signatures):
+    rnd = random.Random(0)
+    signatures = []
+    while len(signatures) < nb_signatures:
+        base = rnd.getrandbits(128)
+        for _ in range(rnd.randint(1, 5)):
+            signature = base
+            for bit in rnd.sample(range(128), rnd.randint(0, 5)):
+                signature ^= 1 << bit
+            signatures.append(signature)
+    return signatures[:nb_signatures]
+
+
+def add_linear(sig_map, signature, media):
+    for existing_sig, media_list in sig_map.items():
+        if dhash.get_num_bits_different(signature, existing_sig) < 4:
+            media_list.append(media)
+            return
+    sig_map[signature] = [media]
+
+
+def add_indexed(sig_map, signature, media):
+    existing_sig = sig_map.find_first_similar(signature)
+    if existing_sig is not None:
+        sig_map[existing_sig].append(media)
+    else:
+        sig_map[signature] = [media]
+
+
+def run(name, sig_map, add, signatures):
+    start = time.perf_counter()
+    for media, signature in enumerate(signatures):
+        add(sig_map, signature, media)
+    duration = time.perf_counter() - start
+    print(f"{name:>16}: {duration:.3f}s to index {len(signatures)} signatures ({len(sig_map)} groups)")
+    return sig_map
+
+
+def run_bulk(signatures):
+    start = time.perf_counter()
+    sig_map = SignatureIndex()
+    for media, group in enumerate(SignatureMatrix.group(signatures)):
+        sig_map.setdefault(group, []).append(media)
+    duration = time.perf_counter() - start
+    print(f"{'SignatureMatrix':>16}: {duration:.3f}s to index {len(signatures)} signatures ({len(sig_map)} groups)")
+    return sig_map
+
+
+def main():
+    nb_signatures = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    signatures = create_signatures(nb_signatures)
+    linear = run("linear search", {}, add_linear, signatures)
+    indexed = run("SignatureIndex", SignatureIndex(), add_indexed, signatures)
+    assert list(linear.items()) == list(indexed.items()), "Groups are different"
+    if SignatureMatrix.is_available():
+        bulk = run_bulk(signatures)
+        assert list(bulk.items()) == list(indexed.items()), "Groups are different"
+
+
+if __name__ == "__main__":
+    main()
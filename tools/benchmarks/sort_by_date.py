@@ -0,0 +1,53 @@
+"""
+Measures the sort of media files by date (as in MediaSet.get_date_sorted_media_list), with the dates parsed
+by strptime at each call, as before, and with the parsed dates cached by the INTERNAL metadata
+(MediaFile.get_date_timestamp).
+
+Usage: python tools/benchmarks/sort_by_date.py [number of media files]
+"""
+import sys
+import time
+from datetime import datetime
+
+from camerafile.core.Constants import INTERNAL
+from camerafile.core.MediaFile import MediaFile
+from camerafile.fileaccess.StandardFileDescription import StandardFileDescription
+from camerafile.mdtools.MdConstants import MetadataNames
+
+
+def create_media_files(nb_files):
+    media_files = []
+    for i in range(nb_files):
+        media_file = MediaFile(StandardFileDescription(f"IMG_{i:08d}.jpg"), None, None)
+        date = f"{2000 + i * 7 % 25}/{i % 12 + 1:02d}/{i % 28 + 1:02d} {i % 24:02d}:{i % 60:02d}:00.{i % 1000:06d}"
+        media_file.metadata[INTERNAL].value = {MetadataNames.CREATION_DATE.value: date}
+        media_files.append(media_file)
+    return media_files
+
+
+def get_parsed_date(media_file):
+    date = media_file.get_exif_date()
+    if date is not None:
+        return datetime.strptime(date, '%Y/%m/%d %H:%M:%S.%f')
+    return None
+
+
+def run(name, media_files, key):
+    start = time.perf_counter()
+    sorted_files = sorted(media_files, key=key)
+    duration = time.perf_counter() - start
+    print(f"{name:>20}: {len(media_files)} media files sorted in {duration:.3f}s")
+    return sorted_files
+
+
+def main():
+    nb_files = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    media_files = create_media_files(nb_files)
+    parsed = run("strptime", media_files, get_parsed_date)
+    run("first timestamp sort", media_files, MediaFile.get_date_timestamp)
+    cached = run("timestamps", media_files, MediaFile.get_date_timestamp)
+    assert [get_parsed_date(media_file) for media_file in parsed] == [media_file.get_date() for media_file in cached]
+
+
+if __name__ == "__main__":
+    main()
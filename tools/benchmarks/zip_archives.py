@@ -0,0 +1,61 @@
+"""
+Measures the files of a zip archive with many files (like a Google Takeout archive) processed per second by
+ZipFileAccess (size, modification date, metadata, content), with the archive opened by each method (previous
+behaviour), or opened once and kept open (see ZipFileAccess.get_zip_file).
+
+Usage: python tools/benchmarks/zip_archives.py [number of files in the archive] [number of files processed]
+"""
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from PIL import Image
+from pyzipper import zipfile
+
+from camerafile.fileaccess.ZipFileAccess import ZipFileAccess
+from camerafile.fileaccess.ZipFileDescription import ZipFileDescription
+from camerafile.mdtools.MdConstants import MetadataNames
+
+
+def create_zip(path, nb_files):
+    image = Image.new("RGB", (64, 48), (120, 50, 200))
+    exif = Image.Exif()
+    exif[0x0110] = "Camera X1"
+    content = io.BytesIO()
+    image.save(content, "JPEG", exif=exif)
+    with zipfile.ZipFile(path, "w") as archive:
+        for i in range(nb_files):
+            archive.writestr(f"Takeout/Google Photos/Album {i // 500}/IMG_{i:06d}.jpg", content.getvalue())
+
+
+def process(directory, file_paths):
+    start = time.perf_counter()
+    for file_path in file_paths:
+        file_access = ZipFileAccess(str(directory), ZipFileDescription("takeout.zip", file_path))
+        file_access.get_file_size()
+        file_access.get_last_modification_date()
+        file_access.read_md((MetadataNames.MODEL, MetadataNames.CREATION_DATE))
+        file_access.hash()
+    ZipFileAccess.close_archives()
+    return len(file_paths) / (time.perf_counter() - start)
+
+
+def main():
+    nb_files = int(sys.argv[1]) if len(sys.argv) > 1 else 40000
+    nb_processed = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    with tempfile.TemporaryDirectory() as directory:
+        create_zip(Path(directory) / "takeout.zip", nb_files)
+        with zipfile.ZipFile(Path(directory) / "takeout.zip") as archive:
+            file_paths = archive.namelist()[:nb_processed]
+
+        get_zip_file = ZipFileAccess.get_zip_file
+        ZipFileAccess.get_zip_file = lambda file_access: zipfile.ZipFile(file_access.get_zip_path())
+        print(f"archive opened by each method: {process(directory, file_paths):>7.1f} files/s")
+        ZipFileAccess.get_zip_file = get_zip_file
+        print(f"  archive opened once:           {process(directory, file_paths):>7.1f} files/s")
+
+
+if __name__ == "__main__":
+    main()